@@ -0,0 +1,176 @@
+"""Array-backed bigram substitution engine for lazy-bigrams.
+
+chall.py's ``encryption`` and ``decryption`` find every bigram with
+``bigrams.index`` / ``sub_bigrams.index`` (a scan of up to 676 strings)
+and build the output by joining two-letter strings.  Here:
+
+* a bigram is an integer 0..675 (26 * first + second, "AA" = 0), and a
+  text becomes a uint16 array in one pass over its bytes;
+* a key is a permutation array ``perm`` (plain code -> cipher code) and
+  its inverse ``inv``, so encrypting or decrypting a whole text is a
+  single gather, ``perm[codes]`` or ``inv[codes]``;
+* ``decrypt_many`` applies a stack of candidate keys (k, 676) at once and
+  returns a (k, n) array, and ``bigram_counts`` gives the ciphertext
+  histogram that frequency-based solvers start from.
+
+    python3 bigramsub.py [n]    # agreement with chall.py's functions, then bigrams/s (default n = 10^6)
+"""
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+N = 26 * 26
+BIGRAMS = [chr(65 + i // 26) + chr(65 + i % 26) for i in range(N)]  # même ordre que chall.py
+_CLEAN = re.compile(rb"[^A-Za-z]")
+
+
+# ========== Texte <-> codes ==========
+def encode(text) -> np.ndarray:
+    """uint16 bigram codes of the letters of text (other characters dropped, as in ``encryption``)."""
+    if isinstance(text, str):
+        text = text.encode("latin_1", "ignore")
+    letters = np.frombuffer(_CLEAN.sub(b"", text).upper(), dtype=np.uint8)
+    if letters.size % 2:
+        raise ValueError("odd number of letters: the last bigram is incomplete")
+    pairs = letters.reshape(-1, 2).astype(np.uint16) - 65
+    return pairs[:, 0] * 26 + pairs[:, 1]
+
+
+def decode(codes: np.ndarray) -> str:
+    """The uppercase text of bigram codes (1-D array)."""
+    codes = np.asarray(codes)
+    out = np.empty((codes.size, 2), dtype=np.uint8)
+    np.divmod(codes, 26, out=(out[:, 0], out[:, 1]), casting="unsafe")
+    out += 65
+    return out.tobytes().decode("ascii")
+
+
+def bigram_counts(codes: np.ndarray) -> np.ndarray:
+    """Histogram of the 676 bigrams."""
+    return np.bincount(codes, minlength=N)
+
+
+# ========== Clés ==========
+class BigramKey:
+    """A bigram substitution: ``perm[plain] = cipher`` and ``inv[cipher] = plain``."""
+
+    __slots__ = ("perm", "inv")
+
+    def __init__(self, perm):
+        perm = np.asarray(perm, dtype=np.uint16)
+        if perm.shape != (N,) or np.bincount(perm, minlength=N).max() != 1:
+            raise ValueError("a key must be a permutation of 0..675")
+        self.perm = perm
+        self.inv = np.empty(N, dtype=np.uint16)
+        self.inv[perm] = np.arange(N, dtype=np.uint16)
+
+    @classmethod
+    def from_sub_bigrams(cls, sub_bigrams: list) -> "BigramKey":
+        """The key of chall.py's ``sub_bigrams`` list (plain bigram i -> sub_bigrams[i])."""
+        return cls([26 * (ord(s[0]) - 65) + ord(s[1]) - 65 for s in sub_bigrams])
+
+    @classmethod
+    def random(cls, rng: np.random.Generator = None) -> "BigramKey":
+        rng = rng or np.random.default_rng()
+        return cls(rng.permutation(N))
+
+    def sub_bigrams(self) -> list:
+        return [BIGRAMS[c] for c in self.perm.tolist()]
+
+    def encrypt(self, codes: np.ndarray) -> np.ndarray:
+        return self.perm[codes]
+
+    def decrypt(self, codes: np.ndarray) -> np.ndarray:
+        return self.inv[codes]
+
+    def swap(self, a: int, b: int):
+        """Exchange the cipher bigrams of plain bigrams a and b (keeps inv in step)."""
+        perm, inv = self.perm, self.inv
+        ca, cb = perm[a], perm[b]
+        perm[a], perm[b] = cb, ca
+        inv[ca], inv[cb] = b, a
+
+    def copy(self) -> "BigramKey":
+        key = object.__new__(BigramKey)
+        key.perm, key.inv = self.perm.copy(), self.inv.copy()
+        return key
+
+
+def decrypt_many(invs: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """(k, n) plaintext codes of ciphertext codes under k inverse keys (k, 676)."""
+    invs = np.asarray(invs, dtype=np.uint16)
+    return invs[:, codes]
+
+
+def encrypt_text(key: BigramKey, text) -> str:
+    return decode(key.encrypt(encode(text)))
+
+
+def decrypt_text(key: BigramKey, text) -> str:
+    return decode(key.decrypt(encode(text)))
+
+
+def main() -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    ok = True
+
+    # fonctions de chall.py, telles quelles
+    sub_bigrams = random.Random(1).sample(BIGRAMS, N)
+
+    def encryption(ptext):
+        cleanptext = re.sub(r'[^a-zA-Z]', '', ptext).upper()
+        return "".join([sub_bigrams[BIGRAMS.index(cleanptext[i*2:(i+1)*2])] for i, _ in enumerate(cleanptext[::2])])
+
+    def decryption(ctext):
+        return "".join([BIGRAMS[sub_bigrams.index(ctext[i*2:(i+1)*2])] for i, _ in enumerate(ctext[::2])])
+
+    key = BigramKey.from_sub_bigrams(sub_bigrams)
+    ok &= key.sub_bigrams() == sub_bigrams
+    with open(os.path.join(here, "ct.txt")) as f:
+        ct = f.read().strip()
+    pt = decryption(ct)
+    ok &= decrypt_text(key, ct) == pt and encrypt_text(key, pt) == ct
+    ok &= encrypt_text(key, "lactf{ab, cd-e}") == encryption("lactf{ab, cd-e}")
+    print(f"[+] ct.txt ({len(ct) // 2} bigrams), random key: same output as chall.py: {ok}")
+
+    rng = np.random.default_rng(1)
+    big = decode(rng.integers(0, N, n, dtype=np.uint16))
+    m = min(n, 20000)
+    t0 = time.perf_counter()
+    slow = encryption(big[:2 * m])
+    t1 = time.perf_counter()
+    codes = encode(big)
+    t2 = time.perf_counter()
+    enc = key.encrypt(codes)
+    t3 = time.perf_counter()
+    back = decode(key.decrypt(enc))
+    t4 = time.perf_counter()
+    ok &= decode(enc[:m]) == slow and back == big
+    print(f"[+] chall.py encryption: {m / (t1 - t0):,.0f} bigrams/s")
+    print(f"[+] encode {n / (t2 - t1):,.0f}, encrypt (gather) {n / (t3 - t2):,.0f}, "
+          f"decrypt + decode {n / (t4 - t3):,.0f} bigrams/s")
+
+    # lot de clés candidates
+    keys = [BigramKey.random(rng) for _ in range(64)]
+    invs = np.stack([k.inv for k in keys])
+    sample = codes[:len(ct) // 2]
+    t0 = time.perf_counter()
+    many = decrypt_many(invs, sample)
+    t1 = time.perf_counter()
+    ok &= all((many[i] == k.decrypt(sample)).all() for i, k in enumerate(keys))
+    print(f"[+] decrypt_many: 64 keys x {sample.size} bigrams in {(t1 - t0) * 1000:.2f} ms "
+          f"({many.size / (t1 - t0):,.0f} bigrams/s)")
+
+    k2 = key.copy()
+    k2.swap(3, 500)
+    ok &= (k2.inv[k2.perm] == np.arange(N)).all() and k2.perm[3] == key.perm[500]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
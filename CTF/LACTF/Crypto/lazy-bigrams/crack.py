@@ -0,0 +1,334 @@
+"""Simulated-annealing solver for the lazy-bigrams bigram substitution.
+
+The plaintext is ``phonetic_mapping`` applied twice: after the first pass
+only letters remain, so the encrypted text is a run of the 26 letter code
+words (ALPHA ... ZULU), possibly followed by an X.  That text is very
+regular, and an n-gram model learnt from it drives an annealing of the
+676-entry key:
+
+* ``Model`` expands random flag-like strings twice with chall.py's map
+  and counts letter 6-grams by the parity of their start (cipher bigrams
+  sit on even positions, so "AL" at an even and at an odd position are
+  not the same event).  Unseen 6-grams get a floor;
+* the known start (``lactf{``) and end (``}``) of the flag pin the cipher
+  bigrams they cover (``crib_pins``), about half of those present in
+  ct.txt.  They never move;
+* the other cipher bigrams start from frequency ranks.  A move hands a
+  plain bigram t to a cipher bigram c, and the cipher bigram that
+  decrypted to t takes c's old one.  Only the 6-gram windows that overlap
+  the positions of those two cipher bigrams are scored again: a position
+  index built once per ciphertext lists those windows.  Each run ends
+  with a greedy pass over every single move;
+* restarts with different seeds run in a process pool (the model reaches
+  the workers through fork), by rounds, until the best plaintext parses
+  as code words.
+
+    python3 crack.py [ct.txt] [-w N] [--restarts R] [--iters I]   # default: a self-test, then ct.txt
+"""
+import argparse
+import math
+import multiprocessing as mp
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+from bigramsub import N, BigramKey, bigram_counts, decode, encode
+
+ORDER = 6
+PHONETIC_MAP = {"A": "ALPHA", "B": "BRAVO", "C": "CHARLIE", "D": "DELTA", "E": "ECHO", "F": "FOXTROT", "G": "GOLF",
+                "H": "HOTEL", "I": "INDIA", "J": "JULIETT", "K": "KILO", "L": "LIMA", "M": "MIKE", "N": "NOVEMBER",
+                "O": "OSCAR", "P": "PAPA", "Q": "QUEBEC", "R": "ROMEO", "S": "SIERRA", "T": "TANGO", "U": "UNIFORM",
+                "V": "VICTOR", "W": "WHISKEY", "X": "XRAY", "Y": "YANKEE", "Z": "ZULU", "_": "UNDERSCORE",
+                "{": "OPENCURLYBRACE", "}": "CLOSECURLYBRACE", "0": "ZERO", "1": "ONE", "2": "TWO", "3": "THREE",
+                "4": "FOUR", "5": "FIVE", "6": "SIX", "7": "SEVEN", "8": "EIGHT", "9": "NINE"}  # chall.py
+FLAG_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789_"
+CODE_WORDS = re.compile("(?:%s)*X?" % "|".join(w for c, w in PHONETIC_MAP.items() if c.isalpha()))
+
+_MODEL = None  # hérité par fork
+
+
+# ========== Modèle ==========
+def phonetic_mapping(ptext: str) -> str:
+    """chall.py's phonetic_mapping."""
+    clean = re.sub(r"[^a-zA-Z0-9_{}]", "", ptext).upper()
+    mapped = "".join(PHONETIC_MAP[c] for c in clean)
+    return mapped + "X" if len(mapped) % 2 else mapped
+
+
+def random_flag(rng: random.Random, size: int = 24) -> str:
+    return "lactf{" + "".join(rng.choice(FLAG_CHARS) for _ in range(size)) + "}"
+
+
+def is_double_expansion(text: str) -> bool:
+    """True if text is a run of letter code words, possibly followed by the X padding."""
+    return CODE_WORDS.fullmatch(text) is not None
+
+
+def _total(get, floor: float, P: list, starts) -> float:
+    return sum(get((((((((s & 1) * 26 + P[s]) * 26 + P[s + 1]) * 26 + P[s + 2]) * 26 + P[s + 3]) * 26
+                      + P[s + 4]) * 26 + P[s + 5]), floor) for s in starts)
+
+
+class Model:
+    """Letter 6-gram log-probabilities of double expansions, by start parity."""
+
+    __slots__ = ("logp", "floor", "units")
+
+    def __init__(self, letters: int = 1 << 21, seed: int = 0):
+        rng = random.Random(seed)
+        parts, total = [], 0
+        while total < letters:
+            pt = phonetic_mapping(phonetic_mapping(random_flag(rng, rng.randrange(8, 48))))
+            parts.append(pt)
+            total += len(pt)
+        text = np.frombuffer("".join(parts).encode(), dtype=np.uint8).astype(np.int64) - 65
+        # chaque texte a une longueur paire: la parité des positions reste alignée
+        idx = np.zeros(text.size - ORDER + 1, dtype=np.int64)
+        for k in range(ORDER):
+            idx = idx * 26 + text[k:text.size - ORDER + 1 + k]
+        idx[1::2] += 26 ** ORDER
+        keys, counts = np.unique(idx, return_counts=True)
+        self.logp = dict(zip(keys.tolist(), np.log(counts / counts.sum()).tolist()))
+        # 6-gramme jamais vu: bien moins probable que le plus rare des vus
+        self.floor = math.log(0.01 / counts.sum())
+        units = np.bincount(text[0::2] * 26 + text[1::2], minlength=N)
+        self.units = [t for t in np.argsort(-units, kind="stable").tolist() if units[t]]
+
+    def score(self, letters: list) -> float:
+        """Log-likelihood of a letter list (0..25), windows from position 0."""
+        return _total(self.logp.get, self.floor, letters, range(len(letters) - ORDER + 1))
+
+
+# ========== Crib ==========
+def _expand(text: str) -> str:
+    return "".join(PHONETIC_MAP[c] for c in text)
+
+
+def _pin(pins: dict, codes: list, at: int, plain: str) -> bool:
+    """Add cipher -> plain pairs for plain aligned at bigram ``at``; False on a contradiction."""
+    used = {t: c for c, t in pins.items()}
+    for j in range(len(plain) // 2):
+        c = codes[at + j]
+        t = 26 * (ord(plain[2 * j]) - 65) + ord(plain[2 * j + 1]) - 65
+        if pins.get(c, t) != t or used.get(t, c) != c:
+            return False
+        pins[c], used[t] = t, c
+    return True
+
+
+def crib_pins(codes: np.ndarray, prefix: str = "lactf{", suffix: str = "}") -> dict:
+    """{cipher bigram: plain bigram} forced by the known start and end of the flag.
+
+    The start of the double expansion is known exactly.  The end depends on
+    the two X paddings, so each of the four endings is tried and kept only
+    if it is the single one that agrees with the start.
+    """
+    codes = codes.tolist()
+    start = _expand(_expand(prefix.upper()))
+    start = start[:len(start) // 2 * 2]
+    pins = {}
+    if len(start) // 2 > len(codes) or not _pin(pins, codes, 0, start):
+        return {}
+    ends = []
+    for level1 in (_expand(suffix.upper()), _expand(suffix.upper()) + "X"):
+        for pad in ("", "X"):
+            end = _expand(level1) + pad
+            end = end[len(end) % 2:]
+            trial = dict(pins)
+            if len(end) // 2 <= len(codes) and _pin(trial, codes, len(codes) - len(end) // 2, end):
+                ends.append(trial)
+    return ends[0] if len(ends) == 1 else pins
+
+
+# ========== Recuit ==========
+class _Index:
+    """For each cipher bigram present: its positions and the n-gram windows they touch."""
+
+    def __init__(self, codes: np.ndarray):
+        self.codes = codes.tolist()
+        self.length = 2 * len(self.codes)
+        last = self.length - ORDER
+        where = {}
+        for i, c in enumerate(self.codes):
+            where.setdefault(c, []).append(i)
+        self.positions = where
+        self.windows = {c: sorted({s for i in pos for s in range(max(0, 2 * i - ORDER + 1), min(last, 2 * i + 1) + 1)})
+                        for c, pos in where.items()}
+        self.present = sorted(where)
+
+
+def anneal(codes: np.ndarray, model: Model, seed: int = 0, iters: int = 100000,
+           temp: float = 15.0, pins: dict = None) -> tuple:
+    """(score, BigramKey) after one annealing run and a greedy finish; ``pins`` never move."""
+    rng = random.Random(seed)
+    index = _Index(codes)
+    get, floor = model.logp.get, model.floor
+    pins = pins or {}
+    fixed = set(pins.values())
+    counts = bigram_counts(codes)
+    ranked = [c for c in np.argsort(-counts, kind="stable").tolist() if c not in pins]
+    targets = [t for t in model.units if t not in fixed]
+    rest = set(targets) | fixed
+    inv = [0] * N
+    for c, t in pins.items():
+        inv[c] = t
+    for c, t in zip(ranked, targets + [t for t in range(N) if t not in rest]):
+        inv[c] = t
+    owner = [0] * N  # bigramme clair -> bigramme chiffré
+    for c, t in enumerate(inv):
+        owner[t] = c
+    P = []
+    for c in index.codes:
+        P += divmod(inv[c], 26)
+    windows, positions = index.windows, index.positions
+    present = [c for c in index.present if c not in pins]
+
+    def write(c, t):
+        hi, lo = divmod(t, 26)
+        for i in positions[c]:
+            P[2 * i], P[2 * i + 1] = hi, lo
+
+    def try_move(c, t):
+        """(delta, c2) with c -> t and c2 -> inv[c] written into P."""
+        c2 = owner[t]
+        if c2 in positions:
+            starts = sorted(set(windows[c]).union(windows[c2]))
+        else:
+            starts = windows[c]
+        before = _total(get, floor, P, starts)
+        write(c, t)
+        if c2 in positions:
+            write(c2, inv[c])
+        return _total(get, floor, P, starts) - before, c2
+
+    def undo(c, t, c2):
+        write(c, inv[c])
+        if c2 in positions:
+            write(c2, t)
+
+    def keep(c, t, c2):
+        old = inv[c]
+        inv[c], inv[c2] = t, old
+        owner[t], owner[old] = c, c2
+
+    score = _total(get, floor, P, range(index.length - ORDER + 1))
+    best, best_inv = score, inv[:]
+    for step in range(iters if present else 0):
+        T = temp * (1 - step / iters) + 1e-3
+        c = rng.choice(present)
+        t = rng.choice(targets)
+        if t == inv[c]:
+            continue
+        delta, c2 = try_move(c, t)
+        if delta >= 0 or rng.random() < math.exp(delta / T):
+            keep(c, t, c2)
+            score += delta
+            if score > best:
+                best, best_inv = score, inv[:]
+        else:
+            undo(c, t, c2)
+
+    # finition: meilleure clé vue, puis tout mouvement qui améliore
+    for c in present:
+        if inv[c] != best_inv[c]:
+            _, c2 = try_move(c, best_inv[c])
+            keep(c, best_inv[c], c2)
+    score = best
+    improved = True
+    while improved:
+        improved = False
+        for c in present:
+            for t in targets:
+                if t == inv[c]:
+                    continue
+                delta, c2 = try_move(c, t)
+                if delta > 1e-9:
+                    keep(c, t, c2)
+                    score += delta
+                    improved = True
+                else:
+                    undo(c, t, c2)
+    perm = np.empty(N, dtype=np.uint16)
+    perm[inv] = np.arange(N, dtype=np.uint16)
+    return score, BigramKey(perm)
+
+
+def _restart(job):
+    codes, seed, iters, temp, pins = job
+    score, key = anneal(codes, _MODEL, seed, iters, temp, pins)
+    return score, seed, key.perm
+
+
+def crack(codes: np.ndarray, model: Model = None, restarts: int = None, workers: int = None,
+          iters: int = 100000, temp: float = 15.0, rounds: int = 8, crib: bool = True) -> tuple:
+    """(best score, BigramKey, [(score, seed)] of every run).
+
+    Rounds of ``restarts`` parallel runs, until the best key decrypts to a
+    run of code words or ``rounds`` is reached.
+    """
+    global _MODEL
+    workers = workers or os.cpu_count() or 1
+    restarts = restarts or workers
+    _MODEL = model or Model()
+    pins = crib_pins(codes) if crib else {}
+    results = []
+    ctx = mp.get_context("fork")
+    with ctx.Pool(workers) as pool:
+        for r in range(rounds):
+            jobs = [(codes, r * restarts + k, iters, temp, pins) for k in range(restarts)]
+            results += pool.map(_restart, jobs)
+            score, _, perm = max(results, key=lambda res: res[0])
+            if is_double_expansion(decode(BigramKey(perm).decrypt(codes))):
+                break
+    _MODEL = None
+    return score, BigramKey(perm), sorted(((s, sd) for s, sd, _ in results), reverse=True)
+
+
+def main() -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Anneal the lazy-bigrams substitution key")
+    parser.add_argument("file", nargs="?", default=os.path.join(here, "ct.txt"))
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--restarts", type=int, default=4, help="runs per round")
+    parser.add_argument("--iters", type=int, default=100000, help="moves per run")
+    parser.add_argument("--temp", type=float, default=15.0)
+    parser.add_argument("--no-crib", action="store_true", help="do not pin the lactf{ ... } bigrams")
+    args = parser.parse_args()
+    ok = True
+
+    t0 = time.perf_counter()
+    model = Model()
+    print(f"[+] {len(model.logp)} 6-grams, {len(model.units)} plain bigrams, built in {time.perf_counter() - t0:.2f}s")
+
+    # auto-test: drapeau et clé connus, même taille que ct.txt
+    rng = random.Random(7)
+    pt = phonetic_mapping(phonetic_mapping(random_flag(rng, 28)))
+    codes = BigramKey.random(np.random.default_rng(7)).encrypt(encode(pt))
+    t0 = time.perf_counter()
+    score, found, runs = crack(codes, model, args.restarts, args.workers, args.iters, args.temp,
+                               crib=not args.no_crib)
+    got = decode(found.decrypt(codes))
+    same = sum(a == b for a, b in zip(got, pt)) / len(pt)
+    print(f"[+] self-test, {codes.size} bigrams: {same:.1%} of letters right, "
+          f"{len(runs)} runs x {args.iters} moves, {time.perf_counter() - t0:.2f}s")
+    ok &= got == pt
+
+    with open(args.file) as f:
+        codes = encode(f.read().strip())
+    t0 = time.perf_counter()
+    score, found, runs = crack(codes, model, args.restarts, args.workers, args.iters, args.temp,
+                               crib=not args.no_crib)
+    got = decode(found.decrypt(codes))
+    print(f"[+] {os.path.basename(args.file)}, {codes.size} bigrams: score {score:.1f}, "
+          f"{len(runs)} runs, {time.perf_counter() - t0:.2f}s, parses as code words: {is_double_expansion(got)}")
+    print(f"    {got[:120]}...")
+    ok &= is_double_expansion(got)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Linear-time inverse of chall.py's ``phonetic_mapping``.
+
+The ciphertext hides phonetic_mapping(phonetic_mapping(flag)), and there
+is no inverse in chall.py.  Splitting a long uppercase string back into
+code words by backtracking is exponential as soon as the dictionary is
+ambiguous, or when the text has no parse at all.  Here:
+
+* the code words form an Aho-Corasick automaton, flattened into a
+  transition table over bytes.  A single pass over the text gives, at
+  each end position, the words that end there, and a forward pass marks
+  the positions reachable from 0;
+* a backward pass keeps only the edges whose end can reach the end of
+  the text.  That end is either the last position, or the position
+  before the trailing X that phonetic_mapping adds to odd-length output;
+* ``parses`` walks the kept edges depth-first and yields the parses one
+  by one.  Every kept edge completes, so each parse costs O(len) and
+  nothing is explored in vain.  ``count`` gives the number of parses
+  without listing them.
+
+Work and memory are O(len(text)) for a fixed dictionary.  ``decode_twice``
+chains two decoders lazily: the letter code words first, then the whole map.
+
+    python3 phonetic.py [plaintext file] [--crack] [--size N]   # default: self-tests and timings
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from crack import PHONETIC_MAP, phonetic_mapping, random_flag
+
+PAD = "X"
+
+
+class PhoneticDecoder:
+    """Segments a string into the words of ``mapping`` (char -> code word)."""
+
+    def __init__(self, mapping: dict = PHONETIC_MAP, padded: bool = True):
+        self.padded = padded
+        # trie: goto[s][octet], out[s] = (longueur, caractère) des mots finissant en s
+        goto, out = [{}], [[]]
+        for char, word in mapping.items():
+            s = 0
+            for b in word.encode():
+                if b not in goto[s]:
+                    goto[s][b] = len(goto)
+                    goto.append({})
+                    out.append([])
+                s = goto[s][b]
+            out[s].append((len(word), char))
+        # liens d'échec (BFS), puis table de transitions complète
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = [goto[0].get(b, 0) for b in range(256)]
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            out[s] = out[s] + out[fail[s]]
+            delta[s] = delta[fail[s]][:]
+            for b, t in goto[s].items():
+                fail[t] = delta[fail[s]][b]
+                delta[s][b] = t
+                queue.append(t)
+        self.delta = delta
+        self.out = [tuple(o) for o in out]
+
+    def _edges(self, text: str) -> tuple:
+        """(next: {start: [(end, char)]}, terminal positions), pruned to edges on some parse."""
+        data = text.encode("latin_1", "replace")
+        n = len(data)
+        delta, out = self.delta, self.out
+        # 1. passe avant: mots finissant en i, depuis une position atteignable
+        reach = bytearray(n + 1)
+        reach[0] = 1
+        starts, ends, chars = array("l"), array("l"), []
+        s = 0
+        for i, b in enumerate(data, 1):
+            s = delta[s][b]
+            if out[s]:
+                for length, char in out[s]:
+                    if reach[i - length]:
+                        reach[i] = 1
+                        starts.append(i - length)
+                        ends.append(i)
+                        chars.append(char)
+        # 2. passe arrière: arêtes menant à une fin (texte entier, ou avant le X de bourrage)
+        good = bytearray(n + 1)
+        terminals = set()
+        if reach[n]:
+            terminals.add(n)
+        if self.padded and n and data[-1] == ord(PAD) and (n - 1) % 2 and reach[n - 1]:
+            terminals.add(n - 1)
+        for t in terminals:
+            good[t] = 1
+        nxt = {}
+        for k in range(len(starts) - 1, -1, -1):
+            if good[ends[k]]:
+                good[starts[k]] = 1
+                nxt.setdefault(starts[k], []).append((ends[k], chars[k]))
+        if not good[0]:
+            return {}, set()
+        return nxt, terminals
+
+    def parses(self, text: str):
+        """Every parse of text (a str of mapping keys), lazily; longest word first at each step."""
+        nxt, terminals = self._edges(text)
+        if not terminals:
+            return
+        # DFS itératif: [position, prochaine arête], path = caractères jusqu'au sommet
+        path, stack = [], [[0, 0]]
+        while stack:
+            top = stack[-1]
+            pos, k = top
+            if k == 0 and pos in terminals:
+                yield "".join(path)
+            edges = nxt.get(pos, ())
+            if k < len(edges):
+                top[1] += 1
+                end, char = edges[k]
+                path.append(char)
+                stack.append([end, 0])
+            else:
+                stack.pop()
+                if stack:
+                    path.pop()
+
+    def count(self, text: str) -> int:
+        """Number of parses of text (an exact integer, which may itself be huge)."""
+        nxt, terminals = self._edges(text)
+        ways = {t: 1 for t in terminals}
+        for b in sorted(nxt, reverse=True):
+            ways[b] = ways.get(b, 0) + sum(ways[e] for e, _ in nxt[b])
+        return ways.get(0, 0) if terminals else 0
+
+    def decode(self, text: str) -> str:
+        """The first parse of text; ValueError if there is none."""
+        for parse in self.parses(text):
+            return parse
+        raise ValueError("text is not a run of code words")
+
+
+LETTERS = PhoneticDecoder({c: w for c, w in PHONETIC_MAP.items() if c.isalpha()})
+FULL = PhoneticDecoder()
+
+
+def decode_twice(text: str):
+    """Candidate flags (uppercase) for phonetic_mapping(phonetic_mapping(flag)) == text, lazily.
+
+    The inner expansion only holds letters (and a possible X), so the outer
+    level is split with the 26 letter code words only.
+    """
+    for level1 in LETTERS.parses(text):
+        yield from FULL.parses(level1)
+
+
+def _backtrack(text: str, words: dict, pos: int = 0) -> int:
+    """Naive recursive parse counter (the baseline, exponential on ambiguous text)."""
+    if pos == len(text):
+        return 1
+    return sum(_backtrack(text, words, pos + len(w)) for w in words.values() if text.startswith(w, pos))
+
+
+def main() -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Invert chall.py's double phonetic_mapping")
+    parser.add_argument("file", nargs="?", help="decrypted plaintext (double expansion)")
+    parser.add_argument("--crack", action="store_true", help="recover the key of ct.txt with crack.py first")
+    parser.add_argument("--size", type=int, default=100000, help="flag length for the timing test")
+    args = parser.parse_args()
+    ok = True
+
+    if args.file or args.crack:
+        if args.crack:
+            from bigramsub import decode, encode
+            from crack import crack
+            with open(os.path.join(here, "ct.txt")) as f:
+                codes = encode(f.read().strip())
+            _, key, _ = crack(codes)
+            text = decode(key.decrypt(codes))
+        else:
+            with open(args.file) as f:
+                text = f.read().strip()
+        flags = list(decode_twice(text))
+        for flag in flags:
+            print(f"[+] {flag.lower()}")
+        return 0 if flags else 1
+
+    # aller-retour sur des drapeaux aléatoires
+    rng = random.Random(1)
+    for _ in range(200):
+        flag = random_flag(rng, rng.randrange(0, 40)).upper()
+        ok &= list(decode_twice(phonetic_mapping(phonetic_mapping(flag)))) == [flag]
+    print(f"[+] 200 random flags: decode_twice gives back exactly the flag: {ok}")
+
+    # temps linéaire sur des expansions de plusieurs Mo
+    for size in (args.size // 4, args.size):
+        flag = random_flag(rng, size).upper()
+        text = phonetic_mapping(phonetic_mapping(flag))
+        t0 = time.perf_counter()
+        got = next(decode_twice(text))
+        dt = time.perf_counter() - t0
+        ok &= got == flag
+        print(f"[+] flag of {len(flag)} chars, {len(text) / 1e6:.1f} MB double expansion: "
+              f"decoded in {dt:.2f}s ({len(text) / dt / 1e6:.2f} MB/s), correct: {got == flag}")
+
+    # dictionnaire ambigu: nombre de parses exponentiel, DP linéaire
+    words = {"a": "AB", "b": "A", "c": "BA", "d": "B"}
+    amb = PhoneticDecoder(words, padded=False)
+    for k in (6, 10, 14):
+        text = "AB" * k
+        t0 = time.perf_counter()
+        naive = _backtrack(text + "C", words)  # aucun parse: tout est exploré
+        t1 = time.perf_counter()
+        fast = amb.count(text + "C"), amb.count(text)
+        t2 = time.perf_counter()
+        ok &= naive == 0 and fast[0] == 0 and fast[1] == _backtrack(text, words)
+        print(f"    'AB' x {k} + 'C': backtracking {t1 - t0:.3f}s, DP {(t2 - t1) * 1000:.2f} ms; "
+              f"without the 'C': {fast[1]} parses")
+    text = "AB" * 100000
+    t0 = time.perf_counter()
+    n = amb.count(text)
+    first = [p for _, p in zip(range(3), amb.parses(text))]
+    t1 = time.perf_counter()
+    ok &= all("".join(words[c] for c in p) == text for p in first)
+    print(f"[+] 'AB' x 100000 (ambiguous words): {n.bit_length()}-bit parse count and 3 parses in {t1 - t0:.2f}s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
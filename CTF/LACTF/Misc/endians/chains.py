@@ -0,0 +1,210 @@
+"""Best-first search for multi-hop transcoding chains (endians, several round-trips).
+
+codecsearch.py tries one hop, s.encode(e).decode(d).  A flag mangled by
+two or three such round-trips needs chains of hops, and a blind depth-3
+search would be 110^6 attempts.  Here every string met is kept once:
+
+* each intermediate string is keyed by its blake2b digest.  Two paths
+  that give the same string collapse into one node, and the identity
+  hops (utf_8 -> utf_8, latin_1 -> latin_1, ...) are dropped, because
+  their result is already known;
+* expanding a node encodes it once per codec, groups identical byte
+  outputs, and decodes each group with every decoder.  As in
+  codecsearch.py, a decode error on a prefix rules out a prefix-safe
+  decoder without a full decode (same check, imported from there);
+* children are scored and the best nodes are expanded first.  A child
+  that contains the marker is a hit.  Otherwise the score looks at
+  whether one more hop between common codecs would bring the marker's
+  bytes (``_hint``), then at the printable ratio (in 5 % steps), then
+  at the length (undoing mojibake turns several characters back into
+  one, so the right hop shortens the text), then at a shorter path;
+* ``max_depth`` bounds the chains.  ``budget`` bounds the memory held by
+  pending strings and digests: past it, the worst pending nodes are
+  dropped (their digests stay known, so they are not rebuilt).
+
+    python3 chains.py [file] [--depth 3] [--budget MiB]   # default: a 3-hop self-test
+"""
+import argparse
+import hashlib
+import heapq
+import re
+import sys
+import time
+import warnings
+
+from codecsearch import MARKER, PREFIX, QUADRATIC, QUADRATIC_MAX, _prefix_safe, codec_names, decode_head
+
+SAMPLE = 4096
+PRINTABLE_STEPS = 20  # taux d'imprimables compté par paliers de 5 %
+DIGEST_COST = 120  # octets par empreinte connue (clé, entrée de dict)
+HINT_CODECS = ("utf_8", "utf_16_le", "utf_16_be", "utf_32_le", "utf_32_be", "latin_1", "cp1252", "cp437")
+
+
+def _digest(s: str) -> bytes:
+    return hashlib.blake2b(s.encode("utf_8", "surrogatepass"), digest_size=16).digest()
+
+
+def _hint(s: str, marker_bytes: list) -> bool:
+    """True if some common encoding of s contains the marker encoded by a common codec."""
+    for enc in HINT_CODECS:
+        data = s.encode(enc, "ignore")
+        if any(m in data for m in marker_bytes):
+            return True
+    return False
+
+
+def _score(s: str, depth: int, marker_bytes: list) -> tuple:
+    sample = s[:SAMPLE]
+    printable = sum(c.isprintable() for c in sample) / max(1, len(sample))
+    # défaire un mojibake raccourcit le texte (plusieurs octets -> un caractère)
+    return _hint(s, marker_bytes), int(printable * PRINTABLE_STEPS), -len(s), -depth
+
+
+class ChainStats:
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.collapsed = 0  # chaînes menant à une chaîne déjà connue
+        self.evicted = 0
+        self.peak_bytes = 0
+        self.seconds = 0.0
+
+    def __str__(self):
+        return (f"expanded {self.expanded}, generated {self.generated}, collapsed {self.collapsed}, "
+                f"evicted {self.evicted}, peak {self.peak_bytes / (1 << 20):.1f} MiB, {self.seconds:.2f}s")
+
+
+class ChainSearch:
+    def __init__(self, marker: str = MARKER, max_depth: int = 3, budget: int = 256 << 20,
+                 names: list = None):
+        self.marker = marker
+        self.max_depth = max_depth
+        self.budget = budget
+        self.names = names or codec_names()
+        self.safe = {d: _prefix_safe(d) for d in self.names}
+        self.flag = re.compile(re.escape(marker) + r"[\x20-\x7e]*?\}")
+        self.marker_bytes = sorted({marker.encode(c) for c in HINT_CODECS}, key=len)
+        self.stats = ChainStats()
+
+    def _children(self, s: str):
+        """(hop, child string) for every hop that decodes, one encode per codec."""
+        names = self.names
+        if len(s) > QUADRATIC_MAX:
+            names = [c for c in names if c not in QUADRATIC]
+        groups = {}
+        for enc in names:
+            try:
+                data = s.encode(enc)
+            except Exception:
+                continue
+            groups.setdefault(data, enc)
+        for data, enc in groups.items():
+            head = data[:PREFIX]
+            for dec in names:
+                if self.safe[dec] and len(data) > PREFIX:
+                    try:
+                        decode_head(dec, head, False)
+                    except Exception:
+                        continue
+                try:
+                    yield (enc, dec), data.decode(dec)
+                except Exception:
+                    continue
+
+    def run(self, text: str, max_expansions: int = 2000) -> list:
+        """[(chain, result, flag)] for the chains whose result holds a complete flag, shortest first."""
+        t0 = time.perf_counter()
+        stats = self.stats
+        root = _digest(text)
+        known = {root}
+        # tas: (-score, ordre, chemin, chaîne)
+        heap = [((), 0, (), text)]
+        held = sys.getsizeof(text) + DIGEST_COST
+        order = 1
+        found = []
+        while heap and stats.expanded < max_expansions and not found:
+            _, _, path, s = heapq.heappop(heap)
+            held -= sys.getsizeof(s)
+            if len(path) >= self.max_depth:
+                continue
+            stats.expanded += 1
+            with warnings.catch_warnings():
+                # unicode_escape signale chaque séquence invalide
+                warnings.simplefilter("ignore", DeprecationWarning)
+                children = list(self._children(s))
+            for hop, child in children:
+                stats.generated += 1
+                d = _digest(child)
+                if d in known:
+                    stats.collapsed += 1
+                    continue
+                known.add(d)
+                held += DIGEST_COST
+                chain = path + (hop,)
+                if self.marker in child:
+                    m = self.flag.search(child)
+                    if m:
+                        found.append((chain, child, m.group()))
+                        continue
+                if len(chain) < self.max_depth:
+                    score = _score(child, len(chain), self.marker_bytes)
+                    heapq.heappush(heap, (tuple(-v for v in score), order, chain, child))
+                    order += 1
+                    held += sys.getsizeof(child)
+            stats.peak_bytes = max(stats.peak_bytes, held)
+            if held > self.budget:
+                # garder la meilleure moitié des nœuds en attente
+                keep = heapq.nsmallest(len(heap) // 2, heap)
+                stats.evicted += len(heap) - len(keep)
+                heap = keep
+                heapq.heapify(heap)
+                held = len(known) * DIGEST_COST + sum(sys.getsizeof(e[3]) for e in heap)
+        stats.seconds = time.perf_counter() - t0
+        found.sort(key=lambda f: (len(f[0]), f[0]))
+        return found
+
+
+def describe(chain) -> str:
+    return "".join(f".encode({e!r}).decode({d!r})" for e, d in chain)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search multi-hop encode/decode chains for the flag")
+    parser.add_argument("file", nargs="?", help="mangled text (UTF-8); default: 3-hop self-test")
+    parser.add_argument("--marker", default=MARKER)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=256, help="MiB of pending strings")
+    parser.add_argument("--expansions", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            text = f.read().decode()
+        want = None
+    else:
+        want = "lactf{1_sur3_h0pe_th1s_d0es_n0t_g3t_l0st_1n_translati0n!}"
+        text = (want.encode("utf_16_be").decode("utf_16_le")
+                .encode("utf_8").decode("cp437")
+                .encode("utf_8").decode("latin_1"))
+        print(f"[+] Self-test input: {text[:40]!r}...")
+
+    search = ChainSearch(args.marker, args.depth, int(args.budget * (1 << 20)))
+    if want is not None:
+        # non-régression: un saut vers utf_16 (sans BOM) sur une chaîne plus longue que PREFIX
+        long = (want * 8).encode("utf_16_le").decode("utf_16_be")
+        hops = {hop for hop, _ in search._children(long)}
+        if ("utf_16_be", "utf_16") not in hops:
+            print("[-] utf_16_be -> utf_16 pruned on a long string")
+            return 1
+    found = search.run(text, args.expansions)
+    print(f"[+] {search.stats}")
+    for chain, _, flag in found[:5]:
+        print(f"    s{describe(chain)}")
+        print(f"      -> {flag}")
+    if want is not None:
+        return 0 if found and found[0][2] == want else 1
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
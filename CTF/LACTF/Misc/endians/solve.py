@@ -1,10 +1,4 @@
-import encodings
-import pkgutil
-
-# Get all available encodings
-all_encodings = set()
-for importer, module_name, is_package in pkgutil.iter_modules(encodings.__path__, ''):
-    all_encodings.add(module_name)
+from codecsearch import search
 
 # Read file and decode using default UTF-8
 with open("chall.txt", "rb") as file:
@@ -12,15 +6,10 @@ with open("chall.txt", "rb") as file:
 
 text_str = data.decode()
 
-# Try all encoding and decoding combinations
-print(f"Testing {len(all_encodings)} encoding combinations...\n")
+# Encode once per codec, prune on a decoded prefix, decode the rest in parallel
+hits, stats = search(text_str)
+print(f"Tested {stats['pairs']} encoding combinations: {stats}\n")
 
-for encode_type in sorted(all_encodings):
-    for decode_type in sorted(all_encodings):
-        try:
-            result = text_str.encode(encode_type).decode(decode_type)
-            if "lactf{" in result:
-                print(f"[FOUND] {encode_type} -> {decode_type}")
-                print(f"Result: {result}\n")
-        except Exception:
-            pass
+for hit in hits:
+    print(f"[FOUND] {' / '.join(hit.encoders)} -> {hit.decoder}")
+    print(f"Result: {hit.flag}\n")
@@ -0,0 +1,99 @@
+"""Check and time source/curve.py's Point arithmetic against the original class.
+
+The original class (affine coordinates, one inversion per addition or
+doubling, plain double-and-add) is still in curve.py as ``_mul_affine``,
+since points given with coordinates outside [0, p) keep going through it.
+Every case below must give the same output line as the service would
+print: same (x, y), same O, or the same "Invalid." (an exception).
+The cases cover G, Q, points of small order, points off the curve, and
+non-reduced coordinates.  Each case is run three ways: wNAF, through
+a fixed-base comb table, and through ``batch_mul``.
+
+    python3 bench_curve.py [seconds]    # agreement check, then ops/sec for each method
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "source"))
+from curve import Gx, Gy, Point, _mul_affine, batch_mul, n, p  # noqa: E402
+
+
+def _result(mul, k, P) -> str:
+    """The service's answer line for k * P."""
+    try:
+        R = mul(k, P)
+    except Exception:
+        return "Invalid."
+    return "Result: O (infinity)" if R.x is None else f"Result: ({R.x}, {R.y})"
+
+
+def _cases(rng: random.Random) -> list:
+    G = Point(Gx, Gy)
+    Q = _mul_affine(rng.randrange(n), G)
+    points = [(Gx, Gy), (Q.x, Q.y),
+              (p - 1, 0), (0, 1), (0, p - 1), (2, 3), (2, p - 3),  # ordres 2, 3, 6
+              (0, 0), (1, 1), (5, 7)]                              # hors de la courbe
+    points += [(rng.randrange(p), rng.randrange(p)) for _ in range(6)]
+    points += [(Gx + p, Gy), (Gx, Gy - p), (-1, 0), (p - 1, p), (3, -5), (0, 2 * p + 1)]
+    scalars = [0, 1, 2, 3, 5, 6, n - 1, n, n + 1, 2 * n, 1 << 64, (1 << 200) + 12345]
+    scalars += [rng.randrange(1 << 64) for _ in range(8)]
+    return [(k, x, y) for x, y in points for k in scalars]
+
+
+def _rate(mul, jobs, seconds: float) -> float:
+    done, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        for k, P in jobs:
+            mul(k, P).x
+        done += len(jobs)
+    return done / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    rng = random.Random(1)
+
+    cases = _cases(rng)
+    methods = {
+        "wNAF": lambda k, P: k * P,
+        "comb": lambda k, P: P.precompute() and k * P,
+        "batch": lambda k, P: batch_mul([k, k], P)[1],
+    }
+    bad = [(k, x, y) for k, x, y in cases for mul in methods.values()
+           if _result(mul, k, Point(x, y)) != _result(_mul_affine, k, Point(x, y))]
+    print(f"[+] {len(cases)} (k, P) cases x {len(methods)} methods, identical output: {not bad}")
+    for case in bad[:5]:
+        print(f"    differs: k={case[0]} P=({case[1]}, {case[2]})")
+
+    G = Point(Gx, Gy)
+    jobs = [(rng.randrange(n), G) for _ in range(200)]
+    before = _rate(_mul_affine, jobs, seconds)
+    after = _rate(lambda k, P: k * P, jobs, seconds)
+    print(f"[+] k * G, 61-bit k: affine double-and-add {before:.0f} ops/s, "
+          f"Jacobian wNAF {after:.0f} ops/s ({after / before:.1f}x)")
+
+    t0 = time.perf_counter()
+    Gc = Point(Gx, Gy).precompute()
+    built = time.perf_counter() - t0
+    comb = _rate(lambda k, P: k * Gc, jobs, seconds)
+    print(f"[+] comb table for G: built in {built * 1000:.2f} ms, {comb:.0f} ops/s "
+          f"({comb / before:.1f}x the original)")
+
+    ks = [rng.randrange(n) for _ in range(10000)]
+    t0 = time.perf_counter()
+    many = batch_mul(ks, G)
+    t1 = time.perf_counter()
+    single = [k * G for k in ks]
+    for R in single:
+        R.x
+    t2 = time.perf_counter()
+    same = all((A.x, A.y) == (B.x, B.y) for A, B in zip(many, single))
+    print(f"[+] 10000 multiples of G: batch_mul {len(ks) / (t1 - t0):.0f} ops/s, "
+          f"one by one {len(ks) / (t2 - t1):.0f} ops/s, identical: {same}")
+    return 0 if not bad and same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
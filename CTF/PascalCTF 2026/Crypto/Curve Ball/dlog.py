@@ -0,0 +1,294 @@
+"""Pohlig-Hellman + baby-step/giant-step discrete logs on the Curve Ball curve.
+
+y^2 = x^3 + 1 over p = 2 mod 3 is supersingular: the group has p + 1 = n
+points and n = 2 * 3^2 * 5 * 7 * ... * 47 is smooth.  ``secret`` is
+recovered from Q = secret * G one prime-power subgroup at a time:
+
+* the order of G is factored (trial division, then Pollard-Brent rho with
+  Miller-Rabin) and reduced to the true order of G;
+* for each q^e, x mod q^e is found digit by digit, each digit being a
+  log in the subgroup of order q, solved by BSGS;
+* the partial logs are recombined by CRT and checked against Q.
+
+BSGS keys its table by the affine x only: jP and -jP share it, so a
+table of j = 0..m covers offsets -m..m and the giant stride is 2m + 1.
+The table is a dict, or a sorted NumPy array probed by a vectorised
+``searchsorted`` over a block of giant steps, and its size is capped by
+``mem_cap`` (bytes): a smaller table means more giant steps, not failure.
+
+    python3 dlog.py                          # random secret, per-subgroup report
+    python3 dlog.py --table sorted --mem-cap 1 Qx Qy
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "source"))
+from curve import Gx, Gy, Point, n, p  # noqa: E402
+
+DICT_ENTRY = 100   # octets par entrée de dict (clé int, valeur int, case)
+SORTED_ENTRY = 12  # uint64 x + uint32 j
+GIANT_BLOCK = 1024
+
+
+# ========== Factorisation ==========
+def is_prime(m: int) -> bool:
+    """Miller-Rabin, deterministic below 3.3e24 with these bases."""
+    if m < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for q in bases:
+        if m % q == 0:
+            return m == q
+    d, s = m - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for b in bases:
+        x = pow(b, d, m)
+        if x in (1, m - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % m
+            if x == m - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _brent(m: int) -> int:
+    """A non-trivial factor of the composite m (Pollard rho, Brent's cycle search)."""
+    if not m & 1:
+        return 2
+    rng = random.Random(m)
+    while True:
+        y, c, k = rng.randrange(1, m), rng.randrange(1, m), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % m
+            i = 0
+            while i < r and g == 1:
+                ys = y
+                for _ in range(min(k, r - i)):
+                    y = (y * y + c) % m
+                    q = q * abs(x - y) % m
+                g = math.gcd(q, m)
+                i += k
+            r <<= 1
+        if g == m:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % m
+                g = math.gcd(abs(x - ys), m)
+        if g != m:
+            return g
+
+
+def factorint(m: int) -> dict:
+    """{prime: exponent} of m."""
+    out = {}
+    for q in range(2, 1 << 12):
+        while m % q == 0:
+            out[q] = out.get(q, 0) + 1
+            m //= q
+    stack = [m] if m > 1 else []
+    while stack:
+        f = stack.pop()
+        if is_prime(f):
+            out[f] = out.get(f, 0) + 1
+        else:
+            d = _brent(f)
+            stack += [d, f // d]
+    return dict(sorted(out.items()))
+
+
+def point_order(P: Point, order: int, factors: dict) -> int:
+    """Exact order of P, given a multiple of it and its factorisation."""
+    for q, e in factors.items():
+        for _ in range(e):
+            if (order // q * P).x is not None:
+                break
+            order //= q
+    return order
+
+
+# ========== BSGS ==========
+class SubgroupStats:
+    __slots__ = ("q", "e", "seconds", "entries", "table_bytes", "giant_steps")
+
+    def __init__(self, q: int, e: int):
+        self.q, self.e = q, e
+        self.seconds = 0.0
+        self.entries = 0
+        self.table_bytes = 0
+        self.giant_steps = 0
+
+    def __str__(self):
+        return (f"{self.q}^{self.e}: {self.seconds * 1000:7.2f} ms, table {self.entries} entries "
+                f"({self.table_bytes} B peak), {self.giant_steps} giant steps")
+
+
+def _x(P: Point) -> int:
+    return -1 if P.x is None else P.x  # O hors des x valides
+
+
+def bsgs(P: Point, Q: Point, order: int, table: str = "dict", mem_cap: int = 64 << 20,
+         stats: SubgroupStats = None) -> int:
+    """x in [0, order) with Q = x * P, P of order ``order``; ValueError if none."""
+    entry = DICT_ENTRY if table == "dict" else SORTED_ENTRY
+    if order == 1:
+        if Q.x is not None:
+            raise ValueError("no discrete log in this subgroup")
+        return 0
+    # m < order: les pas de bébé n'atteignent jamais O
+    m = max(1, min(math.isqrt(order // 2) + 1, mem_cap // entry, order - 1))
+    stride = 2 * m + 1
+    # pas de bébé: j*P pour j = 0..m, clé x
+    baby, cur = [-1], Point(None, None)
+    for _ in range(m):
+        cur = cur + P
+        baby.append(_x(cur))
+    if table == "dict":
+        tab = {}
+        for j, x in enumerate(baby):
+            tab.setdefault(x, j)
+        size = sys.getsizeof(tab) + sum(sys.getsizeof(x) for x in tab)
+    else:
+        xs = np.array(baby, dtype=np.int64)
+        order_idx = np.argsort(xs, kind="stable").astype(np.uint32)
+        xs = xs[order_idx]
+        size = xs.nbytes + order_idx.nbytes
+    if stats is not None:
+        stats.entries = len(baby)
+        stats.table_bytes = max(stats.table_bytes, size)
+
+    step = stride * P
+    neg_step = Point(step.x, -step.y % p) if step.x is not None else step
+    giants = -(-order // stride) + 1
+    R = Q
+    i = 0
+    while i < giants:
+        block = []
+        for _ in range(min(GIANT_BLOCK if table != "dict" else 1, giants - i)):
+            block.append(R)
+            R = R + neg_step
+        if table == "dict":
+            hits = [tab.get(_x(block[0]))]
+        else:
+            keys = np.array([_x(B) for B in block], dtype=np.int64)
+            pos = np.minimum(np.searchsorted(xs, keys), xs.size - 1)
+            hits = [int(order_idx[k]) if xs[k] == key else None for k, key in zip(pos.tolist(), keys.tolist())]
+        for b, j in enumerate(hits):
+            if j is None:
+                continue
+            # x égal: R = j*P ou R = -j*P
+            base = (i + b) * stride
+            for cand in (base + j, base - j):
+                cand %= order
+                T = cand * P
+                if T.x == Q.x and T.y == Q.y:
+                    if stats is not None:
+                        stats.giant_steps += i + b + 1
+                    return cand
+        i += len(block)
+    if stats is not None:
+        stats.giant_steps += giants
+    raise ValueError("no discrete log in this subgroup")
+
+
+# ========== Pohlig-Hellman ==========
+def crt(residues: list, moduli: list) -> tuple:
+    x, m = 0, 1
+    for r, q in zip(residues, moduli):
+        t = (r - x) * pow(m, -1, q) % q
+        x, m = x + m * t, m * q
+    return x, m
+
+
+def pohlig_hellman(G: Point, Q: Point, order: int = n, table: str = "dict",
+                   mem_cap: int = 64 << 20) -> tuple:
+    """(log of Q in base G, order of G, [SubgroupStats]); ValueError if Q is not in <G>."""
+    factors = factorint(order)
+    order = point_order(G, order, factors)
+    factors = factorint(order)
+    residues, moduli, report = [], [], []
+    for q, e in factors.items():
+        stats = SubgroupStats(q, e)
+        t0 = time.perf_counter()
+        cof = order // q ** e
+        Gi, Qi = cof * G, cof * Q
+        gamma = q ** (e - 1) * Gi  # ordre q
+        x = 0
+        for k in range(e):
+            D = Qi + (((q ** e - x) % q ** e) * Gi)
+            H = q ** (e - 1 - k) * D
+            d = 0 if H.x is None else bsgs(gamma, H, q, table, mem_cap, stats)
+            x += d * q ** k
+        stats.seconds = time.perf_counter() - t0
+        residues.append(x)
+        moduli.append(q ** e)
+        report.append(stats)
+    x, _ = crt(residues, moduli)
+    R = x * G
+    if (R.x, R.y) != (Q.x, Q.y):
+        raise ValueError("Q is not a multiple of G")
+    return x, order, report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Discrete log of Q in base G on the Curve Ball curve")
+    parser.add_argument("Q", nargs="*", type=int, help="Qx Qy (default: random secret)")
+    parser.add_argument("--table", choices=("dict", "sorted"), default="dict")
+    parser.add_argument("--mem-cap", type=float, default=64, help="BSGS table cap in MiB")
+    args = parser.parse_args()
+
+    G = Point(Gx, Gy)
+    mem_cap = int(args.mem_cap * (1 << 20))
+    t0 = time.perf_counter()
+    factors = factorint(n)
+    t1 = time.perf_counter()
+    print(f"[+] n = {' * '.join(f'{q}^{e}' if e > 1 else str(q) for q, e in factors.items())} "
+          f"({(t1 - t0) * 1000:.1f} ms)")
+
+    if args.Q:
+        t1 = time.perf_counter()
+        x, order, report = pohlig_hellman(G, Point(*args.Q), n, args.table, mem_cap)
+        t2 = time.perf_counter()
+        for stats in report:
+            print(f"    {stats}")
+        print(f"[+] ord(G) = {order}, secret = {x} ({hex(x)}) in {(t2 - t1) * 1000:.1f} ms")
+        return 0
+
+    # auto-test: les deux tables, secret pair puis impair (composante d'ordre 2 non nulle)
+    ok = True
+    base = int.from_bytes(os.urandom(8), "big") % n
+    for table in (args.table, "sorted" if args.table == "dict" else "dict"):
+        for secret in (base & ~1, base | 1):
+            t1 = time.perf_counter()
+            x, order, report = pohlig_hellman(G, secret * G, n, table, mem_cap)
+            t2 = time.perf_counter()
+            if not ok or (table == args.table and secret == base & ~1):
+                for stats in report:
+                    print(f"    {stats}")
+            good = x == secret % order
+            ok &= good
+            print(f"[+] --table {table}, {'odd' if secret & 1 else 'even'} secret {hex(secret)}: "
+                  f"ord(G) = {order}, x = {hex(x)} in {(t2 - t1) * 1000:.1f} ms, matches: {good}")
+    # point d'ordre 2: m doit rester < ordre
+    T = Point(p - 1, 0)
+    for table in ("dict", "sorted"):
+        ok &= bsgs(T, T, 2, table) == 1 and bsgs(T, Point(None, None), 2, table) == 0
+    print(f"[+] bsgs on a point of order 2, both tables: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
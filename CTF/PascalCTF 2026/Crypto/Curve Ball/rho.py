@@ -0,0 +1,288 @@
+"""Parallel Pollard rho with distinguished points for y^2 = x^3 + b curves.
+
+For a prime-order subgroup too large for a BSGS table (dlog.py), rho
+needs O(1) memory per walk and splits across processes without any
+coordination:
+
+* every worker runs an r-adding walk  X -> X + R[x(X) mod r],  where
+  R[j] = c_j G + d_j Q  comes from a seeded table, so all workers (and
+  all restarts) iterate the same function;
+* a point whose x has ``dp_bits`` low zero bits is distinguished: the walk
+  sends (x, y, c, d) to the parent and starts again from the worker's
+  next start point S_0 + i T (random S_0 and T per worker);
+* the parent keeps the distinguished points in a dict by x.  Two walks
+  that collide anywhere end on the same distinguished point, and two
+  different (c, d) for the same (or opposite) point give log_G Q.
+
+Distinguished points are also appended to an on-disk store whose header
+records the problem and the walk seed: a later run on the same problem
+reloads them and continues, so long runs survive restarts.
+
+The walk needs the affine x at every step, so it works on affine integer
+pairs with p as a parameter rather than on curve.py's Jacobian Point:
+the same code runs on Curve Ball's p (whose subgroups are all tiny,
+dlog.py is the tool there) and on test curves with a large prime
+subgroup: y^2 = x^3 + 1 over p = 2 mod 3 has p + 1 points, and
+p = 6q - 1 gives a subgroup of prime order q.
+
+    python3 rho.py --bits 40 -w 4 --store rho40.dp     # random instance, Ctrl-C and rerun to resume
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import sys
+import time
+
+from dlog import is_prime
+
+R_SIZE = 32          # nombre de pas de l'itération r-adding
+BATCH = 16           # points distingués envoyés ensemble
+MAX_WALK = 20        # abandon d'une marche après MAX_WALK * 2^dp_bits pas
+
+
+# ========== Arithmétique affine (a = 0) ==========
+def ec_add(P, Q, p: int):
+    if P is None:
+        return Q
+    if Q is None:
+        return P
+    x1, y1 = P
+    x2, y2 = Q
+    if x1 == x2:
+        if (y1 + y2) % p == 0:
+            return None
+        s = 3 * x1 * x1 * pow(2 * y1, -1, p) % p
+    else:
+        s = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    x3 = (s * s - x1 - x2) % p
+    return x3, (s * (x1 - x3) - y1) % p
+
+
+def ec_mul(k: int, P, p: int):
+    R = None
+    while k:
+        if k & 1:
+            R = ec_add(R, P, p)
+        P = ec_add(P, P, p)
+        k >>= 1
+    return R
+
+
+def test_curve(bits: int, rng: random.Random) -> tuple:
+    """(p, q, G) with y^2 = x^3 + 1 over p = 6q - 1 and G of prime order q."""
+    while True:
+        q = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        p = 6 * q - 1
+        if is_prime(q) and is_prime(p):
+            break
+    while True:
+        # p = 2 mod 3: x -> x^3 est bijectif, tout y donne un point
+        y = rng.randrange(1, p)
+        x = pow((y * y - 1) % p, (2 * p - 1) // 3, p)
+        G = ec_mul(6, (x, y), p)
+        if G is not None:
+            return p, q, G
+
+
+# ========== Marches ==========
+def _steps(p: int, q: int, G, Q, seed: int) -> list:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(R_SIZE):
+        c, d = rng.randrange(q), rng.randrange(q)
+        out.append((ec_add(ec_mul(c, G, p), ec_mul(d, Q, p), p), c, d))
+    return out
+
+
+def _walker(wid: int, problem: dict, out: mp.Queue, stop, counter):
+    p, q = problem["p"], problem["q"]
+    G, Q = tuple(problem["G"]), tuple(problem["Q"])
+    steps = _steps(p, q, G, Q, problem["seed"])
+    mask = (1 << problem["dp_bits"]) - 1
+    limit = MAX_WALK << problem["dp_bits"]
+    rng = random.Random(os.urandom(16))
+    # départs S_i = S_0 + i*T: un départ frais coûte une addition, pas deux multiplications
+    sc, sd, tc, td = (rng.randrange(q) for _ in range(4))
+    S = ec_add(ec_mul(sc, G, p), ec_mul(sd, Q, p), p)
+    T = ec_add(ec_mul(tc, G, p), ec_mul(td, Q, p), p)
+    found, done = [], 0
+    while not stop.is_set():
+        S, sc, sd = ec_add(S, T, p), (sc + tc) % q, (sd + td) % q
+        X, c, d = S, sc, sd
+        for _ in range(limit):
+            if X is None or not X[0] & mask:
+                break
+            (rx, ry), rc, rd = steps[X[0] % R_SIZE]
+            x1, y1 = X
+            if x1 == rx:
+                X = ec_add(X, (rx, ry), p)
+            else:
+                # chemin courant: addition de deux points distincts
+                s = (ry - y1) * pow(rx - x1, -1, p) % p
+                x3 = (s * s - x1 - rx) % p
+                X = x3, (s * (x1 - x3) - y1) % p
+            c, d = (c + rc) % q, (d + rd) % q
+            done += 1
+        else:
+            continue  # marche piégée dans un cycle
+        if X is not None:
+            found.append((X[0], X[1], c, d))
+        if len(found) >= BATCH:
+            with counter.get_lock():
+                counter.value += done
+            out.put(found)
+            found, done = [], 0
+    with counter.get_lock():
+        counter.value += done
+
+
+# ========== Stockage des points distingués ==========
+class DPStore:
+    """Append-only file: one JSON header line, then fixed-width (x, y, c, d) records."""
+
+    def __init__(self, path: str, problem: dict):
+        self.path = path
+        self.width = (max(problem["p"], problem["q"]).bit_length() + 7) // 8
+        self.size = 4 * self.width
+        header = (json.dumps(problem, sort_keys=True) + "\n").encode()
+        self.points = []
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                old = f.readline()
+                if old != header:
+                    raise ValueError(f"{path} belongs to another problem")
+                raw = f.read()
+            whole = len(raw) // self.size * self.size  # dernier record peut-être tronqué
+            for i in range(0, whole, self.size):
+                rec = raw[i:i + self.size]
+                self.points.append(tuple(int.from_bytes(rec[k:k + self.width], "little")
+                                         for k in range(0, self.size, self.width)))
+            self.f = open(path, "r+b")
+            self.f.seek(len(header) + whole)
+            self.f.truncate()
+        elif path:
+            self.f = open(path, "wb")
+            self.f.write(header)
+        else:
+            self.f = None
+
+    def append(self, points: list):
+        if self.f is None:
+            return
+        self.f.write(b"".join(v.to_bytes(self.width, "little") for pt in points for v in pt))
+        self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+
+class Collision(Exception):
+    pass
+
+
+def _check(table: dict, point: tuple, q: int):
+    """Add a distinguished point; raise Collision(log) if it gives log_G Q."""
+    x, y, c, d = point
+    old = table.get(x)
+    if old is None:
+        table[x] = (y, c, d)
+        return
+    y0, c0, d0 = old
+    # cG + dQ = ±(c0 G + d0 Q)
+    if y == y0:
+        num, den = c - c0, d0 - d
+    else:
+        num, den = c + c0, -(d + d0)
+    if den % q:
+        raise Collision(num * pow(den, -1, q) % q)
+
+
+def rho_log(p: int, q: int, G, Q, workers: int = None, dp_bits: int = None, store: str = None,
+            seed: int = 0, report: float = 5.0) -> tuple:
+    """(log_G Q, stats dict) in the subgroup of prime order q of y^2 = x^3 + b over p."""
+    workers = workers or os.cpu_count() or 1
+    if dp_bits is None:
+        # ~sqrt(q) pas au total: quelques milliers de points distingués
+        dp_bits = max(0, (q.bit_length() // 2) - 12)
+    problem = {"p": p, "q": q, "G": list(G), "Q": list(Q), "seed": seed, "dp_bits": dp_bits}
+    dps = DPStore(store, problem)
+    table = {}
+    stats = {"workers": workers, "dp_bits": dp_bits, "resumed": len(dps.points), "dps": 0, "steps": 0}
+    ctx = mp.get_context("fork")
+    out, stop, counter = ctx.Queue(), ctx.Event(), ctx.Value("q", 0)
+    t0 = time.perf_counter()
+    try:
+        for pt in dps.points:
+            _check(table, pt, q)
+        procs = [ctx.Process(target=_walker, args=(w, problem, out, stop, counter), daemon=True)
+                 for w in range(workers)]
+        for proc in procs:
+            proc.start()
+        last = t0
+        try:
+            while True:
+                try:
+                    batch = out.get(timeout=1.0)
+                except queue.Empty:
+                    # plus aucun walker: sans ça on attendrait une collision pour toujours
+                    if not any(proc.is_alive() for proc in procs):
+                        codes = [proc.exitcode for proc in procs]
+                        raise RuntimeError(f"all rho walkers died (exit codes {codes})")
+                    batch = []
+                dps.append(batch)
+                stats["dps"] += len(batch)
+                for pt in batch:
+                    _check(table, pt, q)
+                now = time.perf_counter()
+                if report and now - last >= report:
+                    last = now
+                    print(f"    {now - t0:6.1f}s: {len(table)} distinguished points, "
+                          f"{counter.value / (now - t0):.0f} steps/s", file=sys.stderr)
+        finally:
+            stop.set()
+            for proc in procs:
+                proc.join(timeout=2)
+                if proc.is_alive():
+                    proc.terminate()
+    except Collision as hit:
+        x = hit.args[0]
+    finally:
+        dps.close()
+    stats["steps"] = counter.value
+    stats["seconds"] = time.perf_counter() - t0
+    if ec_mul(x, G, p) != tuple(Q):
+        raise ValueError("collision gave a wrong log")
+    return x, stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parallel Pollard rho on a test curve with a prime subgroup")
+    parser.add_argument("--bits", type=int, default=36, help="size of the prime subgroup order q")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dp-bits", type=int)
+    parser.add_argument("--store", help="distinguished-point file (resumed if it matches)")
+    parser.add_argument("--seed", type=int, default=1, help="test curve, secret and walk seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    p, q, G = test_curve(args.bits, rng)
+    secret = rng.randrange(q)
+    Q = ec_mul(secret, G, p)
+    print(f"[+] p = {p}, q = {q} ({args.bits} bits), setup {time.perf_counter() - t0:.2f}s")
+
+    x, stats = rho_log(p, q, G, Q, args.workers, args.dp_bits, args.store, args.seed)
+    rate = stats["steps"] / stats["seconds"]
+    print(f"[+] log = {x}, correct: {x == secret}")
+    print(f"[+] {stats['workers']} workers, dp_bits {stats['dp_bits']}: {stats['dps']} new + "
+          f"{stats['resumed']} stored distinguished points, {stats['steps']} steps in "
+          f"{stats['seconds']:.2f}s ({rate:.0f} steps/s, {rate / stats['workers']:.0f} per worker)")
+    return 0 if x == secret else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,40 +11,288 @@ Gy = 728430165157041631
 
 FLAG = os.environ.get('FLAG', 'pascalCTF{REDACTED}')
 
+WNAF_WIDTH = 4
+COMB_WIDTH = 4
+
+
+# ========== Arithmétique jacobienne ==========
+# (X, Y, Z) représente (X/Z^2, Y/Z^3); Z = 0 est le point à l'infini
+def _jdouble(X, Y, Z):
+    if not Z or not Y:
+        return 1, 1, 0
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    M = 3 * X * X
+    if a:
+        ZZ = Z * Z % p
+        M += a * ZZ * ZZ
+    M %= p
+    X3 = (M * M - 2 * S) % p
+    return X3, (M * (S - X3) - 8 * YY * YY) % p, 2 * Y * Z % p
+
+
+def _jadd(X1, Y1, Z1, X2, Y2, Z2):
+    if not Z1:
+        return X2, Y2, Z2
+    if not Z2:
+        return X1, Y1, Z1
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    H = (X2 * Z1Z1 - U1) % p
+    R = (Y2 * Z1 * Z1Z1 - S1) % p
+    if not H:
+        return _jdouble(X1, Y1, Z1) if not R else (1, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    return X3, (R * (V - X3) - S1 * HHH) % p, Z1 * Z2 * H % p
+
+
+def _jadd_affine(X1, Y1, Z1, x2, y2):
+    """_jadd with Z2 = 1 (second point affine)."""
+    if not Z1:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    H = (x2 * Z1Z1 - X1) % p
+    R = (y2 * Z1 * Z1Z1 - Y1) % p
+    if not H:
+        return _jdouble(X1, Y1, Z1) if not R else (1, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    return X3, (R * (V - X3) - Y1 * HHH) % p, Z1 * H % p
+
+
+def _wnaf(k: int, w: int = WNAF_WIDTH) -> list:
+    """Width-w NAF digits of k, least significant first (odd digits below 2^(w-1) in absolute value)."""
+    digits = []
+    half, full = 1 << (w - 1), 1 << w
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
 class Point:
+    """Curve point, affine from the outside (x, y; None for O), Jacobian inside.
+
+    Additions and doublings work on (X, Y, Z) without any inversion; x and
+    y are normalised (one inversion) the first time they are read.  Points
+    built from coordinates outside [0, p) go through the original affine
+    code, whose comparisons on the raw values decide the result.
+    """
+    __slots__ = ("X", "Y", "Z", "_affine", "_comb")
+
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-    
-    def __add__(self, other):
-        if self.x is None:
-            return other
-        if other.x is None:
-            return self
-        if self.x == other.x and self.y == (-other.y % p):
-            return Point(None, None)
-        if self.x == other.x:
-            s = (3 * self.x**2 + a) * inverse(2 * self.y, p) % p
+        self._affine = (x, y)
+        self._comb = None
+        if x is None:
+            self.X, self.Y, self.Z = 1, 1, 0
         else:
-            s = (other.y - self.y) * inverse(other.x - self.x, p) % p
-        x3 = (s*s - self.x - other.x) % p
-        y3 = (s * (self.x - x3) - self.y) % p
-        return Point(x3, y3)
-    
+            self.X, self.Y, self.Z = x, y, 1
+
+    @classmethod
+    def _jacobian(cls, X, Y, Z) -> "Point":
+        P = cls.__new__(cls)
+        P.X, P.Y, P.Z = X, Y, Z
+        P._affine = None
+        P._comb = None
+        return P
+
+    def _normalise(self):
+        if not self.Z:
+            self._affine = (None, None)
+            return
+        zi = pow(self.Z, -1, p)
+        zi2 = zi * zi % p
+        self._affine = (self.X * zi2 % p, self.Y * zi2 * zi % p)
+
+    @property
+    def x(self):
+        if self._affine is None:
+            self._normalise()
+        return self._affine[0]
+
+    @property
+    def y(self):
+        if self._affine is None:
+            self._normalise()
+        return self._affine[1]
+
+    def _raw(self) -> bool:
+        """Built from coordinates outside [0, p) (only then can the two paths differ)."""
+        if self.Z != 1 or self._affine is None:
+            return False
+        x, y = self._affine
+        return x is not None and not (0 <= x < p and 0 <= y < p)
+
+    def __add__(self, other):
+        if self._raw() or other._raw():
+            return _affine_add(self, other)
+        return Point._jacobian(*_jadd(self.X, self.Y, self.Z, other.X, other.Y, other.Z))
+
+    def precompute(self, bits: int = None):
+        """Keep a fixed-base comb table: later k * self cost additions only."""
+        if not self._raw() and self._comb is None:
+            self._comb = FixedBase(self, bits)
+        return self
+
     def __rmul__(self, scalar):
-        result = Point(None, None)
-        addend = self
-        while scalar:
-            if scalar & 1:
-                result = result + addend
-            addend = addend + addend
-            scalar >>= 1
-        return result
+        if scalar < 0:
+            # la boucle d'origine ne se termine jamais sur un scalaire négatif
+            raise ValueError("negative scalar")
+        if self._raw():
+            return _mul_affine(scalar, self)
+        if self._comb is not None:
+            return self._comb.mul(scalar)
+        if not scalar or not self.Z:
+            return Point(None, None)
+        # multiples impairs P, 3P, ..., (2^(w-1) - 1)P
+        X, Y, Z = self.X, self.Y, self.Z
+        twice = _jdouble(X, Y, Z)
+        odd = [(X, Y, Z)]
+        for _ in range((1 << (WNAF_WIDTH - 2)) - 1):
+            odd.append(_jadd(*odd[-1], *twice))
+        RX, RY, RZ = 1, 1, 0
+        for d in reversed(_wnaf(scalar)):
+            RX, RY, RZ = _jdouble(RX, RY, RZ)
+            if d > 0:
+                RX, RY, RZ = _jadd(RX, RY, RZ, *odd[d >> 1])
+            elif d < 0:
+                X, Y, Z = odd[-d >> 1]
+                RX, RY, RZ = _jadd(RX, RY, RZ, X, -Y % p, Z)
+        return Point._jacobian(RX, RY, RZ)
+
+
+def normalise(points):
+    """Compute the affine x, y of many points with a single inversion (Montgomery's trick)."""
+    todo = []
+    for P in points:
+        if P._affine is None:
+            if P.Z:
+                todo.append(P)
+            else:
+                P._affine = (None, None)
+    if not todo:
+        return points
+    prefix = [1] * (len(todo) + 1)
+    for i, P in enumerate(todo):
+        prefix[i + 1] = prefix[i] * P.Z % p
+    inv = pow(prefix[-1], -1, p)
+    for i in range(len(todo) - 1, -1, -1):
+        P = todo[i]
+        zi = inv * prefix[i] % p
+        inv = inv * P.Z % p
+        zi2 = zi * zi % p
+        P._affine = (P.X * zi2 % p, P.Y * zi2 * zi % p)
+    return points
+
+
+class FixedBase:
+    """Comb table of a fixed point P: row i holds d * 2^(w*i) * P for d = 1..2^w - 1.
+
+    k * P is then one mixed addition per non-zero w-bit digit of k, with
+    no doubling.  Rows are stored affine (normalised together with one
+    inversion).  When n * P = O, which holds for G and Q, k is reduced
+    mod n first; otherwise a k wider than the table goes through wNAF.
+    """
+    __slots__ = ("P", "width", "rows", "order")
+
+    def __init__(self, P: Point, bits: int = None, width: int = COMB_WIDTH):
+        self.P = P
+        self.width = width
+        self.order = n if (n * P).Z == 0 else None
+        bits = bits or n.bit_length()
+        flat = []
+        X, Y, Z = P.X, P.Y, P.Z
+        for _ in range(-(-bits // width)):
+            row = [(X, Y, Z)]
+            for _ in range((1 << width) - 2):
+                row.append(_jadd(*row[-1], X, Y, Z))
+            flat += row
+            for _ in range(width):
+                X, Y, Z = _jdouble(X, Y, Z)
+        pts = normalise([Point._jacobian(*j) for j in flat])
+        per = (1 << width) - 1
+        self.rows = [[None] + [pt._affine if pt.Z else None for pt in pts[i:i + per]]
+                     for i in range(0, len(pts), per)]
+
+    def mul(self, k: int) -> Point:
+        if k < 0:
+            raise ValueError("negative scalar")
+        if self.order is not None:
+            k %= self.order
+        elif k >> (self.width * len(self.rows)):
+            P = self.P
+            return k * Point._jacobian(P.X, P.Y, P.Z)  # copie sans table: wNAF
+        X, Y, Z = 1, 1, 0
+        mask = (1 << self.width) - 1
+        for row in self.rows:
+            if not k:
+                break
+            entry = row[k & mask]
+            if entry is not None:
+                X, Y, Z = _jadd_affine(X, Y, Z, *entry)
+            k >>= self.width
+        return Point._jacobian(X, Y, Z)
+
+
+def batch_mul(ks, P: Point) -> list:
+    """[k * P for k in ks]: one comb table for P, additions only, one final inversion."""
+    ks = list(ks)
+    if P._raw():
+        return [k * P for k in ks]
+    table = P._comb
+    if table is None:
+        top = max((k.bit_length() for k in ks), default=0)
+        table = FixedBase(P, max(top, 1))
+    return normalise([table.mul(k) for k in ks])
+
+
+# ========== Chemin affine d'origine ==========
+def _affine_add(P, Q):
+    """The original Point.__add__, one inversion per operation."""
+    if P.x is None:
+        return Q
+    if Q.x is None:
+        return P
+    if P.x == Q.x and P.y == (-Q.y % p):
+        return Point(None, None)
+    if P.x == Q.x:
+        s = (3 * P.x**2 + a) * inverse(2 * P.y, p) % p
+    else:
+        s = (Q.y - P.y) * inverse(Q.x - P.x, p) % p
+    x3 = (s*s - P.x - Q.x) % p
+    y3 = (s * (P.x - x3) - P.y) % p
+    return Point(x3, y3)
+
+
+def _mul_affine(scalar, P):
+    """The original double-and-add on _affine_add."""
+    result = Point(None, None)
+    addend = P
+    while scalar:
+        if scalar & 1:
+            result = _affine_add(result, addend)
+        addend = _affine_add(addend, addend)
+        scalar >>= 1
+    return result
 
 def main():
     secret = bytes_to_long(os.urandom(8)) % n
-    G = Point(Gx, Gy)
-    Q = secret * G
+    G = Point(Gx, Gy).precompute()
+    Q = (secret * G).precompute()
     
     print("Curve Ball")
     print(f"y^2 = x^3 + 1 (mod {p})")
@@ -0,0 +1,324 @@
+"""Exact multi-modular solver for the Ice Cramer equation systems.
+
+solve.py hands the whole text to two global regexes, cuts the
+coefficients into rows of a hard-coded 28, and solves with sympy's
+``Matrix.LUsolve``.  That is exact, but it uses Python rationals and
+becomes slow and memory-hungry at a few hundred unknowns.  Here:
+
+* ``parse_system`` reads ``generate_system`` lines one at a time (file or
+  any iterable of lines), places each ``k*x_i`` by its index, infers the
+  number of unknowns and stops at the first non-equation line;
+* ``solve`` runs Gauss elimination of [A | b] modulo 21-bit primes on
+  NumPy int64, one prime after the other.  A product of two residues is
+  below 2^42, so the trailing block takes ~2^20 row updates before it
+  must be reduced: only the pivot row and column are reduced at each
+  step, which leaves one outer product and one in-place subtraction per
+  step.  The residues are combined by CRT, and each entry is
+  rationally reconstructed over a common denominator.  It stops as soon as
+  the candidate satisfies every row exactly; for the challenge's integer
+  solutions one prime is enough;
+* the ``SolveReport`` gives the equation and unknown counts, rank(A) and
+  rank([A | b]) (consistency), uniqueness, the primes used, the phase
+  times and the verification result.  A rank-deficient but consistent
+  system gets the solution whose free unknowns are 0.
+
+    python3 linsolve.py [n]      # solve source/output.txt, then a random n x n system (default 1000)
+"""
+import math
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+PRIME_BITS = 21
+TERM = re.compile(r"(-?\d+)\s*\*\s*x_(\d+)")
+
+
+# ========== Lecture ==========
+def parse_system(lines) -> tuple:
+    """(A int64 (rows, n), b int64) from ``generate_system`` lines, n = highest x_i index + 1."""
+    rows, rhs, width = [], [], 0
+    for line in lines:
+        lhs, eq, right = line.partition("=")
+        if not eq:
+            if rows:
+                break  # fin des équations: "Solve the system..."
+            continue
+        terms = TERM.findall(lhs)
+        idx = np.fromiter((int(i) for _, i in terms), dtype=np.int64, count=len(terms))
+        coef = np.fromiter((int(k) for k, _ in terms), dtype=np.int64, count=len(terms))
+        if idx.size:
+            width = max(width, int(idx.max()) + 1)
+        rows.append((idx, coef))
+        rhs.append(int(right))
+    A = np.zeros((len(rows), width), dtype=np.int64)
+    for r, (idx, coef) in enumerate(rows):
+        np.add.at(A[r], idx, coef)  # un même x_i répété s'additionne
+    return A, np.array(rhs, dtype=np.int64)
+
+
+def load_system(path: str) -> tuple:
+    with open(path) as f:
+        return parse_system(f)
+
+
+# ========== Arithmétique modulaire ==========
+def _is_prime(m: int) -> bool:
+    # bases 2, 3, 5, 7: déterministe sous 3.2e9
+    d, s = m - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in (2, 3, 5, 7):
+        if m == a:
+            return True
+        x = pow(a, d, m)
+        if x in (1, m - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % m
+            if x == m - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes(bits: int = PRIME_BITS):
+    """Primes below 2^bits, largest first."""
+    q = (1 << bits) - 1
+    while q > 2:
+        if _is_prime(q):
+            yield q
+        q -= 2
+
+
+def eliminate_mod(A: np.ndarray, b: np.ndarray, p: int) -> tuple:
+    """(pivot columns, consistent, particular solution mod p) of A x = b mod p."""
+    rows, n = A.shape
+    M = np.empty((rows, n + 1), dtype=np.int64)
+    M[:, :n] = A % p
+    M[:, n] = b % p
+    pivots = []
+    r = 0
+    headroom = (1 << 62) // (p * p)  # mises à jour avant réduction complète
+    pending = 0
+    for c in range(n):
+        if r == rows:
+            break
+        col = M[r:, c]
+        col %= p
+        nz = np.flatnonzero(col)
+        if not nz.size:
+            continue
+        k = r + int(nz[0])
+        if k != r:
+            M[[r, k]] = M[[k, r]]
+        row = M[r, c:]
+        row %= p
+        row *= pow(int(row[0]), -1, p)
+        row %= p
+        if pending == headroom:
+            M[r + 1:, c:] %= p
+            pending = 0
+        # colonne c déjà réduite: seules les lignes suivantes accumulent
+        M[r + 1:, c:] -= np.outer(M[r + 1:, c], row)
+        pending += 1
+        pivots.append(c)
+        r += 1
+    M[r:, n] %= p
+    consistent = not M[r:, n].any()
+    # remontée: colonne par colonne, produits < 2^62
+    x = np.zeros(n, dtype=np.int64)
+    rhs = M[:r, n] % p
+    for i in range(r - 1, -1, -1):
+        c = pivots[i]
+        x[c] = rhs[i]
+        if i:
+            rhs[:i] = (rhs[:i] - M[:i, c] * x[c]) % p
+    return pivots, consistent, x
+
+
+def _ratrec(u: int, m: int, bound: int):
+    """(num, den) with num/den = u mod m and |num|, den <= bound, or None."""
+    r0, r1, t0, t1 = m, u % m, 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    if not t1 or abs(t1) > bound:
+        return None
+    if t1 < 0:
+        r1, t1 = -r1, -t1
+    return (r1, t1) if math.gcd(r1, t1) == 1 else None
+
+
+def _reconstruct(res: list, m: int):
+    """(numerators, common denominator) for the residues mod m, or None."""
+    bound = math.isqrt(m // 2)
+    den, out = 1, []
+    for u in res:
+        rr = _ratrec(u * den % m, m, bound)
+        if rr is None:
+            return None
+        num, d = rr
+        out.append((num, den * d))
+        den *= d
+        if den > bound:
+            return None
+    return [num * (den // d) for num, d in out], den
+
+
+def _verify(A: np.ndarray, b: np.ndarray, nums: list, den: int) -> bool:
+    """A @ nums == den * b on every row, exactly."""
+    big = max((abs(v) for v in nums), default=0)
+    amax = int(np.abs(A).max(initial=0))
+    if big * amax * max(A.shape[1], 1) < 1 << 62 and abs(den) * int(np.abs(b).max(initial=0)) < 1 << 62:
+        return bool((A @ np.array(nums, dtype=np.int64) == b * den).all())
+    lhs = A.astype(object) @ np.array(nums, dtype=object)
+    return all(int(l) == int(r) * den for l, r in zip(lhs, b))
+
+
+# ========== Rapport ==========
+class SolveReport:
+    def __init__(self, A: np.ndarray):
+        self.equations, self.unknowns = A.shape
+        self.rank = 0
+        self.rank_aug = 0
+        self.primes = 0
+        self.unlucky = 0
+        self.verified = False
+        self.phases = {}
+
+    @property
+    def consistent(self) -> bool:
+        return self.rank == self.rank_aug
+
+    @property
+    def unique(self) -> bool:
+        return self.consistent and self.rank == self.unknowns
+
+    def __str__(self):
+        phases = ", ".join(f"{k} {v:.2f}s" for k, v in self.phases.items())
+        return (f"{self.equations} equations, {self.unknowns} unknowns, rank {self.rank}, "
+                f"rank [A|b] {self.rank_aug}: consistent={self.consistent}, unique={self.unique}, "
+                f"{self.primes} prime(s) ({self.unlucky} discarded), verified={self.verified} | {phases}")
+
+
+def _hadamard_bits(A: np.ndarray, b: np.ndarray) -> int:
+    """Bits of a bound on every minor of [A | b] (Cramer numerators and denominator)."""
+    norms = np.sqrt((A.astype(np.float64) ** 2).sum(axis=1) + b.astype(np.float64) ** 2)
+    return int(np.log2(np.maximum(norms, 1.0)).sum()) + 1
+
+
+def solve(A: np.ndarray, b: np.ndarray) -> tuple:
+    """(x, SolveReport): x as a list of ints (or Fractions), None when inconsistent.
+
+    Primes are added until the reconstructed candidate satisfies every
+    row; the Hadamard bound caps how many can be needed.
+    """
+    from fractions import Fraction
+
+    A = np.asarray(A, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    report = SolveReport(A)
+    limit = 2 * _hadamard_bits(A, b) // (PRIME_BITS - 1) + 2
+    ref, residues, m = None, None, 1
+    t_elim = t_rec = 0.0
+    for p in primes():
+        t0 = time.perf_counter()
+        pivots, consistent, xp = eliminate_mod(A, b, p)
+        t1 = time.perf_counter()
+        t_elim += t1 - t0
+        report.primes += 1
+        key = (len(pivots), not consistent)
+        if ref is not None and key != ref[0]:
+            # rang modulaire plus petit (ou plus grand): premier malchanceux
+            if key < ref[0]:
+                report.unlucky += 1
+                continue
+            report.unlucky += report.primes - 1
+            ref, residues, m = None, None, 1
+        if ref is None:
+            ref = (key, pivots)
+            report.rank = len(pivots)
+            report.rank_aug = len(pivots) + (not consistent)
+        elif pivots != ref[1]:
+            report.unlucky += 1
+            continue
+        if not consistent:
+            if report.primes >= 2:
+                break  # deux premiers d'accord: incompatible sur Q
+            continue
+        # CRT
+        if residues is None:
+            residues = [int(v) for v in xp]
+        else:
+            inv = pow(m, -1, p)
+            residues = [u + m * ((int(v) - u) * inv % p) for u, v in zip(residues, xp.tolist())]
+        m *= p
+        rec = _reconstruct(residues, m)
+        t_rec += time.perf_counter() - t1
+        if rec is not None and _verify(A, b, *rec):
+            report.verified = True
+            break
+        if report.primes - report.unlucky >= limit:
+            break
+    report.phases["eliminate"] = t_elim
+    report.phases["crt+verify"] = t_rec
+    if not report.consistent or not report.verified:
+        return None, report
+    nums, den = rec
+    x = nums if den == 1 else [Fraction(v, den) for v in nums]
+    return x, report
+
+
+def main() -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ok = True
+
+    A, b = load_system(os.path.join(here, "source", "output.txt"))
+    x, report = solve(A, b)
+    print(f"[+] output.txt: {report}")
+    print(f"    flag: pascalCTF{{{''.join(chr(v) for v in x)}}}")
+    ok &= report.verified
+
+    # système au format de generate_system, relu ligne par ligne
+    rng = np.random.default_rng(1)
+    values = rng.integers(32, 127, n)
+    K = rng.integers(-100, 101, (n, n))
+    lines = (" + ".join(f"{k}*x_{i}" for i, k in enumerate(row)) + f" = {int(row @ values)}\n"
+             for row in K.tolist())
+    t0 = time.perf_counter()
+    A, b = parse_system(lines)
+    t1 = time.perf_counter()
+    x, report = solve(A, b)
+    print(f"[+] random {n}x{n}: parsed in {t1 - t0:.2f}s, {report}")
+    ok &= x == values.tolist()
+
+    # solution rationnelle: plusieurs premiers et reconstruction
+    A = rng.integers(-100, 101, (60, 60))
+    b = rng.integers(-100, 101, 60)
+    x, report = solve(A, b)
+    print(f"[+] random 60x60, rational solution: {report}")
+    ok &= report.verified and report.primes > 1
+
+    # rang déficient, compatible puis incompatible
+    A = rng.integers(-100, 101, (40, 30))
+    A[:, -1] = A[:, 0] + A[:, 1]
+    b = A @ rng.integers(0, 100, 30)
+    x, report = solve(A, b)
+    print(f"[+] 40x30 of rank 29: {report}")
+    ok &= report.consistent and not report.unique and report.verified
+    b[0] += 1
+    x, report = solve(A, b)
+    print(f"[+] same with one right-hand side changed: {report}")
+    ok &= not report.consistent and x is None
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
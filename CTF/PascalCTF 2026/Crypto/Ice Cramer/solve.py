@@ -1,23 +1,6 @@
-import re
-from sympy import Matrix
+from linsolve import load_system, solve
 
-s = open('./source/output.txt').read()
+A, b = load_system('./source/output.txt')
+x, report = solve(A, b)
 
-pat  = re.findall(r"([-]?\d+)\*x_\d+", s)
-solu = re.findall(r"= ([-]?\d+)", s)
-
-rows = []
-row = []
-
-for i in pat:
-    row.append(int(i))
-    if len(row) == 28:
-        rows.append(row)
-        row = []
-
-A = Matrix(rows)
-b = Matrix([int(i) for i in solu])
-
-x = A.LUsolve(b)
-
-print(''.join(chr(int(i)) for i in x))
\ No newline at end of file
+print(''.join(chr(int(i)) for i in x))
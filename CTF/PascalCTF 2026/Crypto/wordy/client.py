@@ -0,0 +1,184 @@
+"""Buffered, pipelined line-protocol client for the Wordy service.
+
+``recv(1)`` per byte and timeout polling made every exchange cost dozens of
+syscalls plus timeout stalls.  ``LineClient`` reads into one reusable
+buffer with ``recv_into`` and splits lines from it, so a syscall returns as
+many lines as the kernel has.  Commands whose answers do not depend on each
+other (``NEW`` + the opening ``GUESS``, the five ``FINAL``) are written in a
+single ``sendall`` and their answers read back in order.
+
+Every answer is the first line starting with one of ``REPLIES``; anything
+else (banner, the local service's debug prints after FINAL) is kept in
+``client.noise``.  Latency is accounted per command name.
+
+    python3 client.py            # end-to-end check against source/service.py
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+REPLIES = ("ROUND STARTED", "FEEDBACK", "OK", "FAIL", "ERR")
+
+
+class LatencyCounter:
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, dt: float):
+        self.count += 1
+        self.total += dt
+        self.min = min(self.min, dt)
+        self.max = max(self.max, dt)
+
+    def __str__(self):
+        if not self.count:
+            return "n=0"
+        return (f"n={self.count} avg={self.total / self.count * 1000:.2f}ms "
+                f"min={self.min * 1000:.2f}ms max={self.max * 1000:.2f}ms")
+
+
+class LineClient:
+    def __init__(self, sock: socket.socket, bufsize: int = 1 << 16):
+        self.sock = sock
+        self._chunk = bytearray(bufsize)
+        self._view = memoryview(self._chunk)
+        self._buf = bytearray()
+        self._pos = 0
+        self.noise = []
+        self.latency = defaultdict(LatencyCounter)
+        self.syscalls = 0
+
+    @classmethod
+    def connect(cls, host: str, port: int, timeout: float = None) -> "LineClient":
+        sock = socket.create_connection((host, port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(sock)
+
+    def close(self):
+        self.sock.close()
+
+    def _fill(self):
+        if self._pos:
+            del self._buf[:self._pos]
+            self._pos = 0
+        n = self.sock.recv_into(self._chunk)
+        self.syscalls += 1
+        if n == 0:
+            raise EOFError("connection closed")
+        self._buf += self._view[:n]
+
+    def read_line(self) -> str:
+        while True:
+            end = self._buf.find(b"\n", self._pos)
+            if end >= 0:
+                line = self._buf[self._pos:end]
+                self._pos = end + 1
+                return line.decode().strip()
+            self._fill()
+
+    def lines(self):
+        """Iterate over incoming lines until the peer closes."""
+        try:
+            while True:
+                yield self.read_line()
+        except EOFError:
+            return
+
+    def read_until(self, marker: str) -> str:
+        """Every line up to and including the first one containing ``marker``."""
+        out = []
+        for line in self.lines():
+            out.append(line)
+            if marker in line:
+                break
+        return "\n".join(out)
+
+    def read_reply(self) -> str:
+        while True:
+            line = self.read_line()
+            if line.startswith(REPLIES):
+                return line
+            self.noise.append(line)
+
+    def send(self, *lines: str):
+        self.sock.sendall("".join(l + "\n" for l in lines).encode())
+        self.syscalls += 1
+
+    def pipeline(self, lines) -> list:
+        """Send every command at once, then read their replies in order."""
+        lines = list(lines)
+        t0 = time.perf_counter()
+        self.send(*lines)
+        replies = []
+        for line in lines:
+            replies.append(self.read_reply())
+            self.latency[line.split()[0].upper()].add(time.perf_counter() - t0)
+        return replies
+
+    def request(self, line: str) -> str:
+        return self.pipeline([line])[0]
+
+    def report(self) -> str:
+        rows = [f"    {cmd:<6} {c}" for cmd, c in sorted(self.latency.items())]
+        return "\n".join(rows + [f"    syscalls: {self.syscalls}"])
+
+
+def local_service(path: str = None):
+    """(client, process) talking to source/service.py over a socketpair."""
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "source", "service.py")
+    ours, theirs = socket.socketpair()
+    proc = subprocess.Popen([sys.executable, path], stdin=theirs, stdout=theirs)
+    theirs.close()
+    return LineClient(ours), proc
+
+
+def main() -> int:
+    import wordspace as ws
+    from guesser import Guesser
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    client, proc = local_service()
+    client.read_until("READY")
+    guesser = Guesser()
+    opening = ws.index_to_word(guesser.best_guess(ws.CandidateSet()))
+
+    t0 = time.time()
+    guesses = 0
+    for _ in range(rounds):
+        started, reply = client.pipeline(["NEW", f"GUESS {opening}"])
+        assert started == "ROUND STARTED", started
+        cands, history = ws.CandidateSet(), []
+        guess = opening
+        while True:
+            guesses += 1
+            code = ws.pattern_to_code(reply.split()[1])
+            history.append((ws.word_to_index(guess), code))
+            if code == ws.ALL_GREEN:
+                break
+            cands = cands.filter(ws.word_to_index(guess), code)
+            # contrôle de bout en bout: le dernier candidat doit donner GGGGG
+            guess = ws.index_to_word(guesser.best_guess(cands, history)) if len(cands) > 1 \
+                else ws.index_to_word(int(cands.idx[0]))
+            reply = client.request(f"GUESS {guess}")
+    replies = client.pipeline([f"FINAL {opening}"] * 5)
+    dt = time.time() - t0
+
+    client.send("QUIT")
+    proc.wait(timeout=5)
+    client.close()
+    print(f"[+] {rounds} rounds solved and confirmed GGGGG, {guesses} GUESS, {dt:.2f}s")
+    print(f"[+] FINAL batch: {replies}")
+    print(client.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Entropy-maximising guess selection for Wordy.
+
+Every GUESS costs a network round-trip, so instead of guessing any
+remaining candidate we pick the word whose feedback splits the candidates
+best: the guess maximising the Shannon entropy of the 243-way feedback
+distribution (plus 1/n when it is itself a candidate and could win).
+
+On the full 2^20 space scoring every word against every candidate is out
+of reach, so guesses and candidates are sampled (deterministically); each
+guess is then scored against all sampled candidates in one vectorised
+feedback pass.  The first two guesses only depend on the
+feedback so far, so they are kept in a JSON opening cache (openings.json,
+shipped prebuilt by ``build`` and only read while solving; a missing entry
+is computed and remembered for the rest of the process).
+
+    python3 guesser.py build    # precompute the first two levels of openings.json
+    python3 guesser.py [games]  # simulate games against random secrets
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import wordspace as ws
+
+OPENING_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.json")
+
+
+def entropy_scores(guesses, cands) -> np.ndarray:
+    """Entropy (bits) of the feedback distribution of each guess over ``cands``."""
+    cols = ws.columns(cands)
+    n = cols.shape[1]
+    out = np.empty(len(guesses), dtype=np.float64)
+    for j, g in enumerate(guesses):
+        counts = np.bincount(ws.feedback_columns(int(g), cols), minlength=ws.PATTERNS)
+        p = counts[counts > 0] / n
+        out[j] = -(p * np.log2(p)).sum()
+    return out
+
+
+class Guesser:
+    def __init__(self, guess_sample=768, cand_sample=4096, seed=0,
+                 cache_path=OPENING_CACHE, cache_depth=2):
+        self.guess_sample = guess_sample
+        self.cand_sample = cand_sample
+        self.seed = seed
+        self.cache_path = cache_path
+        self.cache_depth = cache_depth
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self.cache = json.load(f)
+
+    def _key(self, history):
+        return ",".join(f"{guess}:{code}" for guess, code in history)
+
+    def best_guess(self, cands, history=()) -> int:
+        """Best next guess given the candidates (CandidateSet or indices) and past (guess, code) pairs."""
+        if isinstance(cands, ws.CandidateSet):
+            cands = cands.idx
+        cands = np.asarray(cands, dtype=np.uint32)
+        if cands.size <= 2:
+            return int(cands[0])
+        key = self._key(history)
+        cached = len(history) < self.cache_depth
+        if cached and key in self.cache:
+            return self.cache[key]
+
+        rng = np.random.default_rng([self.seed, len(history), cands.size])
+        scored = cands
+        if cands.size > self.cand_sample:
+            scored = rng.choice(cands, self.cand_sample, replace=False)
+        pool = [rng.integers(0, ws.N, self.guess_sample // 2, dtype=np.uint32)]
+        pool.append(cands if cands.size <= self.guess_sample // 2
+                    else rng.choice(cands, self.guess_sample // 2, replace=False))
+        pool = np.unique(np.concatenate(pool))
+
+        score = entropy_scores(pool, scored)
+        score += np.isin(pool, cands) / cands.size
+        guess = int(pool[np.argmax(score)])
+
+        if cached:
+            self.cache[key] = guess  # en mémoire seulement: openings.json ne change qu'au build
+        return guess
+
+    def save(self):
+        """Write the opening cache to ``cache_path`` (the build step only)."""
+        if not self.cache_path:
+            return
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.cache, f, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+
+    def play(self, secret: int, max_guesses: int = 20):
+        """Offline game against ``secret``: returns the (guess, code) pairs sent."""
+        cands = ws.CandidateSet()
+        history = []
+        while len(cands) > 1 and len(history) < max_guesses:
+            g = self.best_guess(cands, history)
+            code = int(ws.feedback_codes(g, [secret])[0])
+            history.append((g, code))
+            if code == ws.ALL_GREEN:
+                return history
+            cands = cands.filter(g, code)
+        return history
+
+
+def build_openings(g: Guesser):
+    """Recompute the cache for the first guess and every second guess that can occur, then save it."""
+    g.cache.clear()
+    full = ws.CandidateSet()
+    first = g.best_guess(full)
+    codes = full.feedback(first)
+    for code in np.unique(codes):
+        if code != ws.ALL_GREEN:
+            g.best_guess(full.idx[codes == code], [(first, int(code))])
+    g.save()
+    print(f"[+] {len(g.cache)} openings in {g.cache_path}")
+
+
+def main() -> int:
+    g = Guesser()
+    if sys.argv[1:] == ["build"]:
+        build_openings(g)
+        return 0
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = np.random.default_rng()
+    t0 = time.time()
+    g.best_guess(ws.CandidateSet())
+    print(f"[+] Opening: {ws.index_to_word(g.cache[''])} ({time.time() - t0:.1f}s)")
+
+    lengths = []
+    t0 = time.time()
+    for _ in range(games):
+        history = g.play(int(rng.integers(0, ws.N)))
+        lengths.append(len(history))
+    dt = time.time() - t0
+    print(f"[+] {games} games: {np.mean(lengths):.2f} GUESS/secret on average "
+          f"(max {max(lengths)}), {dt / games:.2f}s CPU/secret")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
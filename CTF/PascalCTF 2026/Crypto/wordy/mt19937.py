@@ -0,0 +1,393 @@
+"""Shared MT19937 generator for the Wordy tooling: jump-ahead, rewind, bulk output.
+
+``service.py`` and ``slove.py`` each carry their own MT19937, and they are
+not even the same generator: the service twists from a copy of the old
+state (``variant="service"``), slove.py in place like the reference MT
+(``variant="standard"``).  Both are linear over GF(2), so one class covers
+them:
+
+* ``twist`` works on a NumPy uint32 state, vectorised, no list copies;
+* ``next_block(k)`` returns k outputs as a uint32 array;
+* ``jump(n)`` moves n outputs ahead in O(log n) polynomial operations:
+  the state after g twists is x^g mod phi(x) evaluated at the twist, phi
+  being the minimal polynomial of the twist on twisted states (found once
+  by Berlekamp-Massey, cached in mt_charpoly.json) and the powers
+  x^(2^k) mod phi kept in a per-variant jump table;
+* ``rewind(n)`` / ``jump(-n)`` step back n outputs.
+
+The in-place twist is undone word by word (``untwist_standard``); the
+low 31 bits of mt[0], which it never reads, come back from the last word
+of the same generation, so rewinding is exact down to the first twisted
+state.  The service twist is singular (phi(0) = 0, several states share
+a successor), so it has no untwist; there, and for long standard rewinds,
+the generator re-jumps forward from the state it started from.
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+N = 624
+M = 397
+MATRIX_A = 0x9908B0DF
+UPPER_MASK = 0x80000000
+LOWER_MASK = 0x7FFFFFFF
+VARIANTS = ("service", "standard")
+
+UNTWIST_MAX = 512  # au-delà, re-sauter depuis l'origine coûte moins cher
+CHARPOLY_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mt_charpoly.json")
+
+
+def temper(y: int) -> int:
+    y ^= (y >> 11)
+    y ^= ((y << 7) & 0x9D2C5680)
+    y ^= ((y << 15) & 0xEFC60000)
+    y ^= (y >> 18)
+    return y & 0xFFFFFFFF
+
+
+def temper_array(y: np.ndarray) -> np.ndarray:
+    y = y ^ (y >> np.uint32(11))
+    y ^= (y << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y ^= (y << np.uint32(15)) & np.uint32(0xEFC60000)
+    y ^= (y >> np.uint32(18))
+    return y
+
+
+def _undo_right(y: int, shift: int) -> int:
+    x = y
+    for _ in range(32 // shift + 1):
+        x = y ^ (x >> shift)
+    return x & 0xFFFFFFFF
+
+
+def _undo_left(y: int, shift: int, mask: int) -> int:
+    x = y
+    for _ in range(32 // shift + 1):
+        x = y ^ ((x << shift) & mask)
+    return x & 0xFFFFFFFF
+
+
+def untemper(y: int) -> int:
+    y = _undo_right(y, 18)
+    y = _undo_left(y, 15, 0xEFC60000)
+    y = _undo_left(y, 7, 0x9D2C5680)
+    return _undo_right(y, 11)
+
+
+def init_genrand(seed: int) -> np.ndarray:
+    mt = [seed & 0xFFFFFFFF]
+    for i in range(1, N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+    return np.array(mt, dtype=np.uint32)
+
+
+# ========== Twist / untwist ==========
+def _mix(hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    y = (hi & np.uint32(UPPER_MASK)) | (lo & np.uint32(LOWER_MASK))
+    return (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(MATRIX_A))
+
+
+def twist(mt: np.ndarray, variant: str = "service") -> np.ndarray:
+    """Next generation of a uint32[624] state (a new array)."""
+    if variant == "service":
+        return np.roll(mt, -M) ^ _mix(mt, np.roll(mt, -1))
+    new = np.empty_like(mt)
+    # en place: i + M >= N lit les mots déjà régénérés, par blocs de N - M
+    new[:N - M] = mt[M:] ^ _mix(mt[:N - M], mt[1:N - M + 1])
+    new[N - M:2 * (N - M)] = new[:N - M] ^ _mix(mt[N - M:2 * (N - M)], mt[N - M + 1:2 * (N - M) + 1])
+    new[2 * (N - M):N - 1] = new[N - M:M - 1] ^ _mix(mt[2 * (N - M):N - 1], mt[2 * (N - M) + 1:N])
+    new[N - 1] = new[M - 1] ^ _mix(mt[N - 1:], new[:1])[0]
+    return new
+
+
+def _untwist_y(v: int) -> int:
+    # v = mt[i + M] ^ mt'[i] -> y = (mt[i] & UPPER) | (mt[i + 1] & LOWER)
+    b = v >> 31
+    return (((v ^ (MATRIX_A if b else 0)) << 1) | b) & 0xFFFFFFFF
+
+
+def untwist_standard(new: np.ndarray) -> np.ndarray:
+    """Previous generation for the in-place twist.
+
+    The twist never reads the low 31 bits of old[0]; they are rebuilt from
+    old[623] = old[396] ^ mix(.., old[0]), which holds whenever ``old`` was
+    itself produced by a twist (i.e. everywhere but the seeded state).
+    """
+    old = new.copy()
+    for i in range(N - 1, -1, -1):
+        # y_i = old[i] (haut) | old[i + 1] (bas); old[i + M] est déjà reconstruit
+        src = old[i + M] if i + M < N else new[i + M - N]
+        y = _untwist_y(int(new[i]) ^ int(src))
+        old[i] = (y & UPPER_MASK) | (int(old[i]) & LOWER_MASK if i else 0)
+        if i + 1 < N:  # y_623 lit new[0], rien à apprendre sur old
+            old[i + 1] = (int(old[i + 1]) & UPPER_MASK) | (y & LOWER_MASK)
+    y = _untwist_y(int(old[N - 1]) ^ int(old[M - 1]))
+    old[0] = (int(old[0]) & UPPER_MASK) | (y & LOWER_MASK)
+    return old
+
+
+# ========== GF(2)[x] ==========
+def _poly_mul(a: int, b: int) -> int:
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    table = [0] * 256
+    for i in range(1, 256):
+        low = i & -i
+        table[i] = table[i ^ low] ^ (a << (low.bit_length() - 1))
+    out, shift = 0, 0
+    while b:
+        out ^= table[b & 0xFF] << shift
+        b >>= 8
+        shift += 8
+    return out
+
+
+class _PolyMod:
+    """Arithmetic modulo phi with byte-wise reduction tables."""
+
+    def __init__(self, phi: int):
+        self.phi = phi
+        self.deg = phi.bit_length() - 1
+        # octet de tête t: t * x^deg mod phi, pour réduire 8 bits à la fois
+        self.red = [0] * 256
+        for t in range(1, 256):
+            r = t << self.deg
+            for k in range(7, -1, -1):
+                if (r >> (self.deg + k)) & 1:
+                    r ^= self.phi << k
+            self.red[t] = r  # t * x^deg mod phi
+
+    def reduce(self, a: int) -> int:
+        while a.bit_length() > self.deg:
+            top = a.bit_length() - self.deg
+            k = max(0, top - 8)
+            t = a >> (self.deg + k)
+            a = (a & ((1 << (self.deg + k)) - 1)) ^ (self.red[t] << k)
+        return a
+
+    def mul(self, a: int, b: int) -> int:
+        return self.reduce(_poly_mul(a, b))
+
+
+def berlekamp_massey(bits) -> int:
+    """Minimal polynomial of a GF(2) sequence, as an int (bit i = coefficient of x^i)."""
+    c, b = 1, 1  # polynômes de connexion courant / précédent
+    L, m = 0, 1
+    window = 0  # bit i = bits[n - i]
+    for n, bit in enumerate(bits):
+        window = (window << 1) | bit
+        if not bin(c & window).count("1") & 1:
+            m += 1
+        elif 2 * L <= n:
+            c, b, L, m = c ^ (b << m), c, n + 1 - L, 1
+        else:
+            c ^= b << m
+            m += 1
+    # le polynôme minimal est le réciproque de degré L du polynôme de connexion
+    return int(format(c, "b")[::-1].ljust(L + 1, "0"), 2)
+
+
+def compute_charpoly(variant: str, seed: int = 5489) -> int:
+    """Minimal polynomial of the twist, from a generic state's bit sequence."""
+    mt = init_genrand(seed)
+    dim = 32 * N
+    bits = []
+    for _ in range(2 * dim + 64):
+        bits.append(int(mt[1]) & 1)
+        mt = twist(mt, variant)
+    return berlekamp_massey(bits)
+
+
+_CHARPOLYS = {}
+_TABLES = {}
+
+
+def charpoly(variant: str) -> int:
+    if variant not in _CHARPOLYS:
+        cache = {}
+        if os.path.exists(CHARPOLY_CACHE):
+            with open(CHARPOLY_CACHE) as f:
+                cache = json.load(f)
+        if variant not in cache:
+            cache[variant] = format(compute_charpoly(variant), "x")
+            with open(CHARPOLY_CACHE, "w") as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+        _CHARPOLYS[variant] = int(cache[variant], 16)
+    return _CHARPOLYS[variant]
+
+
+def jump_table(variant: str):
+    """(ring, [x^(2^k) mod phi for k < 64]) for ``variant``, built on first use."""
+    if variant not in _TABLES:
+        ring = _PolyMod(charpoly(variant))
+        powers = [ring.reduce(1 << 1)]
+        for _ in range(63):
+            powers.append(ring.mul(powers[-1], powers[-1]))
+        _TABLES[variant] = (ring, powers)
+    return _TABLES[variant]
+
+
+def jump_poly(generations: int, variant: str) -> int:
+    """x^generations mod phi, for 0 <= generations < 2^64."""
+    ring, powers = jump_table(variant)
+    if not 0 <= generations < 1 << 64:
+        raise ValueError("jump out of range")
+    acc = 1
+    for k in range(64):
+        if (generations >> k) & 1:
+            acc = ring.mul(acc, powers[k])
+    return acc
+
+
+def apply_poly(poly: int, mt: np.ndarray, variant: str) -> np.ndarray:
+    """p(T)(mt) by Horner's rule, T being one twist."""
+    acc = np.zeros(N, dtype=np.uint32)
+    for k in range(poly.bit_length() - 1, -1, -1):
+        acc = twist(acc, variant)
+        if (poly >> k) & 1:
+            acc ^= mt
+    return acc
+
+
+def advance(mt: np.ndarray, generations: int, variant: str = "service") -> np.ndarray:
+    """State ``generations`` twists after ``mt``."""
+    ring, _ = jump_table(variant)
+    if generations <= ring.deg:
+        # Horner coûte ~deg twists: en dessous, twister directement
+        for _ in range(generations):
+            mt = twist(mt, variant)
+        return mt
+    # phi n'annule que les états déjà twistés (deux fois pour "service")
+    for _ in range(2):
+        mt = twist(mt, variant)
+    return apply_poly(jump_poly(generations - 2, variant), mt, variant)
+
+
+class MT19937:
+    def __init__(self, seed: int = 5489, variant: str = "service"):
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown variant {variant!r}")
+        self.variant = variant
+        self.mt = init_genrand(seed)
+        self.index = N
+        self.generation = -1  # twists effectués - 1
+        self._origin = self.mt.copy()
+        self._origin_generation = self.generation
+
+    @classmethod
+    def from_state(cls, mt, index: int = 0, variant: str = "service") -> "MT19937":
+        """Generator whose next output is temper(mt[index])."""
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown variant {variant!r}")
+        rng = cls.__new__(cls)
+        rng.variant = variant
+        rng.mt = np.array(mt, dtype=np.uint32)
+        rng.index = index
+        rng.generation = 0
+        rng._origin = rng.mt.copy()
+        rng._origin_generation = 0
+        return rng
+
+    def twist(self):
+        self.mt = twist(self.mt, self.variant)
+        self.index = 0
+        self.generation += 1
+
+    def next_u32(self) -> int:
+        if self.index >= N:
+            self.twist()
+        y = int(self.mt[self.index])
+        self.index += 1
+        return temper(y)
+
+    def next_block(self, k: int) -> np.ndarray:
+        """The next ``k`` outputs as a uint32 array."""
+        out = np.empty(k, dtype=np.uint32)
+        done = 0
+        while done < k:
+            if self.index >= N:
+                self.twist()
+            take = min(k - done, N - self.index)
+            out[done:done + take] = temper_array(self.mt[self.index:self.index + take])
+            self.index += take
+            done += take
+        return out
+
+    def _shift_generations(self, g: int, index: int):
+        target = self.generation + g
+        if g >= 0:
+            self.mt = advance(self.mt, g, self.variant)
+        elif self.variant == "standard" and -g <= UNTWIST_MAX:
+            for _ in range(-g):
+                self.mt = untwist_standard(self.mt)
+        else:
+            self.mt = advance(self._origin, target - self._origin_generation, self.variant)
+        self.generation = target
+        self.index = index
+
+    @property
+    def position(self) -> int:
+        """Number of outputs produced since the state this generator started from."""
+        return self.generation * N + self.index
+
+    def jump(self, n: int):
+        """Advance by ``n`` outputs (n < 0 goes back)."""
+        if self.position + n < 0:
+            raise ValueError("cannot rewind before the first output")
+        # index == N et index == 0 de la génération suivante sont équivalents
+        g, idx = divmod(self.index + n, N)
+        if idx == 0 and g and self.generation + g > self._origin_generation:
+            g, idx = g - 1, N
+        self._shift_generations(g, idx)
+
+    def rewind(self, n: int = 1):
+        """Step back ``n`` outputs, so the next ``n`` calls replay them."""
+        self.jump(-n)
+
+
+def main() -> int:
+    for variant in VARIANTS:
+        t0 = time.time()
+        phi = charpoly(variant)
+        jump_table(variant)
+        print(f"[{variant}] phi degree {phi.bit_length() - 1}, table in {time.time() - t0:.1f}s")
+
+        ref = MT19937(1234, variant)
+        outs = ref.next_block(40 * N)
+        rng = MT19937(1234, variant)
+        t0 = time.time()
+        ok = True
+        # (déplacement, position attendue): début de génération, retour à 0, long retour
+        for n, pos in ((4321, 4321), (-1000, 3321), (6 * N - 3321, 6 * N), (-6 * N, 0),
+                       (35 * N + 7, 35 * N + 7), (-34 * N, N + 7)):
+            rng.jump(n)
+            ok &= rng.position == pos
+            ok &= bool((rng.next_block(10) == outs[pos:pos + 10]).all())
+            rng.rewind(10)
+        print(f"[{variant}] jump/rewind agree with stepping: {ok} ({time.time() - t0:.2f}s)")
+
+        # au-delà de deg(phi) générations, jump passe par le polynôme
+        far = 25000
+        mt = ref.mt
+        for _ in range(far - 39):  # ref est à la génération 39
+            mt = twist(mt, variant)
+        expect = temper_array(mt[:10])
+        t0 = time.time()
+        rng.jump(far * N - rng.position)
+        ok = bool((rng.next_block(10) == expect).all())
+        rng.rewind(far * N + 10 - 3 * N)
+        ok &= bool((rng.next_block(10) == outs[3 * N:3 * N + 10]).all())
+        print(f"[{variant}] long jump/rewind agree with stepping: {ok} ({time.time() - t0:.2f}s)")
+
+        rng = MT19937(1234, variant)
+        t0 = time.time()
+        rng.jump(10 ** 15)
+        print(f"[{variant}] jump(10^15): {time.time() - t0:.2f}s -> {rng.next_u32():#010x}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""GF(2) state recovery for Wordy's MT19937 from truncated outputs.
+
+The service only leaks ``next_u32() & 0xFFFFF``, but tempering and the
+twist are linear over GF(2), so every leaked bit is a linear equation in
+the generator state -- whatever the seed was.
+
+Unknowns are the 624 words S[0..623] produced by the first twist (the
+ones outputs 0..623 temper).  Output j < 624 pins S[j] to a coset
+
+    S[j] = untemper(o_j) ^ sum_t z[j, t] * untemper(1 << (20 + t)),  t < 12
+
+so each word only contributes 12 unknowns (with the in-place "standard"
+twist, S[0] contributes one at most: only its top bit is used again).
+Outputs >= 624 are symbolic functions of S through the twist; their low
+bits give the equations.  That leaves ~7.5k unknowns instead of 19937.
+Each later output only adds ~12 to the rank (its S[i + 397] term is
+already pinned by output i + 397), so the service generator is fully
+determined after ~1250 outputs -- inside the 1300-round budget.
+
+Rows are packed into uint64 words (the last column is the constant term)
+and added in batches to an echelon basis: a batch is reduced against the
+existing pivots in one ascending pass, then eliminated on its own.  The
+solve stops as soon as the rank reaches the number of unknowns.
+
+    python3 mt_recover.py      # recover a random service generator and predict
+"""
+import sys
+import time
+
+import numpy as np
+
+from mt19937 import M, MATRIX_A, MT19937, N, temper, untemper
+
+BITS = 20
+
+
+# ligne r de la matrice de tempering: bits d'entrée qui composent le bit r
+_TEMPER_ROWS = [[b for b in range(32) if (temper(1 << b) >> r) & 1] for r in range(32)]
+_A_BITS = [b for b in range(32) if (MATRIX_A >> b) & 1]
+
+
+def _parity(words: np.ndarray) -> int:
+    return int(np.bitwise_count(words).sum() & 1)
+
+
+class GF2Echelon:
+    """Row-echelon basis over GF(2); rows are uint64 arrays, bit ``nvars`` is the constant."""
+
+    def __init__(self, nvars: int):
+        self.nvars = nvars
+        self.words = (nvars + 1 + 63) // 64
+        self.rows = np.zeros((nvars, self.words), dtype=np.uint64)
+        self.pivots = []  # (colonne, ligne), ligne: bit le plus bas = colonne
+        self.rank = 0
+
+    def _var_part_nonzero(self, R: np.ndarray) -> np.ndarray:
+        w, b = divmod(self.nvars, 64)
+        nz = R[:, :w].any(axis=1)
+        if b:
+            nz |= (R[:, w] & np.uint64((1 << b) - 1)) != 0
+        return nz
+
+    def add(self, R: np.ndarray):
+        """Insert a batch of equations; raises ValueError on an inconsistent system."""
+        R = np.array(R, dtype=np.uint64, copy=True)
+        # 1. réduction par les pivots existants, colonnes croissantes
+        for col, r in sorted(self.pivots):
+            w, b = divmod(col, 64)
+            m = ((R[:, w] >> np.uint64(b)) & np.uint64(1)).astype(bool)
+            if m.any():
+                R[m, w:] ^= self.rows[r, w:]
+        # 2. élimination dans le lot
+        live = self._var_part_nonzero(R)
+        if (R[~live, self.nvars // 64] >> np.uint64(self.nvars % 64) & np.uint64(1)).any():
+            raise ValueError("inconsistent system")
+        R = R[live]
+        while R.shape[0]:
+            row = R[0]
+            w = int(np.flatnonzero(row)[0])
+            col = 64 * w + (int(row[w]) & -int(row[w])).bit_length() - 1
+            rest = R[1:]
+            m = ((rest[:, w] >> np.uint64(col % 64)) & np.uint64(1)).astype(bool)
+            rest[m, w:] ^= row[w:]
+            self.rows[self.rank] = row
+            self.pivots.append((col, self.rank))
+            self.rank += 1
+            live = self._var_part_nonzero(rest)
+            cw, cb = divmod(self.nvars, 64)
+            if (rest[~live, cw] >> np.uint64(cb) & np.uint64(1)).any():
+                raise ValueError("inconsistent system")
+            R = rest[live]
+
+    @property
+    def full(self) -> bool:
+        return self.rank == self.nvars
+
+    def solve(self) -> np.ndarray:
+        """One solution as a packed bit vector (free variables set to 0)."""
+        x = np.zeros(self.words, dtype=np.uint64)
+        x[self.nvars // 64] |= np.uint64(1 << (self.nvars % 64))
+        for col, r in sorted(self.pivots, reverse=True):
+            if _parity(self.rows[r] & x):
+                x[col // 64] |= np.uint64(1 << (col % 64))
+        return x
+
+
+class StateRecovery:
+    """Recover the generator from consecutive truncated outputs 0, 1, 2, ...
+
+    ``first`` holds outputs 0..623 (None where a value was not observed);
+    later outputs are fed with ``feed`` until ``solved``.  ``variant``
+    selects the twist: "service" (source/service.py copies the old state
+    before twisting) or "standard" (in-place, as in slove.py / reference MT).
+    """
+
+    def __init__(self, first, bits: int = BITS, variant: str = "service"):
+        if len(first) != N:
+            raise ValueError(f"need the first {N} outputs (None for unknown ones)")
+        if variant not in ("service", "standard"):
+            raise ValueError(f"unknown variant {variant!r}")
+        self.bits = bits
+        self.variant = variant
+        self.mask = (1 << bits) - 1
+        self.kernel = [untemper(1 << (bits + t)) for t in range(32 - bits)]
+        self._layout(first)
+        self.eq = GF2Echelon(self.nvars)
+        self.sym = {0: self._initial_words()}
+        self.fed = N
+
+    # ---- modélisation ----
+    def _layout(self, first):
+        self.base = np.zeros(N, dtype=np.int64)   # première variable du mot j
+        self.count = np.zeros(N, dtype=np.int64)  # nombre de variables du mot j
+        self.part = [0] * N                       # solution particulière
+        self.basis = [None] * N                   # vecteurs de base associés
+        nv = 0
+        for j in range(N):
+            o = first[j]
+            if o is None:
+                basis = [1 << b for b in range(32)]
+                part = 0
+            else:
+                part = untemper(o & self.mask)
+                basis = self.kernel
+            if j == 0 and self.variant == "standard":
+                # twist en place: seul le bit de poids fort de S[0] resservira
+                msb = [v for v in basis if v >> 31]
+                basis = [0x80000000] if msb else []
+                part &= 0x80000000
+            self.base[j], self.count[j] = nv, len(basis)
+            self.part[j], self.basis[j] = part, basis
+            nv += len(basis)
+        self.nvars = nv
+        self.words = (nv + 1 + 63) // 64
+
+    def _initial_words(self) -> np.ndarray:
+        S = np.zeros((N, 32, self.words), dtype=np.uint64)
+        cw, cb = divmod(self.nvars, 64)
+        for j in range(N):
+            for b in range(32):
+                if (self.part[j] >> b) & 1:
+                    S[j, b, cw] |= np.uint64(1 << cb)
+            for t, v in enumerate(self.basis[j]):
+                col = int(self.base[j]) + t
+                for b in range(32):
+                    if (v >> b) & 1:
+                        S[j, b, col // 64] |= np.uint64(1 << (col % 64))
+        return S
+
+    def _word(self, gen: int, i: int) -> np.ndarray:
+        """Symbolic (32, words) rows of word i of generation ``gen``."""
+        if gen not in self.sym:
+            self.sym[gen] = {}
+        g = self.sym[gen]
+        if gen == 0:
+            return g[i]
+        if i not in g:
+            prev = gen - 1
+            hi = self._word(prev, i)
+            if self.variant == "standard" and i + 1 >= N:
+                lo = self._word(gen, 0)
+            else:
+                lo = self._word(prev, (i + 1) % N)
+            if self.variant == "standard" and i + M >= N:
+                src = self._word(gen, i + M - N)
+            else:
+                src = self._word(prev, (i + M) % N)
+            y = np.concatenate([lo[:31], hi[31:]])
+            w = src.copy()
+            w[:31] ^= y[1:]
+            w[_A_BITS] ^= y[0]
+            g[i] = w
+        return g[i]
+
+    def _output_rows(self, k: int, value: int) -> np.ndarray:
+        word = self._word(k // N, k % N)
+        rows = np.empty((self.bits, self.words), dtype=np.uint64)
+        cw, cb = divmod(self.nvars, 64)
+        for r in range(self.bits):
+            rows[r] = np.bitwise_xor.reduce(word[_TEMPER_ROWS[r]], axis=0)
+            if (value >> r) & 1:
+                rows[r, cw] ^= np.uint64(1 << cb)
+        return rows
+
+    # ---- API ----
+    def feed(self, outputs) -> bool:
+        """Add the next consecutive outputs (None = unknown); True once solved."""
+        batch = []
+        for o in outputs:
+            if o is not None:
+                batch.append(self._output_rows(self.fed, o & self.mask))
+            self.fed += 1
+        if batch and not self.solved:
+            self.eq.add(np.concatenate(batch))
+        return self.solved
+
+    @property
+    def solved(self) -> bool:
+        return self.eq.full
+
+    def state(self) -> list:
+        """The 624 words S behind outputs 0..623 (variant "standard": only S[0]'s top bit is reliable)."""
+        x = self.eq.solve()
+        bits = np.unpackbits(x.view(np.uint8), bitorder="little")
+        S = []
+        for j in range(N):
+            v = self.part[j]
+            for t, b in enumerate(self.basis[j]):
+                if bits[self.base[j] + t]:
+                    v ^= b
+            S.append(v)
+        return S
+
+    def generator(self) -> MT19937:
+        """The recovered generator, about to produce output 0."""
+        return MT19937.from_state(self.state(), 0, self.variant)
+
+    def outputs(self, start: int, count: int) -> list:
+        """Full 32-bit outputs ``start .. start+count-1`` of the recovered generator."""
+        rng = self.generator()
+        rng.jump(start)
+        return rng.next_block(count).tolist()
+
+
+def recover(outputs, bits: int = BITS, variant: str = "service", step: int = 32) -> StateRecovery:
+    """Feed ``outputs`` (from index 0) ``step`` at a time, stopping at full rank."""
+    rec = StateRecovery(outputs[:N], bits, variant)
+    for lo in range(N, len(outputs), step):
+        if rec.feed(outputs[lo:lo + step]):
+            break
+    return rec
+
+
+def main() -> int:
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "source"))
+    from service import MT19937
+
+    rng = MT19937(int.from_bytes(os.urandom(8), "little"))
+    leaked = [rng.next_u32() & ((1 << BITS) - 1) for _ in range(1290)]
+    future = [rng.next_u32() for _ in range(10)]
+
+    t0 = time.time()
+    rec = recover(leaked)
+    dt = time.time() - t0
+    print(f"[+] {rec.nvars} unknowns, rank {rec.eq.rank} after {rec.fed} outputs, {dt:.1f}s")
+    if not rec.solved:
+        print("[!] Rank not full, predictions may be wrong")
+    pred = rec.outputs(len(leaked), len(future))
+    print(f"[+] Next outputs predicted: {pred == future}")
+    return 0 if pred == future else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
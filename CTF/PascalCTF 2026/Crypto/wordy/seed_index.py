@@ -0,0 +1,141 @@
+"""Precomputed seed -> first-output index for Wordy's 32-bit MT19937 seeds.
+
+The first secret of a session is ``first_output(seed) & 0xFFFFF``, so the
+2^32 seeds split into 2^20 buckets of ~4096 seeds each.  ``build`` writes
+the seeds grouped by bucket (ascending inside a bucket) to a directory:
+
+    meta.json     seed range, bucket count
+    offsets.npy   int64[2^20 + 1], bucket b is seeds[offsets[b]:offsets[b+1]]
+    seeds.npy     uint32[seed_end - seed_start], ~16 GiB for the full range
+
+The build is a counting sort done in two passes over the seed space (count,
+then scatter into the memory-mapped output), so it never holds more than
+one chunk in RAM.  ``SeedIndex`` memory-maps the files and answers a query
+by checking only the matching bucket with ``seedcheck``.
+
+    python3 seed_index.py build seed_index
+    python3 seed_index.py query seed_index s0 s1 s2 s3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import seedcheck
+
+KEY_BITS = 20
+BUCKETS = 1 << KEY_BITS
+CHUNK = 1 << 24
+
+
+def _chunks(seed_start: int, seed_end: int, chunk: int):
+    for lo in range(seed_start, seed_end, chunk):
+        yield lo, min(lo + chunk, seed_end)
+
+
+def build_index(path: str, seed_start: int = 0, seed_end: int = 1 << 32,
+                chunk: int = CHUNK, backend: str = None, verbose: bool = True):
+    """Write the bucketed seed table for [seed_start, seed_end) into ``path``."""
+    if not (0 <= seed_start < seed_end <= 1 << 32):
+        raise ValueError("seed range must lie in [0, 2^32]")
+    os.makedirs(path, exist_ok=True)
+    total = seed_end - seed_start
+    seedcheck.warmup(backend)
+    t0 = time.time()
+
+    counts = np.zeros(BUCKETS, dtype=np.int64)
+    for lo, hi in _chunks(seed_start, seed_end, chunk):
+        keys = seedcheck.first_output_range(lo, hi, backend)
+        counts += np.bincount(keys, minlength=BUCKETS)
+        if verbose:
+            print(f"\r[count  ] {hi - seed_start}/{total}", end="", flush=True)
+
+    offsets = np.zeros(BUCKETS + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+
+    seeds = np.lib.format.open_memmap(os.path.join(path, "seeds.npy"), mode="w+",
+                                      dtype=np.uint32, shape=(total,))
+    cursor = offsets[:-1].copy()
+    for lo, hi in _chunks(seed_start, seed_end, chunk):
+        keys = seedcheck.first_output_range(lo, hi, backend)
+        order = np.argsort(keys, kind="stable")
+        sk = keys[order]
+        rank = np.arange(sk.size) - np.searchsorted(sk, sk, side="left")
+        seeds[cursor[sk] + rank] = (order + lo).astype(np.uint32)
+        uniq, cnt = np.unique(sk, return_counts=True)
+        cursor[uniq] += cnt
+        if verbose:
+            print(f"\r[scatter] {hi - seed_start}/{total}", end="", flush=True)
+    seeds.flush()
+    del seeds
+
+    meta = {"seed_start": seed_start, "seed_end": seed_end, "key_bits": KEY_BITS}
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    if verbose:
+        print(f"\n[+] Index written to {path} in {time.time() - t0:.1f}s")
+
+
+class SeedIndex:
+    """Read-only, memory-mapped view of a table written by ``build_index``."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.seed_start = self.meta["seed_start"]
+        self.seed_end = self.meta["seed_end"]
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        self.seeds = np.load(os.path.join(path, "seeds.npy"), mmap_mode="r")
+
+    def bucket(self, first_secret: int) -> np.ndarray:
+        """Every indexed seed whose first secret is ``first_secret``."""
+        key = first_secret & (BUCKETS - 1)
+        return self.seeds[self.offsets[key]:self.offsets[key + 1]]
+
+    def candidates(self, secrets) -> np.ndarray:
+        """Seeds of the matching bucket that also reproduce the other secrets."""
+        bucket = np.asarray(self.bucket(secrets[0]))
+        if bucket.size == 0:
+            return bucket
+        return seedcheck.check_batch_numpy(bucket, secrets)
+
+    def lookup(self, secrets):
+        """The seed that produced ``secrets`` (outputs 0, 1, ...), or None."""
+        found = self.candidates(secrets)
+        return int(found[0]) if found.size else None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="precompute the table (one-time)")
+    b.add_argument("path")
+    b.add_argument("--start", type=int, default=0)
+    b.add_argument("--end", type=int, default=1 << 32)
+    b.add_argument("--backend", choices=["numba", "numpy"])
+    q = sub.add_parser("query", help="recover a seed from the first secrets")
+    q.add_argument("path")
+    q.add_argument("secrets", type=int, nargs="+")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        build_index(args.path, args.start, args.end, backend=args.backend)
+        return 0
+
+    index = SeedIndex(args.path)
+    t0 = time.time()
+    seed = index.lookup(args.secrets)
+    dt = (time.time() - t0) * 1000
+    if seed is None:
+        print(f"[!] No seed in [{index.seed_start}, {index.seed_end}) ({dt:.1f} ms)")
+        return 1
+    print(f"[+] Seed {seed} ({dt:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
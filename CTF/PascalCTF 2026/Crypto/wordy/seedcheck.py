@@ -0,0 +1,314 @@
+"""Partial-twist MT19937 seed checker for Wordy.
+
+The service seeds MT19937 with a 32-bit value and every round leaks
+``next_u32() & 0xFFFFF``.  Output ``j`` of the first generation is
+``temper(mt'[j])`` with
+
+    mt'[j] = mt[j + 397] ^ twist(mt[j] & UPPER | mt[j + 1] & LOWER)
+
+so checking a seed against the first ``k`` secrets (k <= 227) only needs
+mt[0..k] and mt[397..397+k-1].  We still have to walk the init recurrence
+up to word 397+k-1 (it is not linear), but nothing is stored, no other word
+is twisted, and a seed is rejected right after its first wrong output --
+which happens for all but ~2^-20 of the candidates.
+
+Two backends share the same API: a vectorised NumPy batch kernel (always
+available) and a Numba kernel used when numba is installed.
+"""
+import sys
+import time
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+N = 624
+M = 397
+MATRIX_A = 0x9908B0DF
+UPPER_MASK = 0x80000000
+LOWER_MASK = 0x7FFFFFFF
+INIT_MULT = 1812433253
+MASK20 = (1 << 20) - 1
+MAX_OUTPUTS = N - M  # au-delà, mt'[j] dépend de la nouvelle génération
+LANES = 16
+
+BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+
+def temper(y: int) -> int:
+    y ^= (y >> 11)
+    y ^= ((y << 7) & 0x9D2C5680)
+    y ^= ((y << 15) & 0xEFC60000)
+    y ^= (y >> 18)
+    return y & 0xFFFFFFFF
+
+
+def first_outputs(seed: int, k: int = 4) -> list:
+    """Reference: the first ``k`` 20-bit secrets produced by ``seed``."""
+    if not (1 <= k <= MAX_OUTPUTS):
+        raise ValueError(f"k must be in [1, {MAX_OUTPUTS}]")
+    lo = [seed & 0xFFFFFFFF]
+    x = lo[0]
+    out = []
+    for i in range(1, M + k):
+        x = (INIT_MULT * (x ^ (x >> 30)) + i) & 0xFFFFFFFF
+        if i <= k:
+            lo.append(x)
+        if i >= M:
+            j = i - M
+            y = (lo[j] & UPPER_MASK) | (lo[j + 1] & LOWER_MASK)
+            w = x ^ (y >> 1) ^ (MATRIX_A if (y & 1) else 0)
+            out.append(temper(w) & MASK20)
+    return out
+
+
+def _check_secrets(secrets) -> np.ndarray:
+    secrets = np.asarray(secrets, dtype=np.uint32)
+    if not (1 <= secrets.size <= MAX_OUTPUTS):
+        raise ValueError(f"need between 1 and {MAX_OUTPUTS} secrets")
+    return secrets
+
+
+# ========== NumPy batch kernel ==========
+def _temper_np(y):
+    y = y ^ (y >> np.uint32(11))
+    y ^= (y << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y ^= (y << np.uint32(15)) & np.uint32(0xEFC60000)
+    y ^= (y >> np.uint32(18))
+    return y
+
+
+def check_batch_numpy(seeds, secrets) -> np.ndarray:
+    """Return the seeds of ``seeds`` whose first outputs match ``secrets``."""
+    secrets = _check_secrets(secrets)
+    seeds = np.asarray(seeds, dtype=np.uint32)
+    k = secrets.size
+    mult = np.uint32(INIT_MULT)
+
+    x = seeds.copy()
+    tmp = np.empty_like(x)
+    lo = [seeds]
+    for i in range(1, M):
+        np.right_shift(x, 30, out=tmp)
+        np.bitwise_xor(x, tmp, out=x)
+        np.multiply(x, mult, out=x)
+        np.add(x, np.uint32(i), out=x)
+        if i <= k:
+            lo.append(x.copy())
+
+    alive = np.arange(seeds.size)
+    for j in range(k):
+        x = mult * (x ^ (x >> np.uint32(30))) + np.uint32(M + j)
+        y = (lo[j][alive] & np.uint32(UPPER_MASK)) | (lo[j + 1][alive] & np.uint32(LOWER_MASK))
+        w = x ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(MATRIX_A))
+        keep = (_temper_np(w) & np.uint32(MASK20)) == secrets[j]
+        alive = alive[keep]
+        x = x[keep]
+        if alive.size == 0:
+            break
+    return seeds[alive]
+
+
+def first_output_numpy(seeds) -> np.ndarray:
+    """First 20-bit secret of every seed in ``seeds`` (index building)."""
+    seeds = np.asarray(seeds, dtype=np.uint32)
+    mult = np.uint32(INIT_MULT)
+    x = seeds.copy()
+    tmp = np.empty_like(x)
+    mt1 = None
+    for i in range(1, M + 1):
+        np.right_shift(x, 30, out=tmp)
+        np.bitwise_xor(x, tmp, out=x)
+        np.multiply(x, mult, out=x)
+        np.add(x, np.uint32(i), out=x)
+        if i == 1:
+            mt1 = x.copy()
+    y = (seeds & np.uint32(UPPER_MASK)) | (mt1 & np.uint32(LOWER_MASK))
+    w = x ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(MATRIX_A))
+    return _temper_np(w) & np.uint32(MASK20)
+
+
+def scan_range_numpy(start: int, end: int, secrets, batch: int = 1 << 20) -> np.ndarray:
+    secrets = _check_secrets(secrets)
+    hits = []
+    for lo in range(start, end, batch):
+        hi = min(lo + batch, end)
+        found = check_batch_numpy(np.arange(lo, hi, dtype=np.uint64).astype(np.uint32), secrets)
+        if found.size:
+            hits.append(found)
+    if not hits:
+        return np.empty(0, dtype=np.uint32)
+    return np.concatenate(hits)
+
+
+# ========== Numba kernel ==========
+if NUMBA_AVAILABLE:
+    @njit(cache=True, inline='always')
+    def _temper_nb(y):
+        y ^= (y >> 11)
+        y ^= ((y << 7) & 0x9D2C5680)
+        y ^= ((y << 15) & 0xEFC60000)
+        y ^= (y >> 18)
+        return y & 0xFFFFFFFF
+
+    @njit(cache=True)
+    def check_seed_numba(seed, secrets):
+        k = secrets.shape[0]
+        lo = np.empty(k + 1, dtype=np.int64)
+        x = np.int64(seed) & 0xFFFFFFFF
+        lo[0] = x
+        for i in range(1, M):
+            x = (INIT_MULT * (x ^ (x >> 30)) + i) & 0xFFFFFFFF
+            if i <= k:
+                lo[i] = x
+        for j in range(k):
+            x = (INIT_MULT * (x ^ (x >> 30)) + M + j) & 0xFFFFFFFF
+            y = (lo[j] & UPPER_MASK) | (lo[j + 1] & LOWER_MASK)
+            w = x ^ (y >> 1)
+            if y & 1:
+                w ^= MATRIX_A
+            if (_temper_nb(w) & MASK20) != secrets[j]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def _check_lanes_numba(start, secrets, hits):
+        # LANES graines consécutives avancées ensemble : la boucle interne
+        # est vectorisée par LLVM, la chaîne d'init d'une seule graine non.
+        k = secrets.shape[0]
+        x = np.empty(LANES, dtype=np.uint32)
+        lo = np.empty((k + 1, LANES), dtype=np.uint32)
+        for l in range(LANES):
+            x[l] = np.uint32(start + l)
+            lo[0, l] = x[l]
+        for i in range(1, M):
+            for l in range(LANES):
+                v = x[l]
+                x[l] = np.uint32(np.uint32(INIT_MULT) * (v ^ (v >> np.uint32(30))) + np.uint32(i))
+            if i <= k:
+                lo[i, :] = x
+        for l in range(LANES):
+            ok = True
+            v = np.int64(x[l])
+            for j in range(k):
+                v = (INIT_MULT * (v ^ (v >> 30)) + M + j) & 0xFFFFFFFF
+                y = (np.int64(lo[j, l]) & UPPER_MASK) | (np.int64(lo[j + 1, l]) & LOWER_MASK)
+                w = v ^ (y >> 1)
+                if y & 1:
+                    w ^= MATRIX_A
+                if (_temper_nb(w) & MASK20) != secrets[j]:
+                    ok = False
+                    break
+            hits[l] = ok
+
+    @njit(cache=True, parallel=True)
+    def _scan_chunk_numba(start, count, secrets, hits):
+        blocks = count // LANES
+        for b in prange(blocks):
+            _check_lanes_numba(start + b * LANES, secrets, hits[b * LANES:(b + 1) * LANES])
+        for t in range(blocks * LANES, count):
+            hits[t] = check_seed_numba(start + t, secrets)
+
+    @njit(cache=True, parallel=True)
+    def _first_output_chunk_numba(start, count, out):
+        for b in prange((count + LANES - 1) // LANES):
+            x = np.empty(LANES, dtype=np.uint32)
+            mt0 = np.empty(LANES, dtype=np.uint32)
+            mt1 = np.empty(LANES, dtype=np.uint32)
+            for l in range(LANES):
+                x[l] = np.uint32(start + b * LANES + l)
+                mt0[l] = x[l]
+            for i in range(1, M + 1):
+                for l in range(LANES):
+                    v = x[l]
+                    x[l] = np.uint32(np.uint32(INIT_MULT) * (v ^ (v >> np.uint32(30))) + np.uint32(i))
+                if i == 1:
+                    mt1[:] = x
+            for l in range(min(LANES, count - b * LANES)):
+                y = (np.int64(mt0[l]) & UPPER_MASK) | (np.int64(mt1[l]) & LOWER_MASK)
+                w = np.int64(x[l]) ^ (y >> 1)
+                if y & 1:
+                    w ^= MATRIX_A
+                out[b * LANES + l] = _temper_nb(w) & MASK20
+
+    def scan_range_numba(start: int, end: int, secrets, batch: int = 1 << 24) -> np.ndarray:
+        secrets = _check_secrets(secrets).astype(np.int64)
+        hits = np.zeros(min(batch, max(end - start, 0)), dtype=np.bool_)
+        found = []
+        for lo in range(start, end, batch):
+            count = min(batch, end - lo)
+            _scan_chunk_numba(lo, count, secrets, hits)
+            idx = np.nonzero(hits[:count])[0]
+            if idx.size:
+                found.append((idx + lo).astype(np.uint32))
+        if not found:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate(found)
+
+
+def scan_range(start: int, end: int, secrets, backend: str = None) -> np.ndarray:
+    """All seeds in [start, end) whose first outputs match ``secrets``."""
+    backend = backend or BACKEND
+    if backend == "numba":
+        if not NUMBA_AVAILABLE:
+            raise RuntimeError("numba backend requested but numba is not installed")
+        return scan_range_numba(start, end, secrets)
+    if backend == "numpy":
+        return scan_range_numpy(start, end, secrets)
+    raise ValueError(f"unknown backend {backend!r}")
+
+
+def first_output_range(start: int, end: int, backend: str = None) -> np.ndarray:
+    """First 20-bit secret of every seed in [start, end), as a uint32 array."""
+    backend = backend or BACKEND
+    if backend == "numba":
+        if not NUMBA_AVAILABLE:
+            raise RuntimeError("numba backend requested but numba is not installed")
+        out = np.empty(end - start, dtype=np.uint32)
+        _first_output_chunk_numba(start, end - start, out)
+        return out
+    if backend == "numpy":
+        return first_output_numpy(np.arange(start, end, dtype=np.uint64).astype(np.uint32))
+    raise ValueError(f"unknown backend {backend!r}")
+
+
+def search_range(start: int, end: int, secrets, backend: str = None) -> int:
+    """First matching seed in [start, end), or -1 (same contract as bruteforce_chunk_cpu)."""
+    found = scan_range(start, end, secrets, backend)
+    return int(found[0]) if found.size else -1
+
+
+def warmup(backend: str = None):
+    """Trigger the Numba compilation outside of any timed loop."""
+    scan_range(0, 16, [0], backend)
+
+
+def main() -> int:
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0xC0FFEE
+    span = int(sys.argv[2]) if len(sys.argv) > 2 else 1 << 22
+    secrets = first_outputs(seed)
+    start = max(0, seed - span // 2)
+
+    print(f"[+] Seed {seed}, secrets {secrets}")
+    for backend in (["numba"] if NUMBA_AVAILABLE else []) + ["numpy"]:
+        warmup(backend)
+        t0 = time.time()
+        res = search_range(start, start + span, secrets, backend)
+        dt = time.time() - t0
+        print(f"[{backend:>5}] found={res} in {dt:.2f}s ({span / dt / 1e6:.2f}M seeds/s, "
+              f"2^32 ETA {timedelta_str((1 << 32) / (span / dt))})")
+    return 0
+
+
+def timedelta_str(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}h{m:02d}m{s:02d}s"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
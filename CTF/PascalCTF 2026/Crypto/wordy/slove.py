@@ -1,6 +1,5 @@
-import socket
+import os
 import sys
-import numpy as np
 from tqdm import tqdm
 import time
 from datetime import timedelta
@@ -13,7 +12,17 @@ try:
     print(f"[+] CuPy détecté avec GPU: {cp.cuda.runtime.getDeviceCount()} device(s)")
 except:
     GPU_AVAILABLE = False
-    from numba import njit, prange
+
+import seed_index
+import sweep
+import mt19937
+import mt_recover
+import wordspace
+from client import LineClient
+from guesser import Guesser
+
+# Table construite une fois avec: python3 seed_index.py build seed_index
+SEED_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_index")
 
 ALPHABET = "abcdefghijklmnop"
 K = len(ALPHABET)
@@ -57,48 +66,6 @@ def wordle_feedback(guess: str, secret: str) -> str:
             res[i] = '_'
     return ''.join(res)
 
-# ========== Version CPU Numba (fallback) ==========
-if not GPU_AVAILABLE:
-    @njit(fastmath=True, inline='always')
-    def temper(y):
-        y ^= (y >> 11)
-        y ^= ((y << 7) & 0x9D2C5680)
-        y ^= ((y << 15) & 0xEFC60000)
-        y ^= (y >> 18)
-        return y & 0xFFFFFFFF
-
-    @njit(fastmath=True)
-    def check_seed_cpu(seed, s0, s1, s2, s3):
-        mt = np.empty(624, dtype=np.uint32)
-        mt[0] = np.uint32(seed)
-        for i in range(1, 624):
-            mt[i] = np.uint32((1812433253 * (mt[i-1] ^ (mt[i-1] >> 30)) + i) & 0xFFFFFFFF)
-        
-        for i in range(624):
-            y = (mt[i] & 0x80000000) | (mt[(i+1) % 624] & 0x7FFFFFFF)
-            if y & 1:
-                mt[i] = mt[(i+397) % 624] ^ (y >> 1) ^ 0x9908B0DF
-            else:
-                mt[i] = mt[(i+397) % 624] ^ (y >> 1)
-        
-        if (temper(mt[0]) & 0xFFFFF) != s0:
-            return False
-        if (temper(mt[1]) & 0xFFFFF) != s1:
-            return False
-        if (temper(mt[2]) & 0xFFFFF) != s2:
-            return False
-        if (temper(mt[3]) & 0xFFFFF) != s3:
-            return False
-        return True
-
-    @njit(parallel=True, fastmath=True)
-    def bruteforce_chunk_cpu(start, end, s0, s1, s2, s3):
-        result = np.int64(-1)
-        for seed in prange(start, end):
-            if check_seed_cpu(seed, s0, s1, s2, s3):
-                result = seed
-        return result
-
 # ========== Version GPU CuPy ==========
 if GPU_AVAILABLE:
     mt19937_kernel = cp.RawKernel(r'''
@@ -194,142 +161,91 @@ def bruteforce_seed_optimized(secrets):
         return None
     
     else:
-        print(f"[+] Utilisation CPU parallèle ({mp.cpu_count()} cœurs)")
-        print(f"[+] Compilation Numba...")
-        
-        bruteforce_chunk_cpu(0, 1000, s0, s1, s2, s3)
-        
-        num_chunks = 4096
-        chunk_size = total // num_chunks
-        
-        start_time = time.time()
-        
-        with tqdm(range(num_chunks), desc="CPU Bruteforce") as pbar:
-            for i in pbar:
-                start = i * chunk_size
-                end = start + chunk_size if i < num_chunks - 1 else total
-                
-                result = bruteforce_chunk_cpu(start, end, s0, s1, s2, s3)
-                
-                if result != -1:
-                    return int(result)
-                
-                if i > 0:
-                    elapsed = time.time() - start_time
-                    speed = (i * chunk_size) / elapsed
-                    eta = (total - i * chunk_size) / speed if speed > 0 else 0
-                    pbar.set_postfix({"speed": f"{speed/1e6:.2f}M/s", "ETA": f"{int(eta)}s"})
-        
-        return None
-
-class MT19937:
-    def __init__(self, seed):
-        self.mt = [0] * 624
-        self.index = 624
-        self.mt[0] = seed & 0xFFFFFFFF
-        for i in range(1, 624):
-            self.mt[i] = (1812433253 * (self.mt[i-1] ^ (self.mt[i-1] >> 30)) + i) & 0xFFFFFFFF
-    
-    def twist(self):
-        for i in range(624):
-            y = (self.mt[i] & 0x80000000) | (self.mt[(i+1) % 624] & 0x7FFFFFFF)
-            self.mt[i] = self.mt[(i+397) % 624] ^ (y >> 1) ^ (0x9908B0DF if (y & 1) else 0)
-        self.index = 0
-    
-    def next_u32(self):
-        if self.index >= 624:
-            self.twist()
-        y = self.mt[self.index]
-        self.index += 1
-        y ^= (y >> 11)
-        y ^= ((y << 7) & 0x9D2C5680)
-        y ^= ((y << 15) & 0xEFC60000)
-        y ^= (y >> 18)
-        return y & 0xFFFFFFFF
-
-# ========== Communication robuste ==========
-def recv_line(sock):
-    data = b""
-    while not data.endswith(b"\n"):
-        chunk = sock.recv(1)
-        if not chunk:
-            break
-        data += chunk
-    return data.decode().strip()
+        print(f"[+] Utilisation CPU: sweep multi-processus ({mp.cpu_count()} workers)")
+        # Checkpoint propre aux secrets: relancer le script reprend le sweep
+        ckpt = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "sweep_%d_%d_%d_%d.ckpt" % (s0, s1, s2, s3))
+        return sweep.run_sweep(secrets, checkpoint=ckpt)
 
-def recv_until(sock, marker, timeout=5):
-    """Reçoit jusqu'à trouver un marqueur"""
-    sock.settimeout(timeout)
-    data = ""
-    try:
-        while marker not in data:
-            chunk = sock.recv(1024).decode()
-            if not chunk:
-                break
-            data += chunk
-    except socket.timeout:
-        pass
-    sock.settimeout(None)
-    return data
-
-def solve_secret(sock, all_words):
-    possible = set(all_words)
-    attempts = 0
+def solve_secret(client, guesser):
+    """Démarre un round (NEW envoyé avec le guess d'ouverture) et le résout"""
+    possible = wordspace.CandidateSet()
+    history = []
     max_attempts = 20  # Sécurité
     
-    while len(possible) > 1 and attempts < max_attempts:
-        attempts += 1
-        guess = next(iter(possible))
-        sock.send(f"GUESS {guess}\n".encode())
-        response = recv_line(sock)
-        
+    guess = index_to_word(guesser.best_guess(possible, history))
+    started, response = client.pipeline(["NEW", f"GUESS {guess}"])
+    print(f"[+] Réponse NEW: {started}")
+    # Sans nouveau round (ERR après 1300 NEW), le GUESS pipeliné a répondu pour
+    # l'ancien secret: on renverrait un secret déjà compté
+    if started != "ROUND STARTED":
+        raise RuntimeError(f"NEW refused by the service: {started!r}")
+
+    while True:
         print(f"    Guess: {guess} -> {response}")
         
         if "FEEDBACK" not in response.upper():
-            # Peut-être CORRECT ou autre chose
-            if "CORRECT" in response.upper() or "WIN" in response.upper():
-                return word_to_index(guess)
             print(f"[!] Réponse inattendue: {response}")
-            continue
+            return None
         
-        # Extraire le feedback (format: "FEEDBACK GGYY_" ou similaire)
+        # Extraire le feedback (format: "FEEDBACK GGYY_")
         parts = response.split()
         if len(parts) >= 2:
             feedback = parts[1]
         else:
             feedback = response.replace("FEEDBACK", "").strip()
         
-        possible = {w for w in possible if wordle_feedback(guess, w) == feedback}
+        code = wordspace.pattern_to_code(feedback)
+        history.append((word_to_index(guess), code))
+        if code == wordspace.ALL_GREEN:
+            return word_to_index(guess)
+        
+        possible = possible.filter(word_to_index(guess), code)
         print(f"    Remaining: {len(possible)}")
         
         if len(possible) == 0:
             print("[!] Plus de mots possibles!")
             return None
-    
-    if len(possible) == 1:
-        final_word = possible.pop()
-        # Soumettre le mot final
-        sock.send(f"GUESS {final_word}\n".encode())
-        response = recv_line(sock)
-        print(f"    Final: {final_word} -> {response}")
-        return word_to_index(final_word)
-    
-    return None
+        # Un seul candidat: inutile de le soumettre, on connaît le secret
+        if len(possible) == 1:
+            return int(possible.idx[0])
+        if len(history) >= max_attempts:
+            return None
+        
+        guess = index_to_word(guesser.best_guess(possible, history))
+        response = client.request(f"GUESS {guess}")
+
+def recover_state(client, guesser, budget=1300):
+    """Collecte des secrets jusqu'à déterminer l'état (ne dépend pas de la graine)"""
+    secrets = []
+    rec = None
+    while rec is None or not rec.solved:
+        if len(secrets) >= budget:
+            print("[!] Budget de rounds épuisé")
+            return None, secrets
+        idx = solve_secret(client, guesser)
+        if idx is None:
+            return None, secrets
+        secrets.append(idx)
+        if len(secrets) == mt_recover.N:
+            rec = mt_recover.StateRecovery(secrets)
+        elif rec is not None and len(secrets) % 16 == 0:
+            rec.feed(secrets[rec.fed:])
+            print(f"[+] {len(secrets)} secrets, rang {rec.eq.rank}/{rec.nvars}")
+    return rec, secrets
 
 def main():
     HOST = "wordy.ctf.pascalctf.it"
     PORT = 5005
     
-    print("[+] Génération des mots...")
-    all_words = [index_to_word(i) for i in range(N)]
+    guesser = Guesser()
     
     print(f"[+] Connexion à {HOST}:{PORT}...")
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.connect((HOST, PORT))
+    client = LineClient.connect(HOST, PORT)
     
     # Lire le banner
     print("[+] Attente du banner...")
-    banner = recv_until(sock, "READY", timeout=10)
+    banner = client.read_until("READY")
     print("=" * 50)
     print(banner)
     print("=" * 50)
@@ -337,15 +253,22 @@ def main():
     if "READY" not in banner:
         print("[!] READY non reçu, tentative de continuer...")
     
+    if "--state" in sys.argv:
+        rec, secrets = recover_state(client, guesser)
+        if rec is None:
+            return
+        print(f"\n[+] État récupéré après {len(secrets)} rounds")
+        words = [index_to_word(o & 0xFFFFF) for o in rec.outputs(len(secrets), 5)]
+        replies = client.pipeline([f"FINAL {word}" for word in words])
+        for i, (word, resp) in enumerate(zip(words, replies)):
+            print(f"  {i+1}/5: {word} -> {resp}")
+        client.close()
+        return
+    
     secrets = []
     for rnd in range(1, 5):
         print(f"\n{'='*20} Round {rnd}/4 {'='*20}")
-        sock.send(b"NEW\n")
-        
-        response = recv_line(sock)
-        print(f"[+] Réponse NEW: {response}")
-        
-        idx = solve_secret(sock, all_words)
+        idx = solve_secret(client, guesser)
         if idx is None:
             print("[!] Échec résolution du secret")
             return
@@ -355,8 +278,14 @@ def main():
     print(f"\n[+] Secrets collectés: {secrets}")
     print(f"[+] En mots: {[index_to_word(s) for s in secrets]}")
     
-    print("\n[*] Lancement du bruteforce...")
-    seed = bruteforce_seed_optimized(secrets)
+    seed = None
+    if os.path.isfile(os.path.join(SEED_INDEX, "meta.json")):
+        print("\n[*] Recherche dans l'index précalculé...")
+        seed = seed_index.SeedIndex(SEED_INDEX).lookup(secrets)
+    
+    if seed is None:
+        print("\n[*] Lancement du bruteforce...")
+        seed = bruteforce_seed_optimized(secrets)
     
     if seed is None:
         print("[!] Graine non trouvée")
@@ -364,8 +293,8 @@ def main():
     
     print(f"\n[+] GRAINE TROUVÉE: {seed}")
     
-    # Vérification
-    rng = MT19937(seed)
+    # Vérification (le service twiste depuis une copie de l'état)
+    rng = mt19937.MT19937(seed, variant="service")
     print("[+] Vérification:")
     for i, expected in enumerate(secrets):
         got = rng.next_u32() & 0xFFFFF
@@ -373,22 +302,14 @@ def main():
         print(f"    {i+1}: attendu={expected}, obtenu={got} {status}")
     
     print("\n[+] Soumission des prédictions:")
-    for i in range(5):
-        idx = rng.next_u32() & 0xFFFFF
-        word = index_to_word(idx)
-        sock.send(f"FINAL {word}\n".encode())
-        resp = recv_line(sock)
+    words = [index_to_word(int(o) & 0xFFFFF) for o in rng.next_block(5)]
+    replies = client.pipeline([f"FINAL {word}" for word in words])
+    for i, (word, resp) in enumerate(zip(words, replies)):
         print(f"  {i+1}/5: {word} -> {resp}")
     
-    # Récupérer tout ce qui reste
-    print("\n[+] Réponse finale:")
-    try:
-        final = recv_until(sock, "}", timeout=5)
-        print(final)
-    except:
-        pass
-    
-    sock.close()
+    print("\n[+] Latences:")
+    print(client.report())
+    client.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,278 @@
+"""Sharded, resumable multi-process sweep of Wordy's 32-bit seed space.
+
+The 2^32 seeds are cut into shards of 2^SHARD_BITS seeds.  A pool of worker
+processes pulls shards from a queue and checks them with ``seedcheck``; the
+first worker that hits sets a shared event and every other worker stops at
+its next sub-chunk boundary.
+
+Completed shards are appended to a JSON-lines checkpoint file, so a crashed
+or interrupted run picks up where it left off.  Several machines can split
+the work with ``--shards A:B`` (each with its own checkpoint).
+
+    python3 sweep.py s0 s1 s2 s3 --workers 8 --checkpoint sweep.ckpt
+    python3 sweep.py s0 s1 s2 s3 --shards 0:2048      # machine 1
+    python3 sweep.py s0 s1 s2 s3 --shards 2048:4096   # machine 2
+
+Every worker reports its throughput (seeds/s), which is what we size a run
+with: the session stays open during the sweep, and the predictions have to
+be sent before the service budget (1300 NEW rounds) or the connection runs out.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+
+import seedcheck
+
+SHARD_BITS = 20
+SUB_CHUNK = 1 << 18  # granularité de l'arrêt anticipé
+POLL = 1.0           # attente max d'un message entre deux vérifications des workers
+
+
+def _worker(wid, secrets, backend, tasks, results, stop, shard_bits, first=None):
+    if seedcheck.NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(1)  # le parallélisme vient du pool
+    seedcheck.warmup(backend)
+    shard_size = 1 << shard_bits
+    while not stop.is_set():
+        if first is not None:
+            shard, first = first, None  # shard repris d'un worker mort
+        else:
+            try:
+                shard = tasks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        if shard is None:
+            break
+        results.put(("start", wid, shard, None, None))
+        t0 = time.time()
+        base = shard * shard_size
+        found = -1
+        for lo in range(base, base + shard_size, SUB_CHUNK):
+            if stop.is_set():
+                break
+            found = seedcheck.search_range(lo, min(lo + SUB_CHUNK, base + shard_size), secrets, backend)
+            if found != -1:
+                break
+        else:
+            results.put(("done", wid, shard, shard_size, time.time() - t0))
+            continue
+        if found != -1:
+            results.put(("found", wid, shard, found, time.time() - t0))
+            stop.set()
+        break
+    results.put(("exit", wid, None, None, None))
+
+
+class Checkpoint:
+    """Append-only JSON-lines record of finished shards (and the seed, if any)."""
+
+    def __init__(self, path, secrets, shard_bits):
+        self.path = path
+        self.done = set()
+        self.found = None
+        header = {"secrets": list(secrets), "shard_bits": shard_bits}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                lines = [json.loads(l) for l in f if l.strip()]
+            if lines and lines[0] != header:
+                raise ValueError(f"{path} belongs to another sweep: {lines[0]}")
+            for rec in lines[1:]:
+                if "shard" in rec:
+                    self.done.add(rec["shard"])
+                elif "found" in rec:
+                    self.found = rec["found"]
+            self._f = open(path, "a")
+        elif path:
+            self._f = open(path, "w")
+            self._write(header)
+        else:
+            self._f = None
+
+    def _write(self, rec):
+        if self._f is None:
+            return
+        self._f.write(json.dumps(rec) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def mark_done(self, shard, worker, secs):
+        self.done.add(shard)
+        self._write({"shard": shard, "worker": worker, "secs": round(secs, 3)})
+
+    def mark_found(self, seed):
+        self.found = seed
+        self._write({"found": seed})
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+
+
+def run_sweep(secrets, shards=None, workers=None, checkpoint=None,
+              shard_bits=SHARD_BITS, backend=None, verbose=True):
+    """Sweep ``shards`` (a range of shard ids, default: all) for the seed.
+
+    A worker that dies (killed, out of memory, crashed backend) is replaced by
+    one that starts with the shard it held, up to ``workers`` times; past that,
+    or if shards are left unchecked, RuntimeError (the checkpoint allows a resume).
+    """
+    secrets = [int(s) for s in secrets]
+    if shards is None:
+        shards = range(1 << (32 - shard_bits))
+    workers = workers or mp.cpu_count()
+    ckpt = Checkpoint(checkpoint, secrets, shard_bits)
+    if ckpt.found is not None:
+        if verbose:
+            print(f"[+] Graine déjà trouvée dans {checkpoint}: {ckpt.found}")
+        ckpt.close()
+        return ckpt.found
+
+    pending = [s for s in shards if s not in ckpt.done]
+    if verbose:
+        print(f"[+] {len(pending)}/{len(shards)} shards à traiter, {workers} workers "
+              f"(backend {backend or seedcheck.BACKEND})")
+    if not pending:
+        ckpt.close()
+        return None
+
+    ctx = mp.get_context("spawn")
+    tasks, results, stop = ctx.Queue(), ctx.Queue(), ctx.Event()
+    for s in pending:
+        tasks.put(s)
+    for _ in range(workers):
+        tasks.put(None)
+    procs, stats = [], []  # stats: seeds, secondes par worker
+
+    def spawn(first=None):
+        p = ctx.Process(target=_worker, args=(len(procs), secrets, backend, tasks, results, stop,
+                                              shard_bits, first), daemon=True)
+        procs.append(p)
+        stats.append([0, 0.0])
+        p.start()
+
+    for _ in range(workers):
+        spawn()
+
+    current, dead = {}, set()  # shard en cours par worker, workers morts sans "exit"
+    respawns = workers
+
+    def lost(wid, shard):
+        # le remplaçant prend le None du mort: les sentinelles restent en nombre
+        nonlocal respawns
+        if shard is None or stop.is_set():
+            return 0
+        if not respawns:
+            stop.set()
+            raise RuntimeError(f"workers keep dying (last: worker {wid} on shard {shard}, "
+                               f"exit code {procs[wid].exitcode})")
+        respawns -= 1
+        if verbose:
+            print(f"\n[!] worker {wid} mort (code {procs[wid].exitcode}), shard {shard} relancé")
+        spawn(shard)
+        return 1
+
+    found, alive, finished, interrupted = None, workers, 0, False
+    t0 = time.time()
+    try:
+        while alive:
+            # à chaque tour, pas seulement sur timeout: les autres workers envoient
+            # assez de messages pour que results.get n'expire jamais.
+            # Code de sortie non nul = mort sans "exit" (un worker normal l'envoie avant)
+            for w, p in enumerate(procs):
+                if w not in dead and p.exitcode not in (None, 0):
+                    dead.add(w)
+                    alive += lost(w, current.pop(w, None)) - 1
+            if not alive:
+                break
+            try:
+                kind, wid, shard, value, secs = results.get(timeout=POLL)
+            except queue.Empty:
+                continue
+            if kind == "start":
+                if wid in dead:
+                    alive += lost(wid, shard)  # "start" arrivé après la détection de la mort
+                else:
+                    current[wid] = shard
+            elif kind == "exit":
+                alive -= 1
+            elif kind == "done":
+                current.pop(wid, None)
+                ckpt.mark_done(shard, wid, secs)
+                stats[wid][0] += value
+                stats[wid][1] += secs
+                finished += 1
+                if verbose:
+                    rate = sum(s[0] for s in stats) / (time.time() - t0)
+                    eta = (len(pending) - finished) * (1 << shard_bits) / rate
+                    print(f"\r[{finished}/{len(pending)}] {rate / 1e6:.2f}M seeds/s, ETA {int(eta)}s",
+                          end="", flush=True)
+            elif kind == "found":
+                found = value
+                ckpt.mark_found(found)
+                stop.set()
+    except KeyboardInterrupt:
+        interrupted = True
+        stop.set()
+        if verbose:
+            print("\n[!] Interrompu, reprise possible depuis le checkpoint")
+    finally:
+        stop.set()
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        ckpt.close()
+
+    if verbose:
+        print()
+        for w, (n, secs) in enumerate(stats):
+            rate = n / secs / 1e6 if secs else 0.0
+            print(f"    worker {w}: {n / 1e6:.1f}M seeds in {secs:.1f}s -> {rate:.2f}M seeds/s")
+        total = sum(n for n, _ in stats)
+        wall = time.time() - t0
+        if total:
+            print(f"[+] Total {total / wall / 1e6:.2f}M seeds/s, 2^32 en ~{(1 << 32) / (total / wall) / 60:.1f} min")
+    missing = [s for s in pending if s not in ckpt.done]
+    if found is None and not interrupted and missing:
+        raise RuntimeError(f"{len(missing)} shards left unchecked (first: {missing[0]}); "
+                           f"rerun to resume from the checkpoint")
+    return found
+
+
+def parse_shards(spec: str, shard_bits: int) -> range:
+    count = 1 << (32 - shard_bits)
+    if not spec:
+        return range(count)
+    a, b = spec.split(":")
+    a, b = int(a or 0), int(b or count)
+    if not (0 <= a < b <= count):
+        raise ValueError(f"shard range must lie in [0, {count}]")
+    return range(a, b)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("secrets", type=int, nargs="+", help="first secrets (outputs 0, 1, ...)")
+    ap.add_argument("--shards", default="", help="shard range A:B for this machine")
+    ap.add_argument("--shard-bits", type=int, default=SHARD_BITS)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--checkpoint", default="sweep.ckpt")
+    ap.add_argument("--backend", choices=["numba", "numpy"])
+    args = ap.parse_args()
+
+    seed = run_sweep(args.secrets, parse_shards(args.shards, args.shard_bits), args.workers,
+                     args.checkpoint, args.shard_bits, args.backend)
+    if seed is None:
+        print("[!] Graine non trouvée dans ces shards")
+        return 1
+    print(f"[+] GRAINE TROUVÉE: {seed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Integer view of the Wordy word space (16 letters, length 5, 2^20 words).
+
+A word is its index in base 16, so letter ``i`` of word ``w`` is just the
+nibble ``(w >> 4 * (4 - i)) & 15`` -- no strings are needed to compare
+words.  Feedback patterns are encoded in base 3, position 0 most
+significant, with ``_ = 0``, ``Y = 1``, ``G = 2`` (243 codes, ALL_GREEN =
+242), and computed for one guess against whole arrays of secrets at once.
+
+``CandidateSet`` keeps the remaining secrets as a uint32 index array plus a
+column-major (L, n) uint8 digit matrix: 9 bytes per candidate instead of a
+Python string each, and one feedback pass over the full space is a few
+dozen byte-wise NumPy operations.
+"""
+import numpy as np
+
+ALPHABET = "abcdefghijklmnop"
+K = len(ALPHABET)
+L = 5
+N = K ** L
+
+PATTERNS = 3 ** L
+ALL_GREEN = PATTERNS - 1
+_SHIFTS = np.array([4 * (L - 1 - i) for i in range(L)], dtype=np.uint32)
+_POW3 = np.array([3 ** (L - 1 - i) for i in range(L)], dtype=np.uint8)
+_SYMBOLS = "_YG"
+
+
+def index_to_word(idx: int) -> str:
+    return "".join(ALPHABET[(idx >> int(s)) & 15] for s in _SHIFTS)
+
+
+def word_to_index(word: str) -> int:
+    x = 0
+    for ch in word:
+        d = ALPHABET.find(ch)
+        if d < 0:
+            raise ValueError("bad letter")
+        x = x * K + d
+    return x
+
+
+def pattern_to_code(pattern: str) -> int:
+    code = 0
+    for ch in pattern:
+        code = code * 3 + _SYMBOLS.index(ch)
+    return code
+
+
+def digits(words) -> np.ndarray:
+    """Letter matrix (..., L) of uint8 for an array of word indices."""
+    words = np.asarray(words, dtype=np.uint32)
+    return ((words[..., None] >> _SHIFTS) & np.uint32(K - 1)).astype(np.uint8)
+
+
+def columns(words) -> np.ndarray:
+    """Column-major (L, n) letter matrix, the layout ``feedback_columns`` wants."""
+    words = np.asarray(words, dtype=np.uint32).reshape(-1)
+    return ((words[None, :] >> _SHIFTS[:, None]) & np.uint32(K - 1)).astype(np.uint8)
+
+
+def feedback_codes(guess: int, secrets) -> np.ndarray:
+    """Feedback code of one guess against every word index in ``secrets``."""
+    return feedback_columns(guess, columns(secrets))
+
+
+def feedback_columns(guess: int, cols: np.ndarray) -> np.ndarray:
+    """Feedback codes of one guess against a column-major (L, n) digit matrix.
+
+    Same rules as ``wordle_feedback``: the k-th non-green occurrence of a
+    letter in the guess is yellow iff the secret has at least k non-green
+    occurrences of that letter.  The guess is a scalar, so its letters are
+    grouped in Python and each distinct letter costs a handful of byte
+    comparisons over the columns; this is the fast path behind
+    ``CandidateSet.filter``.
+    """
+    g = [int(d) for d in digits(guess)]
+    n = cols.shape[1]
+    green = [cols[i] == g[i] for i in range(L)]
+    code = np.zeros(n, dtype=np.uint8)
+    for i in range(L):
+        code += green[i].view(np.uint8) * np.uint8(2 * _POW3[i])
+
+    for c in set(g):
+        pos = [i for i in range(L) if g[i] == c]
+        # occurrences non vertes de c dans le secret
+        avail = np.zeros(n, dtype=np.uint8)
+        for k in range(L):
+            if g[k] != c:
+                avail += (cols[k] == c).view(np.uint8)
+        rank = np.zeros(n, dtype=np.uint8)
+        for i in pos:
+            not_green = ~green[i]
+            rank += not_green.view(np.uint8)
+            code += (not_green & (rank <= avail)).view(np.uint8) * _POW3[i]
+    return code
+
+
+_DIGITS = None
+
+
+def all_digits() -> np.ndarray:
+    """Column-major (L, N) digit matrix of the whole space (5 MiB, built once)."""
+    global _DIGITS
+    if _DIGITS is None:
+        _DIGITS = np.ascontiguousarray(digits(np.arange(N, dtype=np.uint32)).T)
+    return _DIGITS
+
+
+class CandidateSet:
+    """Remaining secrets as word indices with a (L, n) digit-matrix view."""
+
+    def __init__(self, idx=None, cols=None):
+        if idx is None:
+            idx = np.arange(N, dtype=np.uint32)
+            cols = all_digits()
+        self.idx = np.asarray(idx, dtype=np.uint32)
+        self._cols = cols
+
+    @property
+    def cols(self) -> np.ndarray:
+        if self._cols is None:
+            self._cols = all_digits()[:, self.idx]
+        return self._cols
+
+    def __len__(self) -> int:
+        return self.idx.size
+
+    def __iter__(self):
+        return (int(i) for i in self.idx)
+
+    def feedback(self, guess: int) -> np.ndarray:
+        return feedback_columns(guess, self.cols)
+
+    def filter(self, guess: int, code: int) -> "CandidateSet":
+        """Candidates that would have answered ``code`` to ``guess``."""
+        keep = self.feedback(guess) == code
+        return CandidateSet(self.idx[keep], self.cols[:, keep])
@@ -1,10 +1,10 @@
 #!/usr/local/bin/python
 
-from itertools import permutations
 import random
 import os
 from hashlib import sha256
 import json
+from graph import Graph
 
 FLAG = os.environ.get('FLAG', 'RUSEC{test_flag}')
 
@@ -32,12 +32,8 @@ class SaltGen:
 def commit(value, salt):
     return sha256(value.to_bytes(1, 'big') + salt).digest()
 
-edges = set()
-NODES = 0
-for u, v in (map(int, line.split()) for line in open("graph.txt")):
-    edges |= {(u, v), (v, u)}
-    NODES = max(NODES, u, v)
-NODES += 1
+graph = Graph.load("graph.txt")
+NODES = graph.n
 
 with open('colors.txt', 'r') as f:
     coloring = list(map(int, f))
@@ -59,7 +55,7 @@ def handler(req):
             query = json.loads(input())
             try:
                 node1, node2 = query['edge']
-                assert((node1, node2) in edges)
+                assert(graph.has_edge(node1, node2))
             except (KeyError, ValueError, AssertionError):
                 return {
                     'error': 'invalid query',
@@ -85,11 +81,10 @@ def handler(req):
                 return {
                     'error': 'invalid guess',
                 }
-            for perm in permutations(colors):
-                if all(a == perm[b] for a, b in zip(coloring, guess_coloring)):
-                    return {
-                        'flag': FLAG,
-                    }
+            if graph.matches(coloring, guess_coloring):
+                return {
+                    'flag': FLAG,
+                }
             return {
                 'error': 'incorrect guess',
             }
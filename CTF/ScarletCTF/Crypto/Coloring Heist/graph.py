@@ -0,0 +1,198 @@
+"""Compact CSR view of graph.txt for the Coloring Heist service and tools.
+
+chal.py keeps the graph as a ``set`` of (u, v) tuples in both directions
+(~40k tuples) and re-zips the whole colouring for each of the six colour
+permutations on every ``guess``.  Here the edge list is parsed in one
+pass into NumPy arrays:
+
+* ``indptr`` / ``indices``: CSR adjacency, neighbours sorted per node, so
+  an edge test is a binary search in one short row;
+* ``edges``: the (m, 2) undirected list as read, for vectorised checks;
+
+and saved to ``graph.csr.npz`` next to the text file together with its
+sha256, so later starts load three arrays instead of re-parsing (the
+cache is rebuilt whenever graph.txt changes; an unreadable cache or a
+failed write only costs the parse).  ``matches`` compares a
+guessed colouring against all 6 permutations in one (6, n) comparison.
+
+    python3 graph.py [graph.txt]      # build/load the cache, time the checks
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from itertools import permutations
+
+import numpy as np
+
+COLORS = 3
+PERMS = np.array(list(permutations(range(COLORS))), dtype=np.int8)
+CACHE_SUFFIX = ".csr.npz"
+# ce que np.load lève sur un cache absent, tronqué, vide ou d'un autre format
+_CACHE_ERRORS = (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile)
+
+
+def _cache_path(path: str) -> str:
+    return os.path.splitext(path)[0] + CACHE_SUFFIX
+
+
+class Graph:
+    def __init__(self, edges: np.ndarray, n: int = None):
+        self.edges = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1, 2)
+        self.n = int(self.edges.max()) + 1 if n is None else n
+        both = np.concatenate([self.edges, self.edges[:, ::-1]])
+        order = np.lexsort((both[:, 1], both[:, 0]))
+        both = both[order]
+        self.indices = np.ascontiguousarray(both[:, 1])
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(both[:, 0], minlength=self.n), out=self.indptr[1:])
+
+    @classmethod
+    def load(cls, path: str = "graph.txt", cache: bool = True) -> "Graph":
+        """Parse ``path`` (one "u v" edge per line), through the binary cache if valid."""
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        cpath = _cache_path(path)
+        if cache and os.path.exists(cpath):
+            # cache illisible ou tronqué: on reparse, le service doit démarrer quand même
+            try:
+                with np.load(cpath, allow_pickle=False) as z:
+                    if str(z["sha256"]) == digest:
+                        g = cls.__new__(cls)
+                        g.edges, g.indptr, g.indices = z["edges"], z["indptr"], z["indices"]
+                        g.n = g.indptr.size - 1
+                        return g
+            except _CACHE_ERRORS:
+                pass
+        g = cls(np.array(raw.split(), dtype=np.int32))
+        if cache:
+            # écriture atomique: plusieurs workers peuvent démarrer en même temps
+            tmp = f"{cpath}.{os.getpid()}.tmp.npz"
+            try:
+                np.savez(tmp, sha256=digest, edges=g.edges, indptr=g.indptr, indices=g.indices)
+                os.replace(tmp, cpath)
+            except (OSError, ValueError):
+                # répertoire en lecture seule, disque plein...: le cache reste optionnel
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+        return g
+
+    @property
+    def m(self) -> int:
+        return self.edges.shape[0]
+
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors(self, u: int) -> np.ndarray:
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def has_edge(self, u, v) -> bool:
+        """Edge test for values from a JSON query (non-integers are never edges)."""
+        try:
+            iu, iv = int(u), int(v)
+        except (TypeError, ValueError, OverflowError):
+            return False
+        if iu != u or iv != v or not (0 <= iu < self.n and 0 <= iv < self.n):
+            return False
+        row = self.neighbors(iu)
+        i = int(np.searchsorted(row, iv))
+        return i < row.size and int(row[i]) == iv
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Sorted packed keys u * n + v of both directions (CSR order)."""
+        if getattr(self, "_keys", None) is None:
+            self._keys = np.repeat(np.arange(self.n, dtype=np.int64), self.degree()) * self.n + self.indices
+        return self._keys
+
+    def has_edges(self, us, vs) -> np.ndarray:
+        """Vectorised ``has_edge`` for integer arrays."""
+        us = np.asarray(us, dtype=np.int64)
+        vs = np.asarray(vs, dtype=np.int64)
+        ok = (us >= 0) & (us < self.n) & (vs >= 0) & (vs < self.n)
+        u, v = np.where(ok, us, 0), np.where(ok, vs, 0)
+        keys = self.keys
+        q = u * self.n + v
+        i = np.minimum(np.searchsorted(keys, q), keys.size - 1)
+        return ok & (keys[i] == q)
+
+    def conflicts(self, coloring) -> np.ndarray:
+        """Indices of the edges whose two ends share a colour."""
+        c = np.asarray(coloring)
+        return np.flatnonzero(c[self.edges[:, 0]] == c[self.edges[:, 1]])
+
+    def matches(self, coloring, guess) -> bool:
+        """True if ``guess`` equals ``coloring`` up to a permutation of the colours."""
+        coloring = np.asarray(coloring, dtype=np.int8)
+        guess = np.asarray(guess, dtype=np.intp)
+        return bool((PERMS[:, guess] == coloring).all(axis=1).any())
+
+
+def main() -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph.txt")
+    t0 = time.perf_counter()
+    Graph.load(path, cache=False)
+    t1 = time.perf_counter()
+    Graph.load(path)
+    t2 = time.perf_counter()
+    g = Graph.load(path)
+    t3 = time.perf_counter()
+    print(f"[+] {g.n} nodes, {g.m} edges: parse {(t1 - t0) * 1000:.1f} ms, "
+          f"cached load {(t3 - t2) * 1000:.1f} ms")
+
+    # cache corrompu, ou répertoire où l'on ne peut pas écrire: on reparse
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "graph.txt")
+        shutil.copyfile(path, copy)
+        cpath = _cache_path(copy)
+        Graph.load(copy)
+        with open(cpath, "rb") as f:
+            blob = f.read()
+        same = True
+        for bad in (b"", b"junk", blob[:len(blob) // 2]):
+            with open(cpath, "wb") as f:
+                f.write(bad)
+            same &= bool((Graph.load(copy).edges == g.edges).all())
+        os.remove(cpath)
+        os.mkdir(cpath)  # os.replace vers un répertoire échoue
+        same &= bool((Graph.load(copy).edges == g.edges).all())
+        same &= set(os.listdir(tmp)) == {"graph.txt", os.path.basename(cpath)} and not os.listdir(cpath)
+    print(f"[+] corrupt or unwritable cache: falls back to parsing, no tmp file left: {same}")
+
+    # référence: la structure de chal.py
+    t0 = time.perf_counter()
+    edges = set()
+    for u, v in g.edges.tolist():
+        edges |= {(u, v), (v, u)}
+    t1 = time.perf_counter()
+    print(f"[+] chal.py edge set: {(t1 - t0) * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    us, vs = rng.integers(0, g.n, 100000), rng.integers(0, g.n, 100000)
+    t0 = time.perf_counter()
+    got = g.has_edges(us, vs)
+    t1 = time.perf_counter()
+    ref = np.array([(u, v) in edges for u, v in zip(us.tolist(), vs.tolist())])
+    single = all(g.has_edge(int(u), int(v)) == r for u, v, r in zip(us[:2000], vs[:2000], ref))
+    print(f"[+] 100k edge tests: {(t1 - t0) * 1000:.1f} ms, agree with the set: "
+          f"{bool((got == ref).all()) and single}")
+
+    coloring = rng.integers(0, COLORS, g.n)
+    guess = PERMS[3][coloring]
+    t0 = time.perf_counter()
+    ok = g.matches(coloring, guess) and not g.matches(coloring, (guess + 1) % 2)
+    t1 = time.perf_counter()
+    print(f"[+] guess check over 6 permutations: {ok} ({(t1 - t0) * 1e6:.0f} us)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Pipelined bulk client for the Coloring Heist JSON protocol.
+
+A proof costs two exchanges: ``{"option": "query"}`` -> commitments, then
+``{"edge": [u, v]}`` -> the two opened (colour, salt).  The edge does not
+depend on the commitments, so both lines of up to ``window`` queries are
+written ahead in one ``sendall`` and the replies are read back in order
+as they stream in: lines are split out of one reusable ``recv_into``
+buffer, and the ~66 KB commitment line is only JSON-decoded when the
+commitments are kept.
+
+Every proof becomes one fixed-size record (session, query, node, colour,
+salt) appended to a binary log; ``load_proofs`` maps it back as a NumPy
+structured array, so salt recovery (lcg_recover.py) or colouring tools
+never re-parse JSON.  Kept commitments go to a second log of raw digests
+(``load_commits``).
+
+Throughput is bound by the service (~5 ms of hashing and JSON per query),
+so ``run_local`` also spreads queries over several local sessions.
+
+    python3 heist_client.py [queries] [sessions]   # bench against local chal.py instances
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from multiprocessing import get_context
+
+import numpy as np
+
+from graph import Graph
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SALT_LEN = 18
+PROOF_DTYPE = np.dtype([("session", "<u2"), ("query", "<u4"), ("node", "<u2"),
+                        ("color", "u1"), ("salt", "u1", (SALT_LEN,))])
+QUERY_LINE = json.dumps({"option": "query"}).encode() + b"\n"
+
+
+def commit_dtype(nodect: int) -> np.dtype:
+    return np.dtype([("session", "<u2"), ("query", "<u4"), ("digests", "u1", (nodect, 32))])
+
+
+def load_proofs(path: str) -> np.ndarray:
+    """Proof log as a structured array (session, query, node, color, salt[18] as uint8).
+
+    Salts are fixed-width byte arrays rather than ``S18``, which would drop
+    trailing zero bytes.
+    """
+    return np.fromfile(path, dtype=PROOF_DTYPE)
+
+
+def load_commits(path: str, nodect: int) -> np.ndarray:
+    """Commitment log as a structured array (session, query, digests[nodect, 32])."""
+    return np.fromfile(path, dtype=commit_dtype(nodect))
+
+
+def salt_pairs(proofs: np.ndarray, session: int = 0) -> list:
+    """(query, salt bytes) pairs of one session, as ``lcg_recover.samples_from_proofs`` takes them."""
+    rows = proofs[proofs["session"] == session]
+    return [(int(q), bytes(s)) for q, s in zip(rows["query"], rows["salt"])]
+
+
+class HeistClient:
+    def __init__(self, sock: socket.socket, session: int = 0, query_base: int = 0,
+                 bufsize: int = 1 << 18):
+        self.sock = sock
+        self.session = session
+        self.queries = query_base  # index de la prochaine requête côté service
+        self._chunk = bytearray(bufsize)
+        self._view = memoryview(self._chunk)
+        self._buf = bytearray()
+        self._pos = 0
+        self.errors = 0
+        self.latency = []
+
+    @classmethod
+    def connect(cls, host: str, port: int, **kw) -> "HeistClient":
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(sock, **kw)
+
+    def close(self):
+        self.sock.close()
+
+    # ---- flux ----
+    def _fill(self):
+        if self._pos:
+            del self._buf[:self._pos]
+            self._pos = 0
+        n = self.sock.recv_into(self._chunk)
+        if n == 0:
+            raise EOFError("connection closed")
+        self._buf += self._view[:n]
+
+    def read_line(self) -> bytes:
+        while True:
+            end = self._buf.find(b"\n", self._pos)
+            if end >= 0:
+                line = bytes(self._buf[self._pos:end])
+                self._pos = end + 1
+                return line
+            self._fill()
+
+    def read_json(self):
+        return json.loads(self.read_line())
+
+    def send(self, *objs):
+        self.sock.sendall(b"".join(json.dumps(o).encode() + b"\n" for o in objs))
+
+    # ---- protocole ----
+    def guess(self, coloring) -> dict:
+        self.send({"option": "guess", "coloring": list(map(int, coloring))})
+        return self.read_json()
+
+    def collect(self, edges, window: int = 64, keep_commits: bool = False) -> tuple:
+        """Run one query per edge, ``window`` in flight; (proof records, commit records)."""
+        proofs, commits = [], []
+        pending = deque()
+        it = iter(edges)
+        done = False
+        while True:
+            out = []
+            while not done and len(pending) < window:
+                edge = next(it, None)
+                if edge is None:
+                    done = True
+                    break
+                out += [QUERY_LINE, json.dumps({"edge": [int(edge[0]), int(edge[1])]}).encode(), b"\n"]
+                pending.append((self.queries, edge, time.perf_counter()))
+                self.queries += 1
+            if out:
+                self.sock.sendall(b"".join(out))
+            if not pending:
+                break
+            query, (u, v), sent = pending.popleft()
+            line = self.read_line()
+            if keep_commits:
+                digests = np.array([bytes.fromhex(c) for c in json.loads(line)["commits"]], dtype="S32")
+                commits.append((self.session, query, digests.view(np.uint8).reshape(-1, 32)))
+            reply = self.read_json()
+            self.latency.append(time.perf_counter() - sent)
+            if "proofs" not in reply:
+                self.errors += 1
+                continue
+            for node, proof in zip((u, v), reply["proofs"]):
+                proofs.append((self.session, query, node, proof["color"], tuple(bytes.fromhex(proof["salt"]))))
+        return np.array(proofs, dtype=PROOF_DTYPE), commits
+
+
+def local_instance(path: str = None, session: int = 0):
+    """(client, process) for chal.py over a socketpair; colors.txt is generated if missing."""
+    path = path or os.path.join(HERE, "chal.py")
+    cwd = os.path.dirname(path)
+    if not os.path.exists(os.path.join(cwd, "colors.txt")):
+        subprocess.run([sys.executable, os.path.join(HERE, "colorer.py"), os.path.join(cwd, "graph.txt"),
+                        "-o", os.path.join(cwd, "colors.txt")], check=True, stdout=subprocess.DEVNULL)
+    ours, theirs = socket.socketpair()
+    proc = subprocess.Popen([sys.executable, path], stdin=theirs, stdout=theirs, cwd=cwd)
+    theirs.close()
+    return HeistClient(ours, session=session), proc
+
+
+def _local_session(args) -> tuple:
+    session, queries, window, keep_commits, seed = args
+    graph = Graph.load(os.path.join(HERE, "graph.txt"))
+    edges = graph.edges[np.random.default_rng(seed).integers(0, graph.m, queries)]
+    client, proc = local_instance(session=session)
+    t0 = time.perf_counter()
+    proofs, commits = client.collect(edges, window, keep_commits)
+    dt = time.perf_counter() - t0
+    client.send({"option": "exit"})
+    proc.wait(timeout=5)
+    client.close()
+    return proofs, commits, dt, client.errors, client.latency
+
+
+def run_local(queries: int, sessions: int = 1, window: int = 64, proof_log: str = None,
+              commit_log: str = None) -> np.ndarray:
+    """Collect ``queries`` proof pairs from ``sessions`` local chal.py instances in parallel."""
+    per = -(-queries // sessions)
+    jobs = [(s, per, window, commit_log is not None, s) for s in range(sessions)]
+    t0 = time.perf_counter()
+    if sessions == 1:
+        results = [_local_session(jobs[0])]
+    else:
+        with get_context("spawn").Pool(sessions) as pool:
+            results = pool.map(_local_session, jobs)
+    wall = time.perf_counter() - t0
+    proofs = np.concatenate([r[0] for r in results])
+    if proof_log:
+        with open(proof_log, "ab") as f:
+            proofs.tofile(f)
+    if commit_log:
+        nodect = results[0][1][0][2].shape[0]
+        with open(commit_log, "ab") as f:
+            np.array([c for r in results for c in r[1]], dtype=commit_dtype(nodect)).tofile(f)
+    lat = np.array([x for r in results for x in r[4]])
+    print(f"[+] {sessions} session(s), {per * sessions} queries, window {window}: "
+          f"{proofs.size} proofs in {wall:.2f}s -> {proofs.size / wall:.0f} proofs/s "
+          f"(session time {max(r[2] for r in results):.2f}s, errors {sum(r[3] for r in results)})")
+    print(f"    reply latency in flight: median {np.median(lat) * 1000:.1f} ms, "
+          f"p99 {np.percentile(lat, 99) * 1000:.1f} ms")
+    return proofs
+
+
+def main() -> int:
+    import hashlib
+    import tempfile
+
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    # référence: un aller-retour bloquant par échange
+    graph = Graph.load(os.path.join(HERE, "graph.txt"))
+    client, proc = local_instance()
+    t0 = time.perf_counter()
+    for u, v in graph.edges[:200].tolist():
+        client.send({"option": "query"})
+        client.read_line()
+        client.send({"edge": [u, v]})
+        client.read_json()
+    dt = time.perf_counter() - t0
+    client.send({"option": "exit"})
+    proc.wait(timeout=5)
+    client.close()
+    print(f"[+] Blocking round-trips: {400 / dt:.0f} proofs/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plog, clog = os.path.join(tmp, "proofs.bin"), os.path.join(tmp, "commits.bin")
+        run_local(queries, sessions)
+        run_local(200, 1, proof_log=plog, commit_log=clog)
+        proofs, commits = load_proofs(plog), load_commits(clog, graph.n)
+        # chaque preuve doit ouvrir la mise du même nœud dans la même requête
+        digest = {int(c["query"]): c["digests"] for c in commits}
+        ok = all(hashlib.sha256(bytes([int(p["color"])]) + p["salt"].tobytes()).digest()
+                 == digest[int(p["query"])][int(p["node"])].tobytes() for p in proofs)
+        print(f"[+] Logs reloaded: {proofs.size} proofs, {commits.size} commitment sets, "
+              f"all proofs open their commitment: {ok}")
+
+    # le journal alimente directement la récupération de l'état du LCG
+    from lcg_recover import recover_state, samples_from_proofs
+    from saltgen import SHIFT, affine_jump
+    samples = samples_from_proofs(salt_pairs(proofs), graph.n)
+    found = recover_state(samples[:8])
+    pos, state = found if found else (0, 0)
+    agree = found is not None and all(affine_jump(state, p - pos) >> SHIFT == top for p, top in samples)
+    print(f"[+] LCG state recovered from the log, predicts every logged salt: {agree}")
+    ok &= agree
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
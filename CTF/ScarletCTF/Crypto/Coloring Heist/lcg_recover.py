@@ -0,0 +1,181 @@
+"""Recover Coloring Heist's SaltGen from a handful of revealed salts.
+
+SaltGen is a 512-bit LCG ``s' = a*s + c mod m`` and every salt is
+``node.to_bytes(2) + (s >> 384).to_bytes(16)``: the top 128 bits of one
+state.  A query draws NODES salts in node order and only then shuffles
+them, so the 2-byte prefix tells where a salt sits in the stream: call
+``q * NODES + node`` for the q-th query.
+
+With the first sample as reference, s_i = A_i s_0 + C_i (affine jump of
+d_i = pos_i - pos_0 steps) and s_i = y_i 2^384 + z_i with 0 <= z_i < 2^384,
+so every unknown low part satisfies
+
+    z_i = A_i z_0 + B_i  (mod m),   B_i = A_i y_0 2^384 + C_i - y_i 2^384
+
+i.e. (z_0, z_1 - B_1, ..., z_r - B_r) is a point of the lattice spanned by
+(1, A_1, ..., A_r) and m e_i that lies within 2^383 of a known target.
+Each sample fixes ~128 of the 384 unknown bits, so 5 samples are the
+minimum and 6-8 leave a comfortable margin.  The lattice is LLL-reduced
+and the point found by Babai's nearest plane, all in exact integer /
+Fraction arithmetic; a is invertible mod m, so the recovered state is
+walked back to the seed and ``SaltGen(NODES, seed)`` (or saltgen.py's
+``JumpSaltGen``) replays every salt.
+
+    python3 lcg_recover.py      # recover a random SaltGen from 4 queries
+"""
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+from saltgen import M, SHIFT, JumpSaltGen, affine_jump, affine_pow
+
+MAX_SAMPLES = 8
+
+
+def parse_salt(salt) -> tuple:
+    """(node, top 128 bits) of a salt given as bytes or hex."""
+    if isinstance(salt, str):
+        salt = bytes.fromhex(salt)
+    return int.from_bytes(salt[:2], "big"), int.from_bytes(salt[2:], "big")
+
+
+# ========== Réseaux ==========
+def _dot(u, v):
+    return sum(x * y for x, y in zip(u, v))
+
+
+def _gram_schmidt(B):
+    Bs, mu, norms = [], [[Fraction(0)] * len(B) for _ in B], []
+    for i, b in enumerate(B):
+        v = [Fraction(x) for x in b]
+        for j in range(i):
+            mu[i][j] = _dot(b, Bs[j]) / norms[j]
+            v = [x - mu[i][j] * y for x, y in zip(v, Bs[j])]
+        Bs.append(v)
+        norms.append(_dot(v, v))
+    return Bs, mu, norms
+
+
+def lll(B, delta=Fraction(3, 4)) -> list:
+    """LLL-reduced copy of the integer basis ``B`` (rows), exact arithmetic."""
+    B = [list(map(int, b)) for b in B]
+    n = len(B)
+    _, mu, norms = _gram_schmidt(B)
+    k = 1
+    while k < n:
+        for j in range(k - 1, -1, -1):
+            q = round(mu[k][j])
+            if q:
+                B[k] = [x - q * y for x, y in zip(B[k], B[j])]
+                for i in range(j):
+                    mu[k][i] -= q * mu[j][i]
+                mu[k][j] -= q
+        if norms[k] >= (delta - mu[k][k - 1] ** 2) * norms[k - 1]:
+            k += 1
+        else:
+            # échange de b_k et b_(k-1), mise à jour de Gram-Schmidt en place
+            B[k], B[k - 1] = B[k - 1], B[k]
+            m = mu[k][k - 1]
+            nb = norms[k] + m * m * norms[k - 1]
+            mu[k][k - 1] = m * norms[k - 1] / nb
+            norms[k] = norms[k - 1] * norms[k] / nb
+            norms[k - 1] = nb
+            for j in range(k - 1):
+                mu[k][j], mu[k - 1][j] = mu[k - 1][j], mu[k][j]
+            for i in range(k + 1, n):
+                t = mu[i][k]
+                mu[i][k] = mu[i][k - 1] - m * t
+                mu[i][k - 1] = t + mu[k][k - 1] * mu[i][k]
+            k = max(k - 1, 1)
+    return B
+
+
+def babai(B, target) -> list:
+    """Lattice point near ``target`` by Babai's nearest plane on a reduced basis."""
+    Bs, _, norms = _gram_schmidt(B)
+    b = list(target)
+    for j in range(len(B) - 1, -1, -1):
+        c = round(_dot(b, Bs[j]) / norms[j])
+        if c:
+            b = [x - c * y for x, y in zip(b, B[j])]
+    return [t - x for t, x in zip(target, b)]
+
+
+# ========== Récupération ==========
+def recover_state(samples):
+    """(position, full state) from [(position, top 128 bits), ...].
+
+    ``position`` counts one_salt calls from 0; the state returned is the
+    one right after call ``position`` (the one whose top bits were leaked).
+    Returns None when the samples do not determine a consistent state.
+    """
+    samples = sorted(set(samples))[:MAX_SAMPLES]
+    if len(samples) < 2:
+        return None
+    (p0, y0), rest = samples[0], samples[1:]
+    r = len(rest)
+    rows = [[1] + [0] * r]
+    target = [1 << (SHIFT - 1)]
+    for i, (p, y) in enumerate(rest, 1):
+        an, cn = affine_pow(p - p0)
+        rows[0][i] = an
+        row = [0] * (r + 1)
+        row[i] = M
+        rows.append(row)
+        b = (an * (y0 << SHIFT) + cn - (y << SHIFT)) % M
+        target.append(((1 << (SHIFT - 1)) - b) % M)
+    z0 = babai(lll(rows), target)[0]
+    if not 0 <= z0 < 1 << SHIFT:
+        return None
+    state = (y0 << SHIFT) | z0
+    for p, y in samples:
+        if affine_jump(state, p - p0) >> SHIFT != y:
+            return None
+    return p0, state
+
+
+def recover_seed(samples):
+    """Seed s such that ``SaltGen(nodect, seed=s)`` replays the stream, or None."""
+    found = recover_state(samples)
+    if found is None:
+        return None
+    p0, state = found
+    return affine_jump(state, -(p0 + 1))
+
+
+def samples_from_proofs(proofs, nodect: int) -> list:
+    """[(position, top bits)] from (query index, salt) pairs taken from query proofs."""
+    out = []
+    for query, salt in proofs:
+        node, top = parse_salt(salt)
+        out.append((query * nodect + node, top))
+    return out
+
+
+def main() -> int:
+    graph = os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph.txt")
+    with open(graph) as f:
+        nodect = 1 + max(max(map(int, line.split())) for line in f if line.strip())
+
+    seed = int.from_bytes(os.urandom(16), "big") % M
+    gen = JumpSaltGen(nodect, seed)
+    proofs = []
+    for q in range(4):
+        salts = gen.query_salts(q)
+        random.shuffle(salts)
+        # deux preuves par requête: les sels des extrémités de l'arête
+        proofs += [(q, salts[i].hex()) for i in random.sample(range(nodect), 2)]
+
+    t0 = time.time()
+    found = recover_seed(samples_from_proofs(proofs, nodect))
+    dt = time.time() - t0
+    print(f"[+] {len(proofs)} salts, {nodect} nodes -> seed recovered: {found == seed} ({dt:.2f}s)")
+    ok = found is not None and JumpSaltGen(nodect, found).query_salts(1000) == gen.query_salts(1000)
+    print(f"[+] Query 1000 salts reproduced: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
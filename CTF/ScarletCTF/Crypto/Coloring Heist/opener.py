@@ -0,0 +1,148 @@
+"""Bulk opening of Coloring Heist commitments once the salts are predictable.
+
+A ``query`` answers with one ``sha256(color_byte || salt)`` per node, the
+salts being the query's NODES salts shuffled.  With the salt stream known
+(lcg_recover.py, saltgen.py), every (colour, candidate salt) pair is hashed once and
+the digests go into a dict, so each commitment is opened by one lookup:
+the node's (permuted) colour and the salt it used.  A single query then
+yields the whole colouring up to a permutation of the three colours,
+which is all ``guess`` asks for.
+
+The messages live in one contiguous (3 * n, 19) uint8 buffer; large
+candidate sets (several queries, uncertain offsets) are hashed by a
+process pool, each worker taking a slice of the buffer and sending back
+its digests as one bytes object.
+
+    python3 opener.py      # open a simulated query, then 64 candidate queries
+"""
+import hashlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from saltgen import S, JumpSaltGen
+
+COLORS = 3
+SALT_LEN = 2 + S // 8
+MSG_LEN = 1 + SALT_LEN
+DIGEST_LEN = 32
+PARALLEL_MIN = 1 << 16  # en dessous, le pool coûte plus qu'il ne rapporte
+
+
+def salt_array(salts) -> np.ndarray:
+    """(n, 18) uint8 matrix of salts given as bytes or hex strings."""
+    if isinstance(salts, np.ndarray):
+        return np.ascontiguousarray(salts, dtype=np.uint8).reshape(-1, SALT_LEN)
+    buf = b"".join(bytes.fromhex(s) if isinstance(s, str) else s for s in salts)
+    return np.frombuffer(buf, dtype=np.uint8).reshape(-1, SALT_LEN)
+
+
+def messages(salts: np.ndarray) -> np.ndarray:
+    """(3 * n, 19) buffer: row c * n + i is colour c followed by salt i."""
+    n = salts.shape[0]
+    msgs = np.empty((COLORS, n, MSG_LEN), dtype=np.uint8)
+    msgs[:, :, 0] = np.arange(COLORS, dtype=np.uint8)[:, None]
+    msgs[:, :, 1:] = salts[None]
+    return msgs.reshape(COLORS * n, MSG_LEN)
+
+
+def _hash_chunk(buf: bytes) -> bytes:
+    view = memoryview(buf)
+    sha = hashlib.sha256
+    return b"".join(sha(view[i:i + MSG_LEN]).digest() for i in range(0, len(view), MSG_LEN))
+
+
+def hash_messages(msgs: np.ndarray, pool: ProcessPoolExecutor = None) -> bytes:
+    """Concatenated digests of every row of ``msgs``, in order."""
+    buf = msgs.tobytes()
+    if pool is None or msgs.shape[0] < PARALLEL_MIN:
+        return _hash_chunk(buf)
+    rows = -(-msgs.shape[0] // (4 * (os.cpu_count() or 1)))
+    step = rows * MSG_LEN
+    return b"".join(pool.map(_hash_chunk, (buf[i:i + step] for i in range(0, len(buf), step))))
+
+
+class CommitIndex:
+    """digest -> (candidate salt, colour) for every colour and candidate salt."""
+
+    def __init__(self, salts, pool: ProcessPoolExecutor = None):
+        self.salts = salt_array(salts)
+        n = self.salts.shape[0]
+        digests = hash_messages(messages(self.salts), pool)
+        # code = couleur * n + sel, dans l'ordre des lignes de messages()
+        self.n = n
+        self.index = {digests[i:i + DIGEST_LEN]: code
+                      for code, i in enumerate(range(0, len(digests), DIGEST_LEN))}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lookup(self, digest) -> tuple:
+        """(candidate salt index, colour), or None if ``digest`` opens to nothing."""
+        if isinstance(digest, str):
+            digest = bytes.fromhex(digest)
+        code = self.index.get(digest)
+        return None if code is None else (code % self.n, code // self.n)
+
+    def open(self, commits) -> tuple:
+        """(salt index, colour) arrays for a list of commitments, -1 where unknown."""
+        get = self.index.get
+        codes = np.fromiter((get(bytes.fromhex(c) if isinstance(c, str) else c, -1) for c in commits),
+                            dtype=np.int64, count=len(commits))
+        known = codes >= 0
+        return np.where(known, codes % self.n, -1), np.where(known, codes // self.n, -1)
+
+
+def open_query(commits, salts, pool: ProcessPoolExecutor = None) -> list:
+    """Colouring (up to a permutation) behind one query's commitments.
+
+    ``salts`` are the query's candidate salts in any order (more may be
+    given, e.g. several consecutive queries).  Raises ValueError when a
+    commitment does not open.
+    """
+    _, colors = CommitIndex(salts, pool).open(commits)
+    missing = np.flatnonzero(colors < 0)
+    if missing.size:
+        raise ValueError(f"{missing.size} commitments did not open (first: node {missing[0]})")
+    return colors.tolist()
+
+
+def main() -> int:
+    nodect = 1000
+    gen = JumpSaltGen(nodect)
+    coloring = [random.randrange(COLORS) for _ in range(nodect)]
+
+    # requête simulée comme dans chal.py: sels mélangés, couleurs permutées
+    query = 37
+    salts = gen.query_salts(query)
+    random.shuffle(salts)
+    perm = random.sample(range(COLORS), COLORS)
+    commits = [hashlib.sha256(bytes([perm[c]]) + s).hexdigest() for c, s in zip(coloring, salts)]
+
+    t0 = time.time()
+    got = open_query(commits, gen.query_salts(query))
+    dt = time.time() - t0
+    same = all(g == perm[c] for g, c in zip(got, coloring))
+    print(f"[+] One query, {COLORS * nodect} hashes: coloring recovered {same} ({dt * 1000:.1f} ms)")
+
+    # décalage inconnu: 64 requêtes candidates, hachées par le pool
+    t0 = time.time()
+    with ProcessPoolExecutor() as pool:
+        cands = salt_array([s for q in gen.query_salts_parallel(0, 64, pool=pool) for s in q])
+        t1 = time.time()
+        index = CommitIndex(cands, pool)
+        t2 = time.time()
+        salt_idx, colors = index.open(commits)
+    dt = time.time() - t2
+    same &= bool((colors == np.array([perm[c] for c in coloring])).all())
+    print(f"[+] 64 candidate queries: salts {t1 - t0:.2f}s, {len(index)} digests indexed "
+          f"{t2 - t1:.2f}s, opened in {dt * 1000:.1f} ms, query {salt_idx.min() // nodect}: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
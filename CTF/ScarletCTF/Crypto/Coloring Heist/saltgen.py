@@ -0,0 +1,205 @@
+"""SaltGen with O(log n) jump-ahead and random-access salt generation.
+
+chal.py's SaltGen advances ``s' = a*s + c mod m`` once per node per query,
+so reaching query q means q * NODES 512-bit multiplications.  n steps of
+an affine map are again affine, x -> A_n x + C_n, and two jumps compose
+as (A, C) o (A', C') = (A A', A C' + C): with the table of (A_(2^k),
+C_(2^k)) built once, any position costs one multiplication per set bit
+of its offset.
+
+``JumpSaltGen`` produces exactly chal.py's stream (same ``one_salt`` /
+``__next__``) and adds ``seek``, ``query_salts`` (one query, node order,
+before the shuffle) and ``query_salts_parallel``, which splits a query,
+or a range of queries, into chunks that workers generate from their own
+jump points.  a is invertible mod m, so ``seek`` also goes backwards.
+
+    python3 saltgen.py      # check against chal.py's SaltGen, time jumps and chunks
+"""
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+M = 13152378179379815081785672867620005957454449438286627972627743643665015781005638840736748732751002654743381407736010812439576964014824389995002529765266561
+A = 159366294799379508230260405538460486080857348671716937260698454572531895324935570199591308975425134610886483656618025523387680649265527380424978907280628
+C = 282546875723632189452110820393921416548791548742828675605467969601041505961545030191698478991825060426711934064746301072403984439778604015323729962763523
+K = M.bit_length()
+S = 128
+SHIFT = K - S
+JUMP_BITS = 64
+
+
+# ========== Sauts affines ==========
+def affine_pow(n: int, a: int = A, c: int = C, m: int = M):
+    """(An, Cn) with x -> An*x + Cn mod m equal to n steps of x -> a*x + c."""
+    ra, rc = 1, 0
+    while n:
+        if n & 1:
+            ra, rc = ra * a % m, (rc * a + c) % m
+        a, c = a * a % m, (c * a + c) % m
+        n >>= 1
+    return ra, rc
+
+
+def _table(a: int, c: int) -> list:
+    out = [(a, c)]
+    for _ in range(JUMP_BITS - 1):
+        a, c = out[-1]
+        out.append((a * a % M, (c * a + c) % M))
+    return out
+
+
+_FORWARD = None
+_BACKWARD = None
+
+
+def affine_jump(state: int, steps: int) -> int:
+    """State ``steps`` calls later (negative steps go back, a being invertible)."""
+    global _FORWARD, _BACKWARD
+    if steps >= 0:
+        if _FORWARD is None:
+            _FORWARD = _table(A, C)
+        table = _FORWARD
+    else:
+        if _BACKWARD is None:
+            ai = pow(A, -1, M)
+            _BACKWARD = _table(ai, -ai * C % M)
+        table, steps = _BACKWARD, -steps
+    if steps >> JUMP_BITS:
+        an, cn = affine_pow(steps, *table[0])
+        return (an * state + cn) % M
+    k = 0
+    while steps:
+        if steps & 1:
+            a, c = table[k]
+            state = (a * state + c) % M
+        steps >>= 1
+        k += 1
+    return state
+
+
+def _salt_chunk(args) -> list:
+    """Salts of calls start .. start+count-1 from ``state`` (the state before call ``start``)."""
+    state, start, count, nodect = args
+    out = []
+    for pos in range(start, start + count):
+        state = (A * state + C) % M
+        out.append((pos % nodect).to_bytes(2, "big") + (state >> SHIFT).to_bytes(S // 8, "big"))
+    return out
+
+
+class JumpSaltGen:
+    """chal.py's SaltGen, plus random access to any (query, node) position."""
+
+    def __init__(self, nodect, seed=None):
+        self.nodect = nodect
+        self.m, self.a, self.c = M, A, C
+        self.k = K
+        self.s = S
+        if seed is None: seed = os.urandom(16)
+        if isinstance(seed, bytes): seed = int.from_bytes(seed, 'big')
+        self.state = seed % self.m
+        self.origin = self.state
+        self.pos = 0  # appels à one_salt depuis l'origine
+
+    def one_salt(self):
+        self.state = (self.a * self.state + self.c) % self.m
+        self.pos += 1
+        return self.state >> (self.k - self.s)
+
+    def __next__(self):
+        out = [i.to_bytes(2, 'big') + self.one_salt().to_bytes(self.s // 8, 'big') for i in range(self.nodect)]
+        random.shuffle(out)
+        return out
+
+    def seek(self, query: int, node: int = 0):
+        """Position the generator so the next one_salt is ``node`` of query ``query``."""
+        pos = query * self.nodect + node
+        self.state = affine_jump(self.state, pos - self.pos)
+        self.pos = pos
+
+    def tell(self) -> tuple:
+        return divmod(self.pos, self.nodect)
+
+    def state_at(self, pos: int) -> int:
+        """State before call ``pos`` (without moving the generator)."""
+        return affine_jump(self.state, pos - self.pos)
+
+    def query_salts(self, query: int) -> list:
+        """Salts of query ``query`` in node order (before the shuffle)."""
+        start = query * self.nodect
+        return _salt_chunk((self.state_at(start), start, self.nodect, self.nodect))
+
+    def query_salts_parallel(self, first: int, count: int = 1, chunks: int = None,
+                             pool: ProcessPoolExecutor = None) -> list:
+        """Salts of queries ``first .. first+count-1``, node order, one list per query.
+
+        The range is cut into ``chunks`` pieces whose start states are
+        jumped to independently, then generated by ``pool`` (sequentially
+        without one).
+        """
+        start, total = first * self.nodect, count * self.nodect
+        chunks = max(1, min(chunks or 4 * (os.cpu_count() or 1), total))
+        step = -(-total // chunks)
+        jobs = [(self.state_at(p), p, min(step, start + total - p), self.nodect)
+                for p in range(start, start + total, step)]
+        parts = pool.map(_salt_chunk, jobs) if pool is not None else map(_salt_chunk, jobs)
+        flat = [s for part in parts for s in part]
+        return [flat[i:i + self.nodect] for i in range(0, total, self.nodect)]
+
+
+def _chal_saltgen():
+    """chal.py's SaltGen class, extracted without running the service."""
+    import ast
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chal.py")
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    node = next(n for n in tree.body if isinstance(n, ast.ClassDef) and n.name == "SaltGen")
+    ns = {"os": os, "random": random}
+    exec(compile(ast.Module([node], []), path, "exec"), ns)
+    return ns["SaltGen"]
+
+
+def main() -> int:
+    nodect = 1000
+    seed = os.urandom(16)
+    ref = _chal_saltgen()(nodect, seed)
+    gen = JumpSaltGen(nodect, seed)
+    ok = all(sorted(next(ref)) == sorted(next(gen)) for _ in range(3))
+
+    query = 5000
+    t0 = time.time()
+    for _ in range(query - 3):
+        for _ in range(nodect):
+            ref.one_salt()
+    t1 = time.time()
+    want = _salt_chunk((ref.state, query * nodect, nodect, nodect))
+    t2 = time.time()
+    got = JumpSaltGen(nodect, seed).query_salts(query)
+    t3 = time.time()
+    ok &= got == want
+    print(f"[+] Query {query}: stepping {t1 - t0:.2f}s, jump + generate {(t3 - t2) * 1000:.1f} ms, "
+          f"same salts: {got == want}")
+
+    t0 = time.time()
+    gen.seek(10 ** 15, 123)
+    back = gen.state_at(query * nodect)
+    t1 = time.time()
+    ok &= back == JumpSaltGen(nodect, seed).state_at(query * nodect)
+    print(f"[+] seek(10^15) and back: {(t1 - t0) * 1000:.2f} ms, {gen.tell()}")
+
+    with ProcessPoolExecutor() as pool:
+        t0 = time.time()
+        seq = [gen.query_salts(q) for q in range(query, query + 64)]
+        t1 = time.time()
+        par = gen.query_salts_parallel(query, 64, pool=pool)
+        t2 = time.time()
+    ok &= seq == par
+    print(f"[+] 64 queries: one by one {t1 - t0:.2f}s, chunked in parallel {t2 - t1:.2f}s "
+          f"({os.cpu_count()} CPUs), identical: {seq == par}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
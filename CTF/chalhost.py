@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Asyncio host for the stdin/stdout challenge services.
+
+The services (wordy/source/service.py, Curve Ball/source/curve.py, Linux
+Penguin/source/penguin.py, Coloring Heist/chal.py) are blocking
+``input()`` / ``print()`` loops; hosted behind socat they cost a fork plus
+an interpreter start-up per player.  Here a fixed pool of worker processes
+shares one listening socket, and each worker runs an asyncio loop that owns
+the connections.  The script itself is compiled once per worker and
+executed unchanged for every session:
+
+* each session runs the code object in a fresh ``__main__`` namespace on
+  its own small thread, so module globals (keys, RNG state, secrets) are
+  per session; ``random`` is replaced by a private ``random.Random``
+  instance through the namespace's ``__import__``;
+* ``sys.stdin`` / ``sys.stdout`` are thread-dispatching proxies: a read
+  first flushes pending output, then waits on the session's bounded input
+  queue; a flush waits for the socket to drain.  A client that does not
+  read stalls its own session until ``--write-timeout``, after which the
+  connection is aborted and the slot freed; one that floods input stops
+  being read (``IN_LINES`` lines in flight at most);
+* bytes on the wire are exactly what the script prints (UTF-8, ``\\r\\n``
+  read as ``\\n`` like a text-mode stdin).
+
+When a session ends a JSON line with its CPU time (thread time), byte and
+line counts and reply latency (line received -> next output flushed) goes
+to the metrics stream; every worker also logs a summary each
+``--summary`` seconds.
+
+    python3 chalhost.py "PascalCTF 2026/Crypto/wordy/source/service.py" --port 5005
+    python3 chalhost.py "ScarletCTF/Crypto/Coloring Heist/chal.py" -w 8 --metrics heist.jsonl
+"""
+import argparse
+import asyncio
+import builtins
+import io
+import json
+import multiprocessing as mp
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import traceback
+import types
+
+IN_LINES = 64             # lignes reçues en attente par session
+OUT_CHUNK = 1 << 16       # sortie bufferisée avant envoi forcé
+LINE_LIMIT = 1 << 16      # longueur max d'une ligne client
+STACK_SIZE = 512 * 1024   # pile des threads de session
+ISOLATED_MODULES = ("random",)
+
+_current = threading.local()
+
+
+# ========== Métriques ==========
+class LatencyStats:
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, dt: float):
+        self.count += 1
+        self.total += dt
+        self.min = min(self.min, dt)
+        self.max = max(self.max, dt)
+
+    def as_dict(self) -> dict:
+        if not self.count:
+            return {"n": 0}
+        return {"n": self.count, "avg_ms": round(self.total / self.count * 1000, 3),
+                "min_ms": round(self.min * 1000, 3), "max_ms": round(self.max * 1000, 3)}
+
+
+# ========== Isolation par session ==========
+def _private_random() -> types.ModuleType:
+    """A ``random`` module whose functions are bound to a fresh Random()."""
+    mod = types.ModuleType("random")
+    mod.__dict__.update(random.__dict__)
+    rng = random.Random()
+    for name, value in random.__dict__.items():
+        if getattr(value, "__self__", None) is random._inst:
+            setattr(mod, name, getattr(rng, name))
+    mod._inst = rng
+    return mod
+
+
+def _session_builtins() -> dict:
+    private = {name: None for name in ISOLATED_MODULES}
+
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in private:
+            if private[name] is None:
+                private[name] = _private_random()
+            return private[name]
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    ns = dict(vars(builtins))
+    ns["__import__"] = _import
+    return ns
+
+
+# ========== Flux standard ==========
+class _Dispatch:
+    """sys.stdin / sys.stdout replacement that forwards to the running session."""
+
+    def __init__(self, name: str, fallback):
+        self._name = name
+        self._fallback = fallback
+
+    def _target(self):
+        session = getattr(_current, "session", None)
+        return self._fallback if session is None else getattr(session, self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+    def __iter__(self):
+        return iter(self._target())
+
+
+class _SessionStdin(io.TextIOBase):
+    def __init__(self, session: "Session"):
+        self._session = session
+
+    def readable(self) -> bool:
+        return True
+
+    def readline(self, size=-1) -> str:
+        return self._session.read_line()
+
+    def read(self, size=-1) -> str:
+        return "".join(iter(self.readline, ""))
+
+    def __iter__(self):
+        return iter(self.readline, "")
+
+    def close(self):
+        # exit() ferme stdin avant de lever SystemExit
+        self._session.eof = True
+
+
+class _SessionStdout(io.TextIOBase):
+    def __init__(self, session: "Session"):
+        self._session = session
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._session.write(s)
+        return len(s)
+
+    def flush(self):
+        self._session.flush()
+
+
+# ========== Session ==========
+class Session:
+    def __init__(self, loop, writer, peer: str, write_timeout: float):
+        self.loop = loop
+        self.writer = writer
+        self.peer = peer
+        self.write_timeout = write_timeout
+        self.inbox = asyncio.Queue(IN_LINES)
+        self.stdin = _SessionStdin(self)
+        self.stdout = _SessionStdout(self)
+        self.eof = False
+        self._out = []
+        self._out_size = 0
+        self._pending = None  # réception de la dernière ligne sans réponse
+        self.started = time.time()
+        self.cpu = 0.0
+        self.lines_in = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = LatencyStats()
+        self.exit = None
+
+    # -- côté thread de session --
+    def read_line(self) -> str:
+        self.flush()
+        if self.eof:
+            return ""
+        item = asyncio.run_coroutine_threadsafe(self.inbox.get(), self.loop).result()
+        if item is None:
+            self.eof = True
+            return ""
+        received, line = item
+        if self._pending is None:
+            self._pending = received
+        self.lines_in += 1
+        return line
+
+    def write(self, s: str):
+        data = s.encode("utf-8", "surrogateescape")
+        self._out.append(data)
+        self._out_size += len(data)
+        if self._out_size >= OUT_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if not self._out:
+            return
+        data = b"".join(self._out)
+        self._out.clear()
+        self._out_size = 0
+        if self._pending is not None:
+            self.latency.add(time.perf_counter() - self._pending)
+            self._pending = None
+        self.bytes_out += len(data)
+        asyncio.run_coroutine_threadsafe(self._send(data), self.loop).result()
+
+    async def _send(self, data: bytes):
+        self.writer.write(data)
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.write_timeout)
+        except asyncio.TimeoutError:
+            # client qui ne lit plus: sans ça le thread et le slot restent pris
+            self.writer.transport.abort()
+            raise ConnectionError(f"client did not read for {self.write_timeout:g} s") from None
+
+    def run(self, code, path: str, done: asyncio.Future):
+        _current.session = self
+        ns = {"__name__": "__main__", "__file__": path, "__builtins__": _session_builtins()}
+        t0 = time.thread_time()
+        try:
+            exec(code, ns)
+            self.exit = 0
+        except SystemExit as e:
+            self.exit = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except (EOFError, ConnectionError):
+            self.exit = "disconnected"
+        except Exception:
+            self.exit = "error"
+            sys.stderr.write(f"[{self.peer}] session crashed:\n{traceback.format_exc()}")
+        finally:
+            try:
+                self.flush()
+            except Exception:
+                pass
+            self.cpu = time.thread_time() - t0
+            _current.session = None
+            self.loop.call_soon_threadsafe(done.set_result, None)
+
+    # -- côté boucle asyncio --
+    async def pump(self, reader, idle_timeout: float):
+        """Feed client lines to the session until EOF, idle timeout or overflow."""
+        try:
+            while True:
+                raw = await asyncio.wait_for(reader.readline(), idle_timeout)
+                if not raw:
+                    break
+                self.bytes_in += len(raw)
+                if raw.endswith(b"\r\n"):
+                    raw = raw[:-2] + b"\n"
+                await self.inbox.put((time.perf_counter(), raw.decode("utf-8", "surrogateescape")))
+        except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        await self.inbox.put(None)
+
+    def report(self, worker: int) -> dict:
+        return {
+            "worker": worker, "peer": self.peer, "exit": self.exit,
+            "duration_s": round(time.time() - self.started, 3), "cpu_s": round(self.cpu, 4),
+            "lines_in": self.lines_in, "bytes_in": self.bytes_in, "bytes_out": self.bytes_out,
+            "latency": self.latency.as_dict(),
+        }
+
+
+# ========== Worker ==========
+class Worker:
+    def __init__(self, wid: int, listener: socket.socket, script: str, args):
+        self.wid = wid
+        self.listener = listener
+        self.script = script
+        self.args = args
+        self.slots = None
+        self.active = 0
+        self.served = 0
+        self.cpu = 0.0
+        self.metrics = sys.stderr if args.metrics == "-" else open(args.metrics, "a", buffering=1)
+
+    def log(self, record: dict):
+        self.metrics.write(json.dumps(record) + "\n")
+        self.metrics.flush()
+
+    async def handle(self, reader, writer):
+        async with self.slots:
+            peer = "%s:%s" % writer.get_extra_info("peername")[:2]
+            loop = asyncio.get_running_loop()
+            session = Session(loop, writer, peer, self.args.write_timeout)
+            done = loop.create_future()
+            self.active += 1
+            threading.Thread(target=session.run, args=(self.code, self.script, done),
+                             name=f"session-{peer}", daemon=True).start()
+            pump = asyncio.ensure_future(session.pump(reader, self.args.idle_timeout))
+            await done
+            pump.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.active -= 1
+            self.served += 1
+            self.cpu += session.cpu
+            self.log(session.report(self.wid))
+
+    async def summary(self):
+        while True:
+            await asyncio.sleep(self.args.summary)
+            self.log({"worker": self.wid, "active": self.active, "served": self.served,
+                      "cpu_s": round(self.cpu, 3)})
+
+    async def serve(self):
+        self.slots = asyncio.Semaphore(self.args.max_sessions)
+        server = await asyncio.start_server(self.handle, sock=self.listener, limit=LINE_LIMIT)
+        if self.args.summary:
+            asyncio.ensure_future(self.summary())
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        # les services ouvrent leurs fichiers (graph.txt, colors.txt...) en relatif
+        os.chdir(os.path.dirname(self.script))
+        sys.path.insert(0, os.path.dirname(self.script))  # comme `python script.py`
+        with open(self.script, "rb") as f:
+            self.code = compile(f.read(), self.script, "exec")
+        threading.stack_size(STACK_SIZE)
+        sys.stdin = _Dispatch("stdin", sys.stdin)
+        sys.stdout = _Dispatch("stdout", sys.stdout)
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+
+def _worker_main(wid: int, listener: socket.socket, script: str, args):
+    Worker(wid, listener, script, args).run()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Host a stdin/stdout challenge service over TCP")
+    parser.add_argument("script", help="service script (run unmodified, as __main__)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=1337)
+    parser.add_argument("-w", "--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--max-sessions", type=int, default=256, help="concurrent sessions per worker")
+    parser.add_argument("--idle-timeout", type=float, default=600.0, help="seconds without input")
+    parser.add_argument("--write-timeout", type=float, default=60.0,
+                        help="seconds a client may leave output unread")
+    parser.add_argument("--metrics", default="-", help="JSON-lines metrics file ('-' = stderr)")
+    parser.add_argument("--summary", type=float, default=60.0, help="per-worker summary period (0 = off)")
+    args = parser.parse_args()
+
+    script = os.path.abspath(args.script)
+    listener = socket.create_server((args.host, args.port), backlog=1024, reuse_port=False)
+    listener.setblocking(False)
+    # fork: les workers héritent du socket d'écoute, le noyau répartit les accept()
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_worker_main, args=(wid, listener, script, args), daemon=True)
+             for wid in range(args.workers)]
+    for p in procs:
+        p.start()
+    print(f"[+] {os.path.basename(script)} on {args.host}:{args.port}, {args.workers} workers "
+          f"x {args.max_sessions} sessions", file=sys.stderr)
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())